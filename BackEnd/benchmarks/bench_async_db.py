@@ -0,0 +1,194 @@
+# benchmarks/bench_async_db.py
+# 동기(SessionLocal) vs 비동기(AsyncSession) DB 경로 처리량 비교
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_async_db --clients 200 --requests 4000
+#   DATABASE_URL=mysql+pymysql://user:pw@host:3306/db python -m benchmarks.bench_async_db
+#
+# DATABASE_URL 을 지정하지 않으면 임시 sqlite 파일(aiosqlite)을 사용합니다.
+# --rtt-ms 로 쿼리마다 RDS 왕복 지연을 흉내낼 수 있습니다 (sqlite는 지연이 거의 없어
+# 스레드풀 포화가 드러나지 않기 때문).
+#
+# 결과 해석
+# - 부하 생성기와 서버가 같은 머신에서 돌므로 코어가 적으면 양쪽 모두 CPU에 묶이고, 이때는 요청당 CPU 비용만 비교됩니다.
+#   비동기 경로의 이점은 DB 대기로 동기 스레드풀(기본 40개)이 가득 찰 때 나타납니다.
+#   (가상 RTT x 쿼리 2회 동안 스레드 하나를 점유하므로 동기 경로 상한은 약 40 / (2 x RTT) req/s)
+# - aiosqlite는 쿼리마다 커넥션 전용 스레드를 거쳐 실행되므로 sqlite에서는 비동기 이점이 없습니다.
+#   비동기 드라이버(aiomysql) 자체의 이득은 MySQL DATABASE_URL 로 실행해야 확인됩니다.
+# - errors 는 오류 종류별로 출력합니다.
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="bench_async_db_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from core.database import Base, SessionLocal, async_engine, engine, get_async_db, get_db
+from models.request import Request
+from models.result import Result
+from models.user import User
+
+SEED_REQUESTS = 200
+RTT = float(os.getenv("BENCH_RTT_MS", 0)) / 1000
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(User).count():
+            return
+        user = User(name="bench", email="bench@example.com", password="x")
+        db.add(user)
+        db.flush()
+        for i in range(SEED_REQUESTS):
+            req = Request(
+                user_image_url=f"https://example.com/{i}.png", hair_length="숏", hair_type="직모",
+                sex="남성", location="서울", cheekbone="보통", mood="깔끔", dyed=0,
+                forehead_shape="둥근", difficulty="쉬움", has_bangs=0, user_id=user.user_id,
+            )
+            db.add(req)
+            db.flush()
+            db.add(Result(
+                face_type="계란형", skin_tone="봄웜", forehead="넓음", sex="남성",
+                rec_color="브라운", summary="요약", request_id=req.request_id,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+# /user/result/{request_id} 와 동일한 조회 패턴 (request + result 2회 조회)
+def build_app():
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await async_engine.dispose()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/sync/result/{request_id}")
+    def sync_result(request_id: int, db: Session = Depends(get_db)):
+        time.sleep(RTT)
+        req = db.query(Request).filter(Request.request_id == request_id).first()
+        time.sleep(RTT)
+        result = db.query(Result).filter(Result.request_id == request_id).first()
+        if not req or not result:
+            raise HTTPException(status_code=404)
+        return {"request_id": req.request_id, "face_type": result.face_type}
+
+    @app.get("/async/result/{request_id}")
+    async def async_result(request_id: int, db: AsyncSession = Depends(get_async_db)):
+        await asyncio.sleep(RTT)
+        req = (await db.execute(select(Request).where(Request.request_id == request_id))).scalars().first()
+        await asyncio.sleep(RTT)
+        result = (await db.execute(select(Result).where(Result.request_id == request_id))).scalars().first()
+        if not req or not result:
+            raise HTTPException(status_code=404)
+        return {"request_id": req.request_id, "face_type": result.face_type}
+
+    return app
+
+
+app = build_app()
+
+
+# 클라이언트와 GIL을 공유하지 않도록 별도 프로세스에서 uvicorn 실행
+def start_server(port):
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_async_db:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+         # 기본값(5초)이면 응답이 밀릴 때 서버가 닫는 keep-alive 커넥션을 클라이언트가 재사용해 오류로 집계됨
+         "--timeout-keep-alive", "120"],
+        cwd=backend_dir,
+        env=os.environ.copy(),
+    )
+    for _ in range(200):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("벤치마크 서버 기동 실패")
+
+
+async def drive(base_url, path, clients, total):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    counter = iter(range(total))
+    latencies = []
+    errors = Counter()
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            for i in counter:
+                started = time.perf_counter()
+                try:
+                    res = await client.get(f"{path}/{i % SEED_REQUESTS + 1}")
+                    if res.status_code != 200:
+                        errors[f"HTTP {res.status_code}"] += 1
+                except httpx.HTTPError as e:
+                    errors[type(e).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": dict(errors) or 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sync vs async DB 경로 처리량 비교")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rtt-ms", type=float, default=0, help="쿼리당 가상 DB 왕복 지연(ms)")
+    args = parser.parse_args()
+    os.environ["BENCH_RTT_MS"] = str(args.rtt_ms)
+
+    seed()
+    server = start_server(args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    print(f"동시 클라이언트: {args.clients}, 총 요청: {args.requests}, 가상 RTT: {args.rtt_ms} ms")
+    for label, path in [("sync ", "/sync/result"), ("async", "/async/result")]:
+        # 워밍업 (커넥션 풀 채우기)
+        asyncio.run(drive(base_url, path, args.clients, args.clients))
+        stats = asyncio.run(drive(base_url, path, args.clients, args.requests))
+        print(
+            f"[{label}] {stats['rps']:8.1f} req/s | p50 {stats['p50_ms']:7.1f} ms | "
+            f"p99 {stats['p99_ms']:7.1f} ms | errors {stats['errors']}"
+        )
+
+    server.terminate()
+    server.wait()
+
+
+if __name__ == "__main__":
+    main()
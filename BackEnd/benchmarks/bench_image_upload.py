@@ -0,0 +1,82 @@
+# benchmarks/bench_image_upload.py
+# 휴대폰 원본 업로드 vs 전처리(EXIF 회전 보정 + 축소 + JPEG 재인코딩) 업로드 비교
+#
+# 로컬 S3 호환 서버를 띄운 뒤 실행 (BackEnd 디렉토리에서):
+#   moto_server -p 5000 &
+#   AWS_S3_ENDPOINT_URL=http://127.0.0.1:5000 AWS_S3_BUCKET=bench AWS_S3_REGION=us-east-1 \
+#   AWS_ACCESS_KEY_ID=test AWS_SECRET_ACCESS_KEY=test python -m benchmarks.bench_image_upload
+#
+# 하위 서비스가 치르는 비용(객체 크기, 다운로드 + 디코딩 시간)도 함께 측정합니다.
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from core.storage import AWS_S3_BUCKET, AWS_S3_ENDPOINT_URL, get_s3_client, prepare_image, upload_bytes
+
+EXIF_ORIENTATION = 0x0112
+
+
+# 세로로 찍혀 EXIF 회전값(6)이 붙은 휴대폰 사진 흉내
+def phone_photo(width: int, height: int) -> bytes:
+    base = Image.effect_mandelbrot((width, height), (-2.0, -1.2, 0.8, 1.2), 60)
+    # 센서 노이즈를 섞어 실제 사진과 비슷한 압축률로 만듦
+    img = Image.blend(base, Image.effect_noise((width, height), 40), 0.3).convert("RGB")
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=95, exif=exif)
+    return buffer.getvalue()
+
+
+def measure(label, make_buffer, key, repeat):
+    upload_ms, fetch_ms = [], []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        buffer = make_buffer()
+        size = buffer.getbuffer().nbytes
+        upload_bytes(buffer, key)
+        upload_ms.append((time.perf_counter() - started) * 1000)
+
+        # 하위 서비스: 객체 다운로드 후 디코딩 (로컬 서버는 공개 읽기 정책이 없어 GetObject 사용)
+        started = time.perf_counter()
+        data = get_s3_client().get_object(Bucket=AWS_S3_BUCKET, Key=key)["Body"].read()
+        decoded = Image.open(io.BytesIO(data))
+        decoded.load()
+        fetch_ms.append((time.perf_counter() - started) * 1000)
+
+    print(f"{label:<10} {size / 1024:8.0f} KB  {decoded.size[0]}x{decoded.size[1]:<6}"
+          f"  (전처리+)업로드 p50 {statistics.median(upload_ms):7.1f} ms"
+          f"  download+decode p50 {statistics.median(fetch_ms):7.1f} ms")
+
+
+def main(args):
+    if not AWS_S3_ENDPOINT_URL:
+        sys.exit("AWS_S3_ENDPOINT_URL 을 로컬 S3 호환 서버 주소로 지정하세요.")
+
+    s3 = get_s3_client()
+    try:
+        s3.create_bucket(Bucket=AWS_S3_BUCKET)
+    except s3.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    raw = phone_photo(args.width, args.height)
+    print(f"원본 {args.width}x{args.height} (EXIF orientation=6), repeat {args.repeat}")
+    measure("raw", lambda: io.BytesIO(raw), "bench/raw.jpg", args.repeat)
+    measure("prepared", lambda: prepare_image(io.BytesIO(raw)), "bench/prepared.jpg", args.repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
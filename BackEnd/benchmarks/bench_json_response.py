@@ -0,0 +1,163 @@
+# benchmarks/bench_json_response.py
+# 목록 응답 직렬화 비교: ORM 객체 → dict → response_model 검증 → JSON vs 컬럼 행 → orjson (core/fast_json)
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_json_response --rows 500
+#   python -m benchmarks.bench_json_response --rows 500 --repeat 500 --gzip-level 6
+#
+# 추천 미용실 목록(--rows 행)을 sqlite에 넣고 한 번 조회해 둔 뒤, 같은 행을 반복해서 직렬화합니다.
+#   before (route)  : 변경 전 get_hairshop_recommendations 와 같이 dict 생성 → 검증 → jsonable 변환 → json.dumps
+#   before (cached) : 변경 전 cached_response 경로 (dict 생성 → 검증 → pydantic dump_json)
+#   after           : HAIRSHOP_REC_ROW.dumps(행 튜플)
+# 조회 시간(ORM 객체 vs 필요한 컬럼만)과 gzip 압축 크기/시간도 함께 출력합니다.
+
+import argparse
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="bench_json_response_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ.setdefault("PIPELINE_ENABLED", "0")
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from core.database import SessionLocal
+from core.migrations import run_migrations
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.hairstyle import Hairstyle
+from models.request import Request
+from models.user import User
+from routers.user import HAIRSHOP_REC_ROW, HairshopRecommendationResponse
+
+
+def seed(rows: int) -> int:
+    run_migrations()
+    db = SessionLocal()
+    try:
+        user = User(name="bench", email="bench@example.com", password="x")
+        db.add(user)
+        db.flush()
+        req = Request(
+            user_image_url="https://example.com/bench.jpg", hair_length="숏", hair_type="직모",
+            sex="남성", location="서울", cheekbone="보통", mood="깔끔", dyed=0,
+            forehead_shape="둥근", difficulty="쉬움", has_bangs=0, user_id=user.user_id,
+        )
+        db.add(req)
+        db.flush()
+        style = Hairstyle(hairstyle_name="리프컷", hairstyle_image_url="https://example.com/s.jpg", hairstyle_sex="남성")
+        db.add(style)
+        db.flush()
+        rec = HairRecommendation(
+            simulation_image_url="dummy.jpg", hair_name="리프컷", description="설명", is_saved=0,
+            request_id=req.request_id, hair_id=style.hair_id, user_id=user.user_id,
+        )
+        db.add(rec)
+        db.flush()
+        db.add_all([
+            HairshopRecommendation(
+                hairshop=f"미용실 {i} 강남역점", is_saved=i % 2, latitude=37.5, longitude=127.0,
+                final_menu_price=20000, review_count=i * 7, mean_score=round(3 + (i % 20) / 10, 1),
+                hair_rec_id=rec.hair_rec_id, user_id=user.user_id,
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+        return rec.hair_rec_id
+    finally:
+        db.close()
+
+
+def timed(fn, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--gzip-level", type=int, default=6)
+    args = parser.parse_args()
+
+    hair_rec_id = seed(args.rows)
+    db = SessionLocal()
+    try:
+        join = (HairRecommendation, HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id)
+        where = HairshopRecommendation.hair_rec_id == hair_rec_id
+
+        def fetch_orm():
+            db.expunge_all()
+            return db.execute(select(HairshopRecommendation, HairRecommendation.hair_name).join(*join).where(where)).all()
+
+        def fetch_columns():
+            return db.execute(select(*HAIRSHOP_REC_ROW.columns).join(*join).where(where)).all()
+
+        orm_ms, orm_rows = timed(fetch_orm, max(1, args.repeat // 10))
+        col_ms, col_rows = timed(fetch_columns, max(1, args.repeat // 10))
+    finally:
+        db.close()
+
+    adapter = TypeAdapter(List[HairshopRecommendationResponse])
+
+    def to_dicts():
+        return [
+            {
+                "hairshop_rec_id": shop.hairshop_rec_id,
+                "hairshop": shop.hairshop,
+                "review_count": shop.review_count,
+                "mean_score": shop.mean_score,
+                "is_saved": bool(shop.is_saved),
+                "associated_hair_name": hair_name,
+            }
+            for shop, hair_name in orm_rows
+        ]
+
+    # FastAPI response_model 경로: 검증 → jsonable 변환 → JSONResponse(json.dumps)
+    def before_route():
+        value = adapter.dump_python(adapter.validate_python(to_dicts()), mode="json")
+        return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+    def before_cached():
+        return adapter.dump_json(adapter.validate_python(to_dicts()))
+
+    def after():
+        return HAIRSHOP_REC_ROW.dumps(col_rows)
+
+    route_ms, route_body = timed(before_route, args.repeat)
+    cached_ms, cached_body = timed(before_cached, args.repeat)
+    after_ms, after_body = timed(after, args.repeat)
+    assert json.loads(after_body) == json.loads(route_body) == json.loads(cached_body), "응답 본문이 다릅니다."
+
+    gzip_ms, compressed = timed(lambda: gzip.compress(after_body, compresslevel=args.gzip_level), args.repeat)
+
+    print(f"행 {args.rows}개, 반복 {args.repeat}회 (중앙값)\n")
+    print("조회")
+    print(f"  ORM 객체 + hair_name     {orm_ms:8.3f} ms")
+    print(f"  필요한 컬럼만            {col_ms:8.3f} ms")
+    print("\n직렬화")
+    print(f"  before (route)           {route_ms:8.3f} ms")
+    print(f"  before (cached)          {cached_ms:8.3f} ms")
+    print(f"  after  (orjson, 행 튜플) {after_ms:8.3f} ms   x{route_ms / after_ms:.1f} / x{cached_ms / after_ms:.1f}")
+    print("\n응답 크기")
+    print(f"  JSON                     {len(after_body):8d} bytes")
+    print(f"  gzip (level {args.gzip_level})           {len(compressed):8d} bytes   압축 {gzip_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
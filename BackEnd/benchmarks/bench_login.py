@@ -0,0 +1,126 @@
+# benchmarks/bench_login.py
+# 로그인 폭주 시 처리량과 다른 API 지연 비교: 기본 스레드 풀에서 bcrypt 실행 vs 전용 해시 풀
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_login --logins 200 --concurrency 50
+#   python -m benchmarks.bench_login --rounds 12 --workers 2
+#
+# 로그인 요청을 --concurrency 개씩 동시에 보내는 동안 /user/profile(동기 라우트, 기본 스레드 풀 사용)을
+# 계속 호출해 지연을 잽니다. 서버는 같은 프로세스에서 ASGI로 호출합니다.
+#   before: 변경 전처럼 bcrypt를 기본 스레드 풀(run_in_threadpool)에서 실행
+#   after : core.password 전용 해시 풀에서 실행
+# 두 경우 모두 같은 rounds(--rounds, 기본은 시작 시 보정값)를 사용합니다.
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="bench_login_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ.setdefault("PIPELINE_ENABLED", "0")
+if "--workers" in sys.argv:
+    os.environ["PASSWORD_HASH_WORKERS"] = sys.argv[sys.argv.index("--workers") + 1]
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from jose import jwt
+
+from core import password
+from core.database import SessionLocal, async_engine
+from core.migrations import run_migrations
+from core.security import ALGORITHM, SECRET_KEY
+from models.user import User
+
+PASSWORD = "bench-password"
+
+
+def seed(users: int, rounds: int) -> int:
+    run_migrations()
+    hashed = password._context(rounds).hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        db.add_all([User(name=f"bench{i}", email=f"bench{i}@example.com", password=hashed) for i in range(users)])
+        db.commit()
+        return db.query(User).first().user_id
+    finally:
+        db.close()
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[max(0, int(len(values) * q) - 1)] if values else 0.0
+
+
+async def login(client, i, users, latencies):
+    started = time.perf_counter()
+    response = await client.post("/login", json={"email": f"bench{i % users}@example.com", "password": PASSWORD})
+    response.raise_for_status()
+    latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def probe(client, headers, done, latencies):
+    while not done.is_set():
+        started = time.perf_counter()
+        (await client.get("/user/profile", headers=headers)).raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def measure(label, client, headers, args):
+    login_latencies, probe_latencies = [], []
+    done = asyncio.Event()
+    prober = asyncio.create_task(probe(client, headers, done, probe_latencies))
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(i):
+        async with semaphore:
+            await login(client, i, args.users, login_latencies)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(args.logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    print(f"{label:<7} 로그인 {args.logins / elapsed:6.1f}/s  "
+          f"로그인 p50 {statistics.median(login_latencies):7.0f} ms  p99 {percentile(login_latencies, 0.99):7.0f} ms  |  "
+          f"profile p50 {statistics.median(probe_latencies):7.1f} ms  p99 {percentile(probe_latencies, 0.99):7.1f} ms")
+
+
+async def main(args):
+    rounds = args.rounds or password.calibrate_rounds()
+    password.set_rounds(rounds)
+    user_id = seed(args.users, rounds)
+
+    import main as app_main
+    token = jwt.encode({"sub": str(user_id), "exp": datetime.utcnow() + timedelta(hours=1)}, SECRET_KEY, algorithm=ALGORITHM)
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"로그인 {args.logins}회 (동시 {args.concurrency}), bcrypt rounds {rounds}, "
+              f"해시 풀 {password.PASSWORD_HASH_WORKERS} 스레드, CPU {os.cpu_count()}개")
+
+        run = password._run
+        password._run = run_in_threadpool
+        await measure("before", client, headers, args)
+        password._run = run
+        await measure("after", client, headers, args)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=0)  # 해시 풀 크기 (import 전에 환경변수로 반영)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,162 @@
+# benchmarks/bench_result_page.py
+# 결과 화면 로딩: 기존 N+2회 호출 vs /user/result-page 1회 호출 비교
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_result_page --styles 4 --shops 50 --rtt-ms 80
+#
+# 모바일 체감 지연 = HTTP 왕복마다 --rtt-ms 만큼의 네트워크 지연 + 서버 처리 시간.
+# 기존 앱 흐름(discover-result / discover-recomendation)을 그대로 따라
+# result → hair-recommendations → 스타일별 hairshop-recommendations(병렬) 순서로 호출합니다.
+# 서버는 같은 프로세스에서 ASGI로 호출하고, DB 쿼리 수는 커서 실행 횟수로 셉니다.
+# 응답 캐시(core/response_cache)는 기본으로 끄고 DB 경로를 측정합니다 (--cache 로 켬).
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="bench_result_page_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ.setdefault("PIPELINE_ENABLED", "0")
+if "--cache" not in sys.argv:
+    os.environ["RESPONSE_CACHE_TTL"] = "0"
+
+import httpx
+from jose import jwt
+from sqlalchemy import event
+
+from core.database import SessionLocal, async_engine
+from core.migrations import run_migrations
+from core.security import ALGORITHM, SECRET_KEY
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.hairstyle import Hairstyle
+from models.request import Request
+from models.result import Result
+from models.user import User
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def seed(styles: int, shops: int):
+    run_migrations()
+    db = SessionLocal()
+    try:
+        user = User(name="bench", email="bench@example.com", password="x")
+        db.add(user)
+        db.flush()
+        req = Request(
+            user_image_url="https://example.com/bench.jpg", hair_length="숏", hair_type="직모",
+            sex="남성", location="서울", cheekbone="보통", mood="깔끔", dyed=0,
+            forehead_shape="둥근", difficulty="쉬움", has_bangs=0, user_id=user.user_id,
+        )
+        db.add(req)
+        db.flush()
+        db.add(Result(
+            face_type="계란형", skin_tone="봄웜", forehead="넓음", sex="남성",
+            rec_color="브라운", summary="요약", request_id=req.request_id,
+        ))
+        style = Hairstyle(hairstyle_name="리프컷", hairstyle_image_url="https://example.com/s.jpg", hairstyle_sex="남성")
+        db.add(style)
+        db.flush()
+        for i in range(styles):
+            rec = HairRecommendation(
+                simulation_image_url="dummy.jpg", hair_name=f"스타일{i}", description="설명", is_saved=0,
+                request_id=req.request_id, hair_id=style.hair_id, user_id=user.user_id,
+            )
+            db.add(rec)
+            db.flush()
+            db.add_all([
+                HairshopRecommendation(
+                    hairshop=f"미용실 {i}-{j}", is_saved=0, latitude=37.5, longitude=127.0,
+                    final_menu_price=20000, review_count=j, mean_score=4.5,
+                    hair_rec_id=rec.hair_rec_id, user_id=user.user_id,
+                )
+                for j in range(shops)
+            ])
+        db.commit()
+        return user.user_id, req.request_id
+    finally:
+        db.close()
+
+
+async def call(client, url, rtt):
+    # 요청/응답 방향 각각 절반씩 네트워크 지연
+    await asyncio.sleep(rtt / 2)
+    response = await client.get(url)
+    response.raise_for_status()
+    await asyncio.sleep(rtt / 2)
+    return response.json()
+
+
+async def legacy_flow(client, request_id, shops, rtt):
+    await call(client, f"/user/result/{request_id}", rtt)
+    hairs = await call(client, f"/user/hair-recommendations/{request_id}", rtt)
+    await asyncio.gather(*(
+        call(client, f"/user/hairshop-recommendations/{h['hair_rec_id']}?limit={shops}", rtt)
+        for h in hairs
+    ))
+    return 2 + len(hairs)
+
+
+async def result_page_flow(client, request_id, shops, rtt):
+    await call(client, f"/user/result-page/{request_id}?shops={shops}", rtt)
+    return 1
+
+
+async def measure(label, flow, client, request_id, args, counter):
+    latencies, queries = [], []
+    calls = 0
+    for _ in range(args.repeat):
+        counter.count = 0
+        started = time.perf_counter()
+        calls = await flow(client, request_id, args.page_shops, args.rtt_ms / 1000)
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"{label:<12} HTTP {calls:>2}회  DB 쿼리 {statistics.median(queries):>4.0f}  "
+          f"p50 {statistics.median(latencies):8.1f} ms  p95 {p95:8.1f} ms")
+
+
+async def main(args):
+    user_id, request_id = seed(args.styles, args.shops)
+
+    import main as app_main
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    token = jwt.encode({"sub": str(user_id), "exp": datetime.utcnow() + timedelta(hours=1)}, SECRET_KEY, algorithm=ALGORITHM)
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+    ) as client:
+        print(f"스타일 {args.styles}개 x 미용실 {args.shops}개, 화면당 미용실 {args.page_shops}개, "
+              f"RTT {args.rtt_ms} ms, repeat {args.repeat}, 응답 캐시 {'켜짐' if args.cache else '꺼짐'}")
+        await measure("기존 N+2", legacy_flow, client, request_id, args, counter)
+        await measure("result-page", result_page_flow, client, request_id, args, counter)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--styles", type=int, default=4)
+    parser.add_argument("--shops", type=int, default=50)
+    parser.add_argument("--page-shops", type=int, default=10)
+    parser.add_argument("--rtt-ms", type=float, default=80)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--cache", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,140 @@
+# benchmarks/bench_salon_search.py
+# 스타일별 가까운 미용실 검색: 전체 스캔 + 정렬 vs 격자 인덱스 + top-k 힙 비교
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_salon_search --shops 20000 --styles 80 --queries 2000
+#   python -m benchmarks.bench_salon_search --csv ../graphragREC/hairshop_recommend_dataset_realfinal_easy.csv
+#
+# 기본은 서울 범위에 무작위로 만든 미용실(도시 규모)을 사용하고, --csv 를 주면 GraphRAG 미용실 데이터셋
+# (hairshop, final_dic_style, latitude, longitude, review_count, mean_score)을 사용합니다.
+# DB 없이 core.salon_index.SalonIndex.build 로 인덱스를 만들고 검색 함수만 측정합니다.
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from core.hairstyle_catalog import normalize_style_name
+from core.salon_index import (
+    DISTANCE_WEIGHT, REVIEW_WEIGHT, SCORE_WEIGHT, SalonIndex, haversine_m,
+)
+
+# 서울 대략 범위
+LAT_RANGE = (37.45, 37.70)
+LON_RANGE = (126.80, 127.18)
+
+
+def synthetic(shops: int, styles: int, seed: int):
+    rng = random.Random(seed)
+    style_names = [f"스타일{i}컷" for i in range(styles)]
+    rows, stats = [], {}
+    for i in range(shops):
+        # 상권 중심 몇 곳 주변에 몰리도록 배치
+        if rng.random() < 0.6:
+            lat, lon = rng.choice([(37.498, 127.028), (37.557, 126.924), (37.545, 127.056), (37.514, 127.105)])
+            lat, lon = lat + rng.gauss(0, 0.01), lon + rng.gauss(0, 0.012)
+        else:
+            lat, lon = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+        offered = rng.sample(style_names, rng.randint(3, 8))
+        name = f"미용실{i}"
+        rows.append(SimpleNamespace(
+            hairshop_id=i + 1, hairshop_name=name, address="서울", menu=", ".join(offered),
+            phone=None, intro=None, latitude=f"{lat:.7f}", longitude=f"{lon:.7f}",
+        ))
+        stats[name] = (rng.randint(0, 3000), round(rng.uniform(0.5, 1.0), 2))
+    return rows, stats, {}, [normalize_style_name(s) for s in style_names], style_names
+
+
+def from_csv(path: str):
+    rows, stats, offerings, seen = [], {}, {}, {}
+    with open(path, encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            name = record["hairshop"].strip()
+            offerings.setdefault(name, set()).add(normalize_style_name(record["final_dic_style"]))
+            review_count = int(float(record["review_count"] or 0))
+            mean_score = float(record["mean_score"] or 0)
+            best = stats.get(name, (0, 0.0))
+            stats[name] = (max(best[0], review_count), max(best[1], mean_score))
+            if name not in seen:
+                seen[name] = len(rows) + 1
+                rows.append(SimpleNamespace(
+                    hairshop_id=seen[name], hairshop_name=name, address=record["location"], menu=None,
+                    phone=None, intro=None, latitude=record["latitude"], longitude=record["longitude"],
+                ))
+    style_names = sorted({record for names in offerings.values() for record in names})
+    return rows, stats, offerings, [], style_names
+
+
+# 변경 전 방식에 해당하는 단순 구현: 모든 미용실 거리 계산 후 전체 정렬
+def full_scan(index: SalonIndex, style_name: str, lat: float, lon: float, radius_m: float, k: int):
+    members = index._styles.get(normalize_style_name(style_name), ({}, []))[1]
+    scored = []
+    for salon in members:
+        distance = haversine_m(lat, lon, salon.lat, salon.lon)
+        if distance <= radius_m:
+            score = (
+                DISTANCE_WEIGHT * (1 - distance / radius_m)
+                + REVIEW_WEIGHT * salon.review_rank / index._max_review_rank
+                + SCORE_WEIGHT * salon.mean_score / index._max_score
+            )
+            scored.append((score, -salon.hairshop_id, distance, salon))
+    scored.sort(key=lambda item: item[:2], reverse=True)
+    return [(salon, distance) for _, _, distance, salon in scored[:k]]
+
+
+def measure(label, search, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        search(*query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"{label:<10} p50 {statistics.median(latencies):7.3f} ms   p99 {p99:7.3f} ms   max {latencies[-1]:7.3f} ms")
+
+
+def main(args):
+    if args.csv:
+        shops, stats, offerings, style_keys, style_names = from_csv(args.csv)
+    else:
+        shops, stats, offerings, style_keys, style_names = synthetic(args.shops, args.styles, args.seed)
+
+    index = SalonIndex()
+    started = time.perf_counter()
+    index.build(shops, stats, offerings, style_keys)
+    print(f"인덱스 생성 {(time.perf_counter() - started) * 1000:.0f} ms - {index.stats()}")
+
+    rng = random.Random(args.seed + 1)
+    queries = [
+        (rng.choice(style_names), rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE), args.radius_km * 1000, args.k)
+        for _ in range(args.queries)
+    ]
+
+    # 두 방식의 결과가 같은지 확인
+    for query in queries[:200]:
+        expected = [s.hairshop_id for s, _ in full_scan(index, *query)]
+        actual = [s.hairshop_id for s, _ in index.nearest(*query)]
+        assert expected == actual, (query, expected, actual)
+
+    print(f"검색 {args.queries}회, 반경 {args.radius_km} km, k={args.k}")
+    measure("full scan", lambda *q: full_scan(index, *q), queries)
+    measure("index", index.nearest, queries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shops", type=int, default=20000)
+    parser.add_argument("--styles", type=int, default=80)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--radius-km", type=float, default=3)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--csv")
+    main(parser.parse_args())
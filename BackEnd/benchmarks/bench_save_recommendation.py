@@ -0,0 +1,196 @@
+# benchmarks/bench_save_recommendation.py
+# /save-recommendation/ 저장 경로: 기존(스타일별 조회 + flush, 미용실 개별 add) vs 일괄 저장 비교
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_save_recommendation --styles 4 --shops 50 --repeat 30
+#   python -m benchmarks.bench_save_recommendation --rtt-ms 2
+#
+# DATABASE_URL 을 지정하지 않으면 임시 sqlite 파일(aiosqlite)을 사용합니다.
+# 왕복 횟수는 DB 커서 실행 횟수(executemany 1회 = 1왕복)로 셉니다.
+# --rtt-ms 로 커서 실행마다 RDS 왕복 지연을 흉내낼 수 있습니다.
+# 반복마다 새 request_id에 저장하고, 마지막으로 같은 payload 재전송(replay) 비용을 측정합니다.
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="bench_save_rec_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from sqlalchemy import event, select
+
+from core.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+from core.recommendation import payload_hash, save_recommendations
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.hairstyle import Hairstyle
+from models.request import Request
+from models.result import Result
+from models.user import User
+from schemas.recommendation import RecommendationPayload
+
+STYLE_NAMES = ["리프컷", "댄디컷", "가일컷", "슬릭백", "아이비리그컷", "투블럭컷", "포마드컷", "쉐도우펌"]
+
+
+class RoundTripCounter:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+
+def seed(requests: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(name="bench", email="bench@example.com", password="x")
+        db.add(user)
+        db.flush()
+        request_ids = []
+        for _ in range(requests):
+            req = Request(
+                user_image_url="https://example.com/bench.png", hair_length="숏", hair_type="직모",
+                sex="남성", location="서울", cheekbone="보통", mood="깔끔", dyed=0,
+                forehead_shape="둥근", difficulty="쉬움", has_bangs=0, user_id=user.user_id,
+            )
+            db.add(req)
+            db.flush()
+            db.add(Result(
+                face_type="계란형", skin_tone="봄웜", forehead="넓음", sex="남성",
+                rec_color="브라운", summary="요약", request_id=req.request_id,
+            ))
+            request_ids.append(req.request_id)
+        # 스타일마다 type/face/length 조합 후보 여러 개
+        for name in STYLE_NAMES:
+            for hair_type in ("직모", "곱슬"):
+                for face in ("R", "S"):
+                    for length in ("S", "M", "L"):
+                        db.add(Hairstyle(
+                            hairstyle_name=name, hairstyle_image_url=f"https://example.com/{name}.png",
+                            hairstyle_sex="남성", hairstyle_type=hair_type,
+                            hairstyle_face=face, hairstyle_length=length,
+                        ))
+        db.commit()
+        return user.user_id, request_ids
+    finally:
+        db.close()
+
+
+def build_payload(user_id: int, request_id: int, styles: int, shops: int) -> RecommendationPayload:
+    return RecommendationPayload(
+        user_info={"user_id": user_id, "request_id": request_id},
+        recommendations=[
+            {
+                "style": STYLE_NAMES[i % len(STYLE_NAMES)],
+                "description": "벤치마크 추천",
+                "hair_shops": [
+                    {
+                        "hairshop": f"미용실 {i}-{j}", "latitude": 37.5 + j * 0.001, "longitude": 127.0,
+                        "final_menu_price": 20000, "review_count": j, "mean_score": 4.5,
+                    }
+                    for j in range(shops)
+                ],
+            }
+            for i in range(styles)
+        ],
+    )
+
+
+# 변경 전 routers/analyze.save_recommendation 의 저장 패턴
+async def legacy_save(db, user_id: int, request_id: int, recommendations):
+    request_info = (await db.execute(
+        select(Request).filter_by(user_id=user_id, request_id=request_id)
+    )).scalars().first()
+    result_info = (await db.execute(
+        select(Result).filter_by(request_id=request_id)
+    )).scalars().first()
+
+    for rec in recommendations:
+        mapped_length = {'숏': 'S', '미디움': 'M'}.get(request_info.hair_length.strip(), 'L')
+        face_type = result_info.face_type.strip()
+        if face_type in ['네모형', '둥근형']:
+            mapped_face = 'R'
+        elif face_type in ['긴형', '계란형', '하트형']:
+            mapped_face = 'S'
+        else:
+            mapped_face = None
+        hair_type = request_info.hair_type.strip()
+
+        candidates = (await db.execute(
+            select(Hairstyle).filter_by(hairstyle_name=rec.style.strip(), hairstyle_sex=result_info.sex.strip())
+        )).scalars().all()
+
+        def score(h):
+            return (h.hairstyle_type == hair_type) + (h.hairstyle_face == mapped_face) + (h.hairstyle_length == mapped_length)
+
+        hairstyle = max(candidates, key=score, default=None)
+        hair_rec = HairRecommendation(
+            simulation_image_url="dummy.jpg", hair_name=rec.style, description=rec.description,
+            is_saved=0, request_id=request_id, hair_id=hairstyle.hair_id if hairstyle else None, user_id=user_id,
+        )
+        db.add(hair_rec)
+        await db.flush()
+
+        for shop in rec.hair_shops:
+            db.add(HairshopRecommendation(
+                hairshop=shop.hairshop or "미정", is_saved=0, latitude=shop.latitude or 0.0,
+                longitude=shop.longitude or 0.0, final_menu_price=shop.final_menu_price or 0,
+                review_count=shop.review_count or 0, mean_score=shop.mean_score or 0.0,
+                hair_rec_id=hair_rec.hair_rec_id, user_id=user_id,
+            ))
+
+
+async def new_save(db, user_id: int, request_id: int, recommendations, digest: str):
+    await save_recommendations(db, user_id, request_id, recommendations, digest)
+
+
+async def run(label, save, payloads, counter):
+    latencies, trips = [], []
+    for payload in payloads:
+        user_id = payload.user_info.user_id
+        request_id = payload.user_info.request_id
+        async with AsyncSessionLocal() as db:
+            counter.count = 0
+            started = time.perf_counter()
+            await save(db, user_id, request_id, payload.recommendations, payload_hash(payload))
+            await db.commit()
+            latencies.append((time.perf_counter() - started) * 1000)
+            trips.append(counter.count)
+    latencies.sort()
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"{label:<8} round trips {statistics.median(trips):>5.0f}   "
+          f"p50 {statistics.median(latencies):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+async def main(args):
+    user_id, request_ids = seed(args.repeat * 2)
+    payloads = [build_payload(user_id, request_id, args.styles, args.shops) for request_id in request_ids]
+    counter = RoundTripCounter(args.rtt_ms / 1000)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+
+    print(f"{args.styles} styles x {args.shops} shops, repeat {args.repeat}, rtt {args.rtt_ms} ms "
+          f"({async_engine.dialect.name})")
+    await run("before", lambda db, u, r, recs, _: legacy_save(db, u, r, recs), payloads[:args.repeat], counter)
+    await run("after", new_save, payloads[args.repeat:], counter)
+    await run("replay", new_save, payloads[args.repeat:], counter)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--styles", type=int, default=4)
+    parser.add_argument("--shops", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--rtt-ms", type=float, default=0)
+    asyncio.run(main(parser.parse_args()))
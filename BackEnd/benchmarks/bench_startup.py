@@ -0,0 +1,134 @@
+# benchmarks/bench_startup.py
+# 워커 N개를 동시에 띄울 때 프로세스 시작 → 첫 요청 응답(/healthz) / 준비 완료(/readyz) 시간 측정
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_startup --workers 4
+#   python -m benchmarks.bench_startup --workers 8 --runs 3
+#
+# 워커마다 별도 포트로 uvicorn 프로세스를 동시에 실행하고 (같은 DB 사용) 두 시점을 잽니다.
+#   healthz: 프로세스 실행부터 /healthz 가 처음 200을 돌려줄 때까지 (요청을 받기 시작한 시점)
+#   readyz : 프로세스 실행부터 /readyz 가 처음 200을 돌려줄 때까지 (마이그레이션, 카탈로그 로드 등 준비 완료)
+# 워커가 보고한 main.py import 시간(import_seconds)과 준비 완료 시간(ready_seconds)도 함께 출력합니다.
+# DATABASE_URL 을 지정하지 않으면 임시 sqlite 파일을 사용합니다.
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def worker_env() -> dict:
+    env = dict(os.environ)
+    if "DATABASE_URL" not in env:
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_startup_'), 'bench.db')}"
+    env.setdefault("PIPELINE_ENABLED", "0")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def start_workers(count: int, env: dict):
+    workers = []
+    for _ in range(count):
+        port = free_port()
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        workers.append({"proc": proc, "port": port, "started": started, "healthz": None, "readyz": None, "report": None})
+    return workers
+
+
+def wait_for(workers, timeout: float):
+    deadline = time.perf_counter() + timeout
+    with httpx.Client(timeout=1.0) as client:
+        while time.perf_counter() < deadline and any(w["readyz"] is None for w in workers):
+            for w in workers:
+                if w["readyz"] is not None:
+                    continue
+                if w["proc"].poll() is not None:
+                    raise RuntimeError(f"워커 종료됨 (port {w['port']}):\n{w['proc'].stderr.read().decode(errors='replace')}")
+                base = f"http://127.0.0.1:{w['port']}"
+                try:
+                    if w["healthz"] is None:
+                        if client.get(f"{base}/healthz").status_code != 200:
+                            continue
+                        w["healthz"] = time.perf_counter() - w["started"]
+                    res = client.get(f"{base}/readyz")
+                    if res.status_code == 200:
+                        w["readyz"] = time.perf_counter() - w["started"]
+                        w["report"] = res.json()
+                except httpx.TransportError:
+                    pass
+            time.sleep(0.01)
+    if any(w["readyz"] is None for w in workers):
+        raise RuntimeError(f"{timeout}초 안에 준비되지 않은 워커가 있습니다.")
+
+
+def stop_workers(workers):
+    for w in workers:
+        w["proc"].terminate()
+    for w in workers:
+        try:
+            w["proc"].wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            w["proc"].kill()
+
+
+def summarize(label: str, values):
+    values = sorted(values)
+    print(f"  {label:<16} p50 {statistics.median(values) * 1000:8.1f} ms   max {values[-1] * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=120)
+    args = parser.parse_args()
+
+    env = worker_env()
+    results = []
+    for run in range(args.runs):
+        workers = start_workers(args.workers, env)
+        try:
+            wait_for(workers, args.timeout)
+        finally:
+            stop_workers(workers)
+        results.extend(workers)
+        print(f"run {run + 1}: 워커 {args.workers}개 준비 완료")
+
+    print(f"\n워커 {len(results)}개 (동시 실행 {args.workers}개 x {args.runs}회)")
+    summarize("first /healthz", [w["healthz"] for w in results])
+    summarize("first /readyz", [w["readyz"] for w in results])
+    summarize("import (보고)", [w["report"]["import_seconds"] for w in results])
+    summarize("ready (보고)", [w["report"]["ready_seconds"] for w in results])
+
+    slowest = {}
+    for w in results:
+        for name, step in w["report"]["steps"].items():
+            if step["seconds"] is not None:
+                slowest[name] = max(slowest.get(name, 0), step["seconds"])
+    print("\n단계별 최대 소요 시간")
+    for name, seconds in sorted(slowest.items(), key=lambda item: -item[1]):
+        print(f"  {name:<18} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
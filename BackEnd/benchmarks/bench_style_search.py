@@ -0,0 +1,117 @@
+# benchmarks/bench_style_search.py
+# /styles 카탈로그 검색 지연: 전체 목록 부분 문자열 필터 + 정렬 vs core.style_search 인덱스
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m benchmarks.bench_style_search --styles 10000 --queries 3000
+#
+# DB 없이 무작위 한글 이름의 헤어스타일 카탈로그를 만들어 StyleSearchIndex.build 로 인덱스를 생성하고
+# 검색어 종류별(초성, 입력 중 글자, 접두어, 부분 문자열, 필터만) 지연을 측정합니다.
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from core.hairstyle_catalog import normalize_style_name
+from core.style_search import StyleSearchIndex, to_choseong
+
+SYLLABLES = "가나다라리마바사아자차카타파하레로모보소오조허히디시지미비피태슬댄가일쉐도우빌드애즈히메"
+SUFFIXES = ["컷", "펌", "레이어드컷", "단발", "웨이브", "매직"]
+
+
+def synthetic(count: int, seed: int):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) + rng.choice(SUFFIXES)
+        rows.append(SimpleNamespace(
+            hair_id=i + 1, hairstyle_name=name[:20], hairstyle_image_url=f"https://example.com/{i}.jpg",
+            hairstyle_sex=rng.choice(["남성", "여성"]), hairstyle_length=rng.choice("SML"),
+            hairstyle_type=rng.choice(["직모", "곱슬", "반곱슬"]), hairstyle_face=rng.choice("RS"),
+        ))
+    return rows
+
+
+def make_queries(rows, count: int, seed: int):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        name = rng.choice(rows).hairstyle_name
+        kind = rng.choice(["choseong", "prefix", "typing", "substring", "filter"])
+        if kind == "choseong":
+            text = to_choseong(name)[:rng.randint(1, 3)]
+        elif kind == "prefix":
+            text = name[:rng.randint(1, 3)]
+        elif kind == "typing":
+            # 다음 글자의 초성까지 입력한 상태 ("리프" 입력 중 "리ㅍ")
+            text = name[:1] + to_choseong(name[1:2])
+        elif kind == "substring":
+            start = rng.randint(0, max(0, len(name) - 2))
+            text = name[start:start + 2]
+        else:
+            text = None
+        filters = {"sex": rng.choice(["남성", "여성", None]), "length": rng.choice(["S", "M", "L", None])}
+        queries.append((kind, text, filters, rng.choice([None, "name", "latest"])))
+    return queries
+
+
+# 변경 전 /styles 처럼 전체 목록을 부분 문자열로 거르고 매번 정렬
+def linear(rows, text, filters, sort, skip=0, limit=20):
+    key = normalize_style_name(text) if text else None
+    matched = [
+        h for h in rows
+        if (key is None or key in normalize_style_name(h.hairstyle_name))
+        and all(value is None or getattr(h, f"hairstyle_{field}") == value for field, value in filters.items())
+    ]
+    if sort == "name":
+        matched.sort(key=lambda h: (h.hairstyle_name, h.hair_id))
+    elif sort == "latest":
+        matched.sort(key=lambda h: -h.hair_id)
+    return len(matched), matched[skip:skip + limit]
+
+
+def report(label, latencies):
+    latencies.sort()
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(f"  {label:<10} p50 {statistics.median(latencies):7.3f} ms   p99 {p99:7.3f} ms   max {latencies[-1]:7.3f} ms")
+
+
+def main(args):
+    rows = synthetic(args.styles, args.seed)
+    index = StyleSearchIndex()
+    started = time.perf_counter()
+    index.build(rows)
+    print(f"스타일 {len(rows)}개, 인덱스 생성 {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    queries = make_queries(rows, args.queries, args.seed + 1)
+    by_kind = {}
+    for kind, text, filters, sort in queries:
+        started = time.perf_counter()
+        linear(rows, text, filters, sort)
+        before = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        index.search(text, filters, sort)
+        after = (time.perf_counter() - started) * 1000
+        entry = by_kind.setdefault(kind, ([], []))
+        entry[0].append(before)
+        entry[1].append(after)
+
+    for kind, (before, after) in by_kind.items():
+        print(f"[{kind}] {len(before)}회")
+        report("linear", before)
+        report("index", after)
+    report("index 전체", [t for _, after in by_kind.values() for t in after])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--styles", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=11)
+    main(parser.parse_args())
@@ -0,0 +1,140 @@
+# benchmarks/check_hairshop_paging.py
+# 추천 미용실 커서 페이지네이션이 리뷰 수가 비어 있던 행까지 빠짐없이 돌려주는지 확인
+#
+# 실행 (BackEnd 디렉토리에서):
+#   python -m benchmarks.check_hairshop_paging
+#
+# 마이그레이션 5 이전 스키마(review_count NULL 허용)로 미용실 테이블을 만들고 NULL 리뷰 수 행을 넣은 뒤
+# 마이그레이션을 적용해, cursor 로 끝까지 넘긴 결과와 skip/limit 결과가 같은 순서/같은 행인지 비교합니다.
+# 기대와 다르면 종료 코드 1로 끝납니다.
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_dir = tempfile.mkdtemp(prefix="check_hairshop_paging_")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_tmp_dir, 'paging.db')}",
+    "PIPELINE_ENABLED": "0",
+    "BCRYPT_ROUNDS": "10",
+})
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.schema import CreateTable
+
+from core import migrations
+from core.database import SessionLocal, engine
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.hairstyle import Hairstyle
+from models.request import Request
+from models.user import User
+
+REVIEW_COUNTS = (None, 30, None, None, 10, None, 10, None)
+LIMIT = 3
+
+
+# 마이그레이션 4까지 적용하고 미용실 테이블을 review_count NULL 허용 스키마로 다시 생성
+def create_legacy_schema():
+    latest = list(migrations.MIGRATIONS)
+    migrations.MIGRATIONS[:] = [m for m in latest if m[0] < 5]
+    try:
+        migrations.run_migrations()
+    finally:
+        migrations.MIGRATIONS[:] = latest
+
+    table = HairshopRecommendation.__table__
+    ddl = str(CreateTable(table).compile(dialect=engine.dialect))
+    legacy = ddl.replace("review_count INTEGER DEFAULT 0 NOT NULL", "review_count INTEGER")
+    assert legacy != ddl, "review_count 컬럼 정의를 찾지 못했습니다."
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {table.name}"))
+        conn.execute(text(legacy))
+        for index in table.indexes:
+            index.create(conn)
+
+
+def seed() -> int:
+    db = SessionLocal()
+    try:
+        user = User(name="paging", email="paging@example.com", password="x")
+        db.add(user)
+        db.flush()
+        req = Request(
+            user_image_url="https://example.com/u.jpg", hair_length="숏", hair_type="직모",
+            sex="남성", location="서울", cheekbone="보통", mood="깔끔", dyed=0,
+            forehead_shape="둥근", difficulty="쉬움", has_bangs=0, user_id=user.user_id,
+        )
+        db.add(req)
+        db.flush()
+        style = Hairstyle(hairstyle_name="리프컷", hairstyle_image_url="https://example.com/s.jpg", hairstyle_sex="남성")
+        db.add(style)
+        db.flush()
+        rec = HairRecommendation(
+            simulation_image_url="dummy.jpg", hair_name="리프컷", description="설명", is_saved=0,
+            request_id=req.request_id, hair_id=style.hair_id, user_id=user.user_id,
+        )
+        db.add(rec)
+        db.flush()
+        hair_rec_id, user_id = rec.hair_rec_id, user.user_id
+        db.commit()
+    finally:
+        db.close()
+
+    with engine.begin() as conn:
+        for i, review_count in enumerate(REVIEW_COUNTS):
+            conn.execute(HairshopRecommendation.__table__.insert().values(
+                hairshop=f"미용실 {i}", is_saved=0, review_count=review_count, mean_score=None,
+                hair_rec_id=hair_rec_id, user_id=user_id,
+            ))
+    return hair_rec_id
+
+
+def main() -> int:
+    create_legacy_schema()
+    hair_rec_id = seed()
+    applied = migrations.run_migrations()
+
+    import main as app_main
+    failures = 0
+
+    def check(name, condition, detail):
+        nonlocal failures
+        failures += not condition
+        print(f"[{'OK' if condition else 'FAIL'}] {name}")
+        print(f"       {detail}")
+
+    check("마이그레이션 5 적용", 5 in applied, applied)
+
+    with TestClient(app_main.app) as client:
+        url = f"/user/hairshop-recommendations/{hair_rec_id}"
+
+        by_cursor, cursor, pages = [], None, 0
+        while pages <= len(REVIEW_COUNTS):
+            params = {"limit": LIMIT, **({"cursor": cursor} if cursor else {})}
+            response = client.get(url, params=params)
+            response.raise_for_status()
+            by_cursor.extend(response.json())
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        by_skip = []
+        for skip in range(0, len(REVIEW_COUNTS), LIMIT):
+            by_skip.extend(client.get(url, params={"skip": skip, "limit": LIMIT}).json())
+
+    cursor_ids = [shop["hairshop_rec_id"] for shop in by_cursor]
+    skip_ids = [shop["hairshop_rec_id"] for shop in by_skip]
+    check("cursor 페이지가 모든 행을 한 번씩 반환", sorted(cursor_ids) == list(range(1, len(REVIEW_COUNTS) + 1)), cursor_ids)
+    check("cursor 순서 = skip/limit 순서", cursor_ids == skip_ids, f"cursor {cursor_ids} / skip {skip_ids}")
+    check("비어 있던 리뷰 수는 0", all(isinstance(shop["review_count"], int) for shop in by_cursor),
+          [shop["review_count"] for shop in by_cursor])
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# benchmarks/check_query_plans.py
+# 주요 조회 쿼리가 복합 인덱스를 타는지 SQLite 실행 계획(EXPLAIN QUERY PLAN)으로 확인
+#
+# 실행 (BackEnd 디렉토리에서):
+#   python -m benchmarks.check_query_plans
+#
+# 임시 sqlite 파일에 core.migrations로 스키마를 만든 뒤 각 쿼리의 계획을 출력합니다.
+# 기대한 인덱스를 쓰지 않거나 정렬용 임시 B-트리가 생기면 종료 코드 1로 끝납니다.
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_dir = tempfile.mkdtemp(prefix="check_query_plans_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'plans.db')}"
+
+from sqlalchemy import and_, desc, or_, select, text
+
+from core.database import engine
+from core.migrations import run_migrations
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.request import Request
+from models.result import Result
+
+# (이름, 쿼리, 기대 인덱스, ORDER BY 포함 여부) - routers/user.py 의 조회 패턴
+CHECKS = [
+    (
+        "최근 요청 (latest-request-id)",
+        select(Request).where(Request.user_id == 1).order_by(desc(Request.created_at)).limit(1),
+        "ix_request_user_created", True,
+    ),
+    (
+        "분석 결과 (user/result)",
+        select(Result).where(Result.request_id == 1),
+        "ix_result_request", False,
+    ),
+    (
+        "추천 스타일 (hair-recommendations)",
+        select(HairRecommendation).where(HairRecommendation.request_id == 1, HairRecommendation.user_id == 1),
+        "ix_hair_rec_request_user", False,
+    ),
+    (
+        "저장한 스타일 (saved-hairstyles)",
+        select(HairRecommendation).where(HairRecommendation.user_id == 1, HairRecommendation.is_saved == 1),
+        "ix_hair_rec_user_saved", False,
+    ),
+    (
+        "추천 미용실 (hairshop-recommendations)",
+        select(HairshopRecommendation, HairRecommendation.hair_name)
+        .join(HairRecommendation, HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id)
+        .where(HairshopRecommendation.hair_rec_id == 1)
+        .order_by(HairshopRecommendation.review_count.desc(), HairshopRecommendation.hairshop_rec_id.desc())
+        .offset(0).limit(10),
+        "ix_hairshop_rec_hair_rec_review", True,
+    ),
+    (
+        "추천 미용실 커서 페이지 (hairshop-recommendations?cursor=)",
+        select(HairshopRecommendation, HairRecommendation.hair_name)
+        .join(HairRecommendation, HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id)
+        .where(HairshopRecommendation.hair_rec_id == 1)
+        .where(or_(
+            HairshopRecommendation.review_count < 10,
+            and_(HairshopRecommendation.review_count == 10, HairshopRecommendation.hairshop_rec_id < 100)
+        ))
+        .order_by(HairshopRecommendation.review_count.desc(), HairshopRecommendation.hairshop_rec_id.desc())
+        .limit(10),
+        "ix_hairshop_rec_hair_rec_review", True,
+    ),
+    (
+        "저장한 미용실 (saved-hairshops)",
+        select(HairshopRecommendation, HairRecommendation.hair_name)
+        .join(HairRecommendation, HairshopRecommendation.hair_rec_id == HairRecommendation.hair_rec_id)
+        .where(HairshopRecommendation.user_id == 1, HairshopRecommendation.is_saved == 1),
+        "ix_hairshop_rec_user_saved", False,
+    ),
+]
+
+
+def explain(conn, stmt) -> list:
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def main() -> int:
+    run_migrations(engine)
+    failures = 0
+    with engine.connect() as conn:
+        for name, stmt, index, ordered in CHECKS:
+            plan = explain(conn, stmt)
+            problems = []
+            if not any(index in line for line in plan):
+                problems.append(f"{index} 미사용")
+            if ordered and any("TEMP B-TREE" in line for line in plan):
+                problems.append("정렬용 임시 B-트리 생성")
+            failures += bool(problems)
+
+            print(f"[{'FAIL' if problems else 'OK'}] {name}")
+            for line in plan:
+                print(f"       {line}")
+            for problem in problems:
+                print(f"       -> {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
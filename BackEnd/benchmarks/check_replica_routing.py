@@ -0,0 +1,152 @@
+# benchmarks/check_replica_routing.py
+# 읽기 복제본 라우팅과 read-your-writes 동작 확인 (sqlite 파일 2개를 기본 DB/복제본으로 사용)
+#
+# 실행 (BackEnd 디렉토리에서):
+#   python -m benchmarks.check_replica_routing
+#
+# 두 파일에 같은 데이터를 넣은 뒤 복제본 쪽 설명 문구만 바꿔 어느 DB에서 읽었는지 구분합니다.
+# 복제는 일어나지 않으므로 기본 DB에 쓴 저장 토글은 복제본에 반영되지 않은 "지연" 상태가 됩니다.
+# 기대와 다르면 종료 코드 1로 끝납니다.
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_dir = tempfile.mkdtemp(prefix="check_replica_")
+PRIMARY_URL = f"sqlite:///{os.path.join(_tmp_dir, 'primary.db')}"
+REPLICA_URL = f"sqlite:///{os.path.join(_tmp_dir, 'replica.db')}"
+WINDOW = 1.0
+os.environ.update({
+    "DATABASE_URL": PRIMARY_URL,
+    "READ_REPLICA_URL": REPLICA_URL,
+    "READ_YOUR_WRITES_SECONDS": str(WINDOW),
+    "RESPONSE_CACHE_TTL": "0",      # 캐시 없이 매번 DB에서 읽도록
+    "PIPELINE_ENABLED": "0",
+    "BCRYPT_ROUNDS": "10",
+})
+
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from core.database import engine
+from core.db_routing import LAST_WRITE_HEADER, recent_writers
+from core.migrations import run_migrations
+from core.security import ALGORITHM, SECRET_KEY
+from models.hair_recommendation import HairRecommendation
+from models.hairstyle import Hairstyle
+from models.request import Request
+from models.result import Result
+from models.user import User
+
+replica_engine = create_engine(REPLICA_URL, connect_args={"check_same_thread": False})
+
+
+def seed(bind):
+    run_migrations(bind)
+    db = sessionmaker(bind=bind)()
+    try:
+        style = Hairstyle(hairstyle_name="리프컷", hairstyle_image_url="https://example.com/s.jpg", hairstyle_sex="남성")
+        db.add(style)
+        db.flush()
+        for n in (1, 2):
+            user = User(name=f"user{n}", email=f"user{n}@example.com", password="x")
+            db.add(user)
+            db.flush()
+            req = Request(
+                user_image_url="https://example.com/u.jpg", hair_length="숏", hair_type="직모",
+                sex="남성", location="서울", cheekbone="보통", mood="깔끔", dyed=0,
+                forehead_shape="둥근", difficulty="쉬움", has_bangs=0, user_id=user.user_id,
+            )
+            db.add(req)
+            db.flush()
+            db.add(Result(
+                face_type="계란형", skin_tone="봄웜", forehead="넓음", sex="남성",
+                rec_color="브라운", summary="요약", request_id=req.request_id,
+            ))
+            db.add(HairRecommendation(
+                simulation_image_url="dummy.jpg", hair_name="리프컷", description="primary", is_saved=0,
+                request_id=req.request_id, hair_id=style.hair_id, user_id=user.user_id,
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def token(user_id: int) -> dict:
+    value = jwt.encode({"sub": str(user_id), "exp": datetime.utcnow() + timedelta(hours=1)}, SECRET_KEY, algorithm=ALGORITHM)
+    return {"Authorization": f"Bearer {value}"}
+
+
+def main() -> int:
+    seed(engine)
+    seed(replica_engine)
+    # 복제본에서 읽었는지 구분하기 위한 표시
+    with replica_engine.begin() as conn:
+        conn.execute(update(HairRecommendation).values(description="replica"))
+
+    import main as app_main
+    failures = 0
+
+    def check(name, condition, detail):
+        nonlocal failures
+        failures += not condition
+        print(f"[{'OK' if condition else 'FAIL'}] {name}")
+        print(f"       {detail}")
+
+    with TestClient(app_main.app) as client:
+        user1, user2 = token(1), token(2)
+
+        def recommendation(headers, request_id):
+            response = client.get(f"/user/hair-recommendations/{request_id}", headers=headers)
+            response.raise_for_status()
+            return response.json()[0]
+
+        rec = recommendation(user1, 1)
+        check("쓰기 전 조회는 복제본", rec["description"] == "replica", rec)
+
+        response = client.put(f"/user/hair-recommendations/{rec['hair_rec_id']}/toggle-save", headers=user1)
+        toggled, last_write = response.json(), response.headers.get(LAST_WRITE_HEADER)
+        check("쓰기 응답에 X-Last-Write 헤더", last_write is not None, dict(response.headers))
+        rec = recommendation(user1, 1)
+        check("본인 쓰기 직후 조회는 기본 DB", rec["description"] == "primary" and rec["is_saved"] == toggled["is_saved"], rec)
+        check("조회 응답에는 X-Last-Write 없음",
+              LAST_WRITE_HEADER not in client.get("/user/latest-request-id", headers=user1).headers, "")
+
+        # 다른 워커가 조회를 받은 경우: 이 프로세스의 쓰기 표시는 없고 앱이 돌려보낸 헤더만 있음
+        recent_writers._until.clear()
+        rec = recommendation({**user1, LAST_WRITE_HEADER: last_write}, 1)
+        check("다른 워커라도 X-Last-Write 가 창 안이면 기본 DB", rec["description"] == "primary", rec)
+        rec = recommendation(user1, 1)
+        check("헤더 없이 다른 워커로 가면 복제본", rec["description"] == "replica", rec)
+        rec = recommendation({**user1, LAST_WRITE_HEADER: str(time.time() + 3600)}, 1)
+        check("미래 시각 X-Last-Write 는 무시", rec["description"] == "replica", rec)
+
+        rec = recommendation(user2, 2)
+        check("다른 사용자 조회는 계속 복제본", rec["description"] == "replica", rec)
+
+        # 캐시 무효화를 거치지 않은 기본 DB 쓰기 (예: 수동 SQL)는 복제 전까지 보이지 않음
+        with engine.begin() as conn:
+            conn.execute(Request.__table__.insert().values(
+                user_image_url="", hair_length="숏", hair_type="직모", sex="남성", location="서울",
+                cheekbone="보통", mood="깔끔", dyed=0, forehead_shape="둥근", difficulty="쉬움",
+                has_bangs=0, user_id=2, created_at=datetime.utcnow() + timedelta(minutes=1),
+            ))
+        latest = client.get("/user/latest-request-id", headers=user2).json()
+        check("latest-request-id 도 복제본에서 조회", latest == {"request_id": 2}, latest)
+
+        time.sleep(WINDOW + 0.2)
+        rec = recommendation({**user1, LAST_WRITE_HEADER: last_write}, 1)
+        check("창이 지나면 다시 복제본 (복제 지연 중이면 이전 값)", rec["description"] == "replica" and not rec["is_saved"], rec)
+
+    print(f"조회 라우팅: {recent_writers.stats()}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+# core/admission.py
+# /analyze-face 요청 수락 제어 (사용자별 토큰 버킷 + 파이프라인 포화 시 전체 거절)
+#
+# 분석 요청 1건은 요청 행 생성, S3 업로드, extract → recommend → simulate(GPU) 작업으로 이어지므로
+# 요청이 몰리면 GPU 대기열이 수 시간 분량으로 쌓일 수 있습니다. 요청을 받기 전에 두 가지를 확인합니다.
+#   1. 파이프라인 포화: DB의 대기/실행 중 작업 수와 단계별 최근 실행 시간으로 새 요청의 예상 대기 시간을 계산해
+#      ADMISSION_MAX_PENDING 또는 ADMISSION_MAX_WAIT_SECONDS 를 넘으면 거절
+#   2. 사용자별 한도: ANALYZE_USER_BURST 건까지 연속 허용, 이후 시간당 ANALYZE_USER_PER_HOUR 건씩 회복
+# 거절 시 429 + Retry-After(초)로 응답하고, 수락 시 대기열 위치와 예상 대기 시간을 함께 돌려줍니다.
+# 이전 결과를 복제하는 중복 요청(core.request_dedup)은 파이프라인을 실행하지 않으므로 검사하지 않습니다.
+#
+# 대기열 길이는 DB에서 읽으므로 워커 간에 공유되지만, 사용자 버킷과 실행 시간 통계는 워커 프로세스마다 따로 있습니다.
+# (워커를 여러 개 띄우면 사용자 한도는 워커 수만큼 느슨해짐)
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException
+
+from core.metrics import register_collector, render_family
+from core.orchestrator import orchestrator
+
+ANALYZE_USER_BURST = float(os.getenv("ANALYZE_USER_BURST", 3))
+ANALYZE_USER_PER_HOUR = float(os.getenv("ANALYZE_USER_PER_HOUR", 10))
+ANALYZE_USER_BUCKETS = int(os.getenv("ANALYZE_USER_BUCKETS", 10000))
+ADMISSION_MAX_PENDING = int(os.getenv("ADMISSION_MAX_PENDING", 100))
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", 1800))
+ADMISSION_REFRESH_SECONDS = float(os.getenv("ADMISSION_REFRESH_SECONDS", 2))
+# 실행 기록이 없는 단계(재시작 직후, 파이프라인을 돌리지 않는 워커)의 1건당 예상 실행 시간 (초)
+ADMISSION_DEFAULT_STAGE_SECONDS = {"extract": 10, "recommend": 30, "simulate": 60}
+MAX_RETRY_AFTER = 3600
+
+# 파이프라인 진행 순서 (앞 단계의 작업도 결국 뒤 단계를 거침)
+PIPELINE_ORDER = ("extract", "recommend", "simulate")
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated_at = now
+
+    def refill(self, capacity: float, rate: float, now: float):
+        self.tokens = min(capacity, self.tokens + (now - self.updated_at) * rate)
+        self.updated_at = now
+
+
+class UserRateLimiter:
+    def __init__(self, burst: float = ANALYZE_USER_BURST, per_hour: float = ANALYZE_USER_PER_HOUR,
+                 maxsize: int = ANALYZE_USER_BUCKETS):
+        self.burst = burst
+        self.rate = per_hour / 3600     # 초당 회복량
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()   # user_id -> TokenBucket
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.burst > 0 and self.rate > 0
+
+    # 토큰 1개 사용. 부족하면 다음 토큰까지 남은 초를 반환 (허용 시 0)
+    def take(self, user_id: int, now: float = None) -> float:
+        if not self.enabled:
+            return 0
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = self._buckets[user_id] = TokenBucket(self.burst, now)
+            # 가득 찬 버킷은 새로 만든 것과 같으므로 오래된 것부터 버려도 됨
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            bucket.refill(self.burst, self.rate, now)
+            self._buckets.move_to_end(user_id)
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0
+        self.limited += 1
+        return (1 - bucket.tokens) / self.rate
+
+    # 수락 후 요청 처리 중 오류로 작업이 만들어지지 않은 경우 토큰 반환
+    def refund(self, user_id: int):
+        bucket = self._buckets.get(user_id)
+        if bucket is not None:
+            bucket.tokens = min(self.burst, bucket.tokens + 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "burst": self.burst,
+            "per_hour": self.rate * 3600,
+            "tracked_users": len(self._buckets),
+            "limited": self.limited,
+        }
+
+
+class PipelineAdmission:
+    def __init__(self, max_pending: int = ADMISSION_MAX_PENDING, max_wait: float = ADMISSION_MAX_WAIT_SECONDS,
+                 refresh: float = ADMISSION_REFRESH_SECONDS):
+        self.max_pending = max_pending
+        self.max_wait = max_wait
+        self.refresh = refresh
+        self._pending = {}          # 단계 -> 대기/실행 중 작업 수 (마지막 조회 기준)
+        self._admitted_since = 0    # 마지막 조회 이후 이 워커가 수락한 요청 수
+        self._refreshed_at = None
+        self._lock = asyncio.Lock()
+        self.saturated = 0
+
+    async def _refresh(self):
+        if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh:
+            return
+        async with self._lock:
+            if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh:
+                return
+            depth = await orchestrator.queue_depth()
+            self._pending = {
+                stage: depth.get(stage, {}).get("queued", 0) + depth.get(stage, {}).get("running", 0)
+                for stage in PIPELINE_ORDER
+            }
+            self._admitted_since = 0
+            self._refreshed_at = time.monotonic()
+
+    # 단계별 1건당 실행 시간 / 동시 실행 수 (초)
+    @staticmethod
+    def _seconds_per_job(stage: str) -> float:
+        config = orchestrator.stages[stage]
+        durations = orchestrator.stats[stage].durations
+        if durations:
+            per_job = sorted(durations)[len(durations) // 2]
+        else:
+            per_job = ADMISSION_DEFAULT_STAGE_SECONDS.get(stage, config.timeout)
+        return per_job / max(1, config.concurrency)
+
+    # 새 요청 앞에 있는 작업 수, 예상 대기 시간(초), 병목 단계의 1건당 처리 시간(초)
+    def estimate(self):
+        ahead = sum(self._pending.values()) + self._admitted_since
+        wait, bottleneck = 0.0, 0.0
+        through = self._admitted_since   # 이 단계까지 거쳐야 하는 작업 수 (새로 수락한 요청은 extract 대기)
+        for stage in PIPELINE_ORDER:
+            through += self._pending.get(stage, 0)
+            per_job = self._seconds_per_job(stage)
+            # 가장 오래 걸리는 단계가 전체 대기 시간을 결정 (단계들은 동시에 진행됨)
+            if through * per_job > wait:
+                wait = through * per_job
+            bottleneck = max(bottleneck, per_job)
+        return ahead, wait, bottleneck
+
+    # 포화 상태면 다시 시도할 때까지의 초, 아니면 0
+    async def check(self) -> float:
+        await self._refresh()
+        ahead, wait, bottleneck = self.estimate()
+        retry_after = 0.0
+        if self.max_pending > 0 and ahead >= self.max_pending:
+            retry_after = (ahead - self.max_pending + 1) * bottleneck
+        if self.max_wait > 0 and wait > self.max_wait:
+            retry_after = max(retry_after, wait - self.max_wait)
+        if retry_after:
+            self.saturated += 1
+        return retry_after
+
+    def admitted(self):
+        self._admitted_since += 1
+
+    # 수락 후 작업을 만들지 못한 요청은 대기 수에서 제외 (그사이 조회로 0이 되었으면 그대로)
+    def released(self):
+        self._admitted_since = max(0, self._admitted_since - 1)
+
+    def snapshot(self) -> dict:
+        ahead, wait, _ = self.estimate()
+        return {
+            "max_pending": self.max_pending,
+            "max_wait_seconds": self.max_wait,
+            "pending": dict(self._pending),
+            "queue_position": ahead,
+            "estimated_wait_seconds": round(wait, 1),
+            "saturated": self.saturated,
+        }
+
+
+class AdmissionController:
+    def __init__(self):
+        self.users = UserRateLimiter()
+        self.pipeline = PipelineAdmission()
+        self.admitted = 0
+        self.cancelled = 0      # 수락 후 처리 중 오류로 작업을 만들지 못한 수
+
+    async def admit(self, user_id: int) -> dict:
+        # 파이프라인 포화로 거절할 때는 사용자 토큰을 쓰지 않도록 먼저 확인
+        retry_after = await self.pipeline.check()
+        if retry_after:
+            _reject("분석 요청이 많아 잠시 후 다시 시도해주세요.", retry_after)
+        retry_after = self.users.take(user_id)
+        if retry_after:
+            _reject("분석 요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.", retry_after)
+
+        ahead, wait, _ = self.pipeline.estimate()
+        self.pipeline.admitted()
+        self.admitted += 1
+        return {"queue_position": ahead + 1, "estimated_wait_seconds": round(wait)}
+
+    def cancel(self, user_id: int):
+        self.users.refund(user_id)
+        self.pipeline.released()
+        self.cancelled += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "admitted": self.admitted,
+            "cancelled": self.cancelled,
+            "user_limit": self.users.snapshot(),
+            "pipeline": self.pipeline.snapshot(),
+        }
+
+
+def _reject(message: str, retry_after: float):
+    seconds = min(MAX_RETRY_AFTER, max(1, math.ceil(retry_after)))
+    raise HTTPException(status_code=429, detail=message, headers={"Retry-After": str(seconds)})
+
+
+admission = AdmissionController()
+
+
+def _collect_metrics() -> list:
+    pipeline = admission.pipeline
+    _, wait, _ = pipeline.estimate()
+    return (
+        render_family("analyze_admitted_total", "counter", "/analyze-face 수락 수", [({}, admission.admitted)])
+        + render_family("analyze_cancelled_total", "counter", "수락 후 오류로 작업을 만들지 못한 수", [({}, admission.cancelled)])
+        + render_family("analyze_rejected_total", "counter", "/analyze-face 429 거절 수",
+                        [({"reason": "user_limit"}, admission.users.limited),
+                         ({"reason": "pipeline_saturated"}, pipeline.saturated)])
+        + render_family("pipeline_pending_jobs", "gauge", "단계별 대기/실행 중 작업 수 (마지막 조회 기준)",
+                        [({"stage": stage}, count) for stage, count in pipeline._pending.items()])
+        + render_family("pipeline_estimated_wait_seconds", "gauge", "새 분석 요청의 예상 대기 시간", [({}, round(wait, 3))])
+    )
+
+
+register_collector(_collect_metrics)
@@ -0,0 +1,125 @@
+# core/auth_cache.py
+# 토큰 → 인증 사용자 정보 캐시 (get_current_user의 JWT 디코딩 + user_table 조회 생략)
+#
+# 워커 프로세스마다 따로 존재하는 LRU + TTL 캐시입니다. 다른 워커에서 사용자 정보가
+# 바뀌면 이 워커에는 최대 AUTH_CACHE_TTL 초 동안 이전 정보가 남을 수 있으므로 TTL을 짧게 유지합니다.
+# 같은 워커에서의 변경은 User 매퍼 이벤트로 즉시 무효화됩니다.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+from core.metrics import register_collector, render_family
+from models.user import User
+
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 30))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10000))
+
+
+class PrincipalCache:
+    def __init__(self, maxsize: int = AUTH_CACHE_SIZE, ttl: float = AUTH_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()   # token -> (만료 시각(monotonic), user dict)
+        self._user_tokens = {}          # user_id -> {token, ...}
+        # 동기 라우트(스레드풀)와 이벤트 루프에서 동시에 접근할 수 있으므로 잠금 사용
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, token: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    # token_exp: JWT exp (epoch 초). 캐시 유효기간이 토큰 만료를 넘지 않도록 제한
+    def set(self, token: str, user: dict, token_exp=None):
+        if not self.enabled:
+            return
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, float(token_exp) - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (time.monotonic() + ttl, user)
+            self._user_tokens.setdefault(user["user_id"], set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    # 사용자 정보 변경/삭제 시 호출되는 무효화 훅
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in list(self._user_tokens.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_tokens.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, token: str):
+        _, user = self._entries.pop(token)
+        tokens = self._user_tokens.get(user["user_id"])
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._user_tokens[user["user_id"]]
+
+
+principal_cache = PrincipalCache()
+
+
+def _collect_metrics() -> list:
+    stats = principal_cache.stats()
+    return (
+        render_family("auth_cache_hits_total", "counter", "인증 사용자 캐시 적중 수", [({}, stats["hits"])])
+        + render_family("auth_cache_misses_total", "counter", "인증 사용자 캐시 미적중 수", [({}, stats["misses"])])
+        + render_family("auth_cache_evictions_total", "counter", "크기 초과로 제거된 항목 수", [({}, stats["evictions"])])
+        + render_family("auth_cache_entries", "gauge", "인증 사용자 캐시 항목 수", [({}, stats["size"])])
+    )
+
+
+register_collector(_collect_metrics)
+
+
+# ORM으로 사용자 정보가 수정/삭제되면 해당 사용자의 캐시 항목 제거
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_principal(mapper, connection, target):
+    principal_cache.invalidate_user(target.user_id)
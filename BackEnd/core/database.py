@@ -1,9 +1,14 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, BigInteger, Integer, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
+import asyncio
 import os
 
+from core.metrics import instrument_engine
+
 # .env 파일 로드
 load_dotenv()
 
@@ -14,28 +19,137 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
+# 커넥션 풀 크기 (동기/비동기 엔진 공통)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+# 서버 시작 후 미리 열어 둘 비동기 커넥션 수 (첫 요청들이 연결 수립을 기다리지 않도록)
+DB_POOL_WARM = int(os.getenv("DB_POOL_WARM", min(DB_POOL_SIZE, 4)))
+
 # 데이터베이스 URL 생성
-SQLALCHEMY_DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL 이 지정되면 그대로 사용 (예: 테스트/벤치마크용 sqlite:///./local.db)
+SQLALCHEMY_DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# 동기 드라이버 → 비동기 드라이버 매핑
+ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    to_async_url(SQLALCHEMY_DATABASE_URL)
+)
+
+# 읽기 전용 복제본 (지정하지 않으면 읽기도 기본 DB 사용). 라우팅 규칙은 core/db_routing.py
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+ASYNC_READ_REPLICA_URL = os.getenv(
+    "ASYNC_READ_REPLICA_URL",
+    to_async_url(READ_REPLICA_URL) if READ_REPLICA_URL else None
+)
+
+def engine_options(url: str) -> dict:
+    # sqlite는 스레드 간 커넥션 공유 허용 + 파일 DB 풀 크기만 설정 (pool_recycle 불필요)
+    if url.startswith("sqlite"):
+        options = {"connect_args": {"check_same_thread": False}}
+        if make_url(url).database not in (None, "", ":memory:"):
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW)
+            # aiosqlite 파일 DB 기본값은 NullPool이라 요청마다 새 연결(+ 전용 스레드)을 열고 닫으므로 풀 사용
+            if url.startswith("sqlite+aiosqlite"):
+                options["poolclass"] = AsyncAdaptedQueuePool
+        return options
+    return {
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
 
 # 엔진 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=1800,
-    pool_size=10,        # 필요하다면 조정
-    max_overflow=20,     # 필요하다면 조정
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+
+# 비동기 엔진 생성 (aiomysql / aiosqlite)
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    **engine_options(ASYNC_SQLALCHEMY_DATABASE_URL)
+)
+
+# 복제본 비동기 엔진 (없으면 기본 엔진 공유)
+async_replica_engine = (
+    create_async_engine(ASYNC_READ_REPLICA_URL, **engine_options(ASYNC_READ_REPLICA_URL))
+    if ASYNC_READ_REPLICA_URL else async_engine
 )
 
+# 쿼리 시간 / 요청별 쿼리 수 지표 (/metrics)
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "primary")
+if async_replica_engine is not async_engine:
+    instrument_engine(async_replica_engine.sync_engine, "replica")
+
 # 세션 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 세션 생성 (commit 후에도 객체 속성 접근이 가능하도록 expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# 복제본 비동기 세션 (조회 전용)
+ReplicaSessionLocal = async_sessionmaker(
+    bind=async_replica_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Base 클래스 생성
 Base = declarative_base()
 
+# BIGINT PK 타입 (sqlite는 INTEGER PK에서만 autoincrement가 동작하므로 변형 지정)
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
 # 데이터베이스 세션 의존성
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# 비동기 데이터베이스 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# 커넥션 size개를 동시에 열어 풀에 채워 둠 (연결 확인 겸용, size는 DB_POOL_SIZE 이하)
+async def warm_pool(engine=async_engine, size: int = DB_POOL_WARM):
+    size = max(1, size)
+    # 모든 연결이 열린 뒤 함께 반납해야 서로 다른 커넥션이 풀에 남음
+    all_open = asyncio.Event()
+    opened = 0
+
+    async def open_one():
+        nonlocal opened
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                opened += 1
+                if opened == size:
+                    all_open.set()
+                await all_open.wait()
+        except Exception:
+            all_open.set()  # 실패 시 기다리는 다른 연결도 반납
+            raise
+
+    await asyncio.gather(*(open_one() for _ in range(size)))
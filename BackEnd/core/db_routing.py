@@ -0,0 +1,147 @@
+# core/db_routing.py
+# 조회 API의 읽기 복제본 라우팅 + 본인 쓰기 직후 기본 DB 읽기 (read-your-writes)
+#
+# 앱이 주기적으로 호출하는 조회(GET /user/result, /user/hair-recommendations, /user/latest-request-id 등)는
+# get_async_read_db 의존성으로 복제본(READ_REPLICA_URL)에서 읽어 추천/합성 결과 쓰기와 기본 DB를 나눠 씁니다.
+#
+# 복제 지연 때문에 방금 쓴 내용이 복제본에 아직 없을 수 있으므로, 사용자 데이터가 바뀐 뒤
+# READ_YOUR_WRITES_SECONDS 동안은 그 사용자의 조회를 기본 DB로 보냅니다.
+# 변경 시점은 응답 캐시 무효화(core.response_cache.invalidate)와 같은 곳에서 기록하므로
+# 사용자 본인의 저장 토글뿐 아니라 GraphRAG/합성 서버가 대신 쓴 결과도 포함되고,
+# 다른 워커의 변경도 무효화 채널을 통해 함께 전달됩니다.
+# (창이 복제 지연보다 짧으면 복제본의 이전 값이 응답 캐시에 새 버전으로 저장될 수 있으므로 여유 있게 설정)
+#
+# 브로커 메시지는 다른 워커에 조금 늦게 도착할 수 있으므로, 사용자 요청으로 쓴 경우에는 응답에
+# X-Last-Write(서버 시각, epoch 초) 헤더를 붙이고 앱이 이후 요청에 그대로 돌려보냅니다.
+# 어느 워커가 조회를 받아도 이 값이 창 안이면 기본 DB에서 읽습니다. (서버가 준 시각이므로 시계 차이 없음)
+
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from fastapi import Depends, Request
+
+from core.database import AsyncSessionLocal, ReplicaSessionLocal, async_engine, async_replica_engine
+from core.metrics import register_collector, render_family
+from core.security import get_current_user
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+RECENT_WRITERS_SIZE = int(os.getenv("RECENT_WRITERS_SIZE", 10000))
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+class RecentWriters:
+    def __init__(self, window: float = READ_YOUR_WRITES_SECONDS, maxsize: int = RECENT_WRITERS_SIZE):
+        self.window = window
+        self.maxsize = maxsize
+        self._until = OrderedDict()  # user_id -> 기본 DB로 읽을 마감 시각
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def mark(self, user_id: int):
+        if self.window <= 0:
+            return
+        self._until[user_id] = time.monotonic() + self.window
+        self._until.move_to_end(user_id)
+        # 마감 시각 순서로 정렬되어 있으므로 앞쪽의 만료 항목만 정리
+        now = time.monotonic()
+        while self._until and (len(self._until) > self.maxsize or next(iter(self._until.values())) <= now):
+            self._until.popitem(last=False)
+
+    def active(self, user_id: int) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "tracked": len(self._until),
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+        }
+
+
+recent_writers = RecentWriters()
+
+
+def _collect_metrics() -> list:
+    stats = recent_writers.stats()
+    return (
+        render_family("read_session_routed_total", "counter", "조회 세션을 연 DB (primary: 쓰기 직후 또는 복제본 없음)",
+                      [({"target": "primary"}, stats["primary_reads"]), ({"target": "replica"}, stats["replica_reads"])])
+        + render_family("read_your_writes_users", "gauge", "기본 DB로 읽는 최근 쓰기 사용자 수", [({}, stats["tracked"])])
+    )
+
+
+register_collector(_collect_metrics)
+
+# 복제본이 따로 설정되어 있는지 여부
+REPLICA_ENABLED = async_replica_engine is not async_engine
+
+
+# 현재 HTTP 요청에서 쓴 사용자 표시 (ReadYourWritesMiddleware가 요청마다 새 목록으로 설정)
+_request_writes = ContextVar("request_writes", default=None)
+
+
+def note_user_write(user_id: int):
+    recent_writers.mark(int(user_id))
+    writes = _request_writes.get()
+    if writes is not None:
+        writes.append(int(user_id))
+
+
+# 앱이 돌려보낸 X-Last-Write 가 창 안인지 (미래 시각이나 잘못된 값은 무시)
+def client_wrote_recently(request: Request) -> bool:
+    try:
+        elapsed = time.time() - float(request.headers.get(LAST_WRITE_HEADER, ""))
+    except ValueError:
+        return False
+    return 0 <= elapsed < READ_YOUR_WRITES_SECONDS
+
+
+def read_session_factory(user_id=None, recent_write: bool = False):
+    if not REPLICA_ENABLED or recent_write or (user_id is not None and recent_writers.active(int(user_id))):
+        recent_writers.primary_reads += 1
+        return AsyncSessionLocal
+    recent_writers.replica_reads += 1
+    return ReplicaSessionLocal
+
+
+# 조회가 복제본에서 읽었는지 (응답 캐시가 쓰기 직후의 복제본 결과를 저장하지 않도록 확인)
+def read_from_replica(request: Request) -> bool:
+    return getattr(request.state, "read_replica", False)
+
+
+# 로그인 사용자 조회 API용 세션 의존성 (쓰기 API는 계속 get_async_db 사용)
+async def get_async_read_db(request: Request, current_user: dict = Depends(get_current_user)):
+    factory = read_session_factory(current_user["user_id"], client_wrote_recently(request))
+    request.state.read_replica = factory is ReplicaSessionLocal
+    async with factory() as db:
+        yield db
+
+
+# 요청 처리 중 사용자 데이터를 바꿨으면 응답에 X-Last-Write 헤더 추가
+class ReadYourWritesMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = []
+        token = _request_writes.set(writes)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and writes:
+                headers = list(message.get("headers", []))
+                headers.append((LAST_WRITE_HEADER.lower().encode(), f"{time.time():.3f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_writes.reset(token)
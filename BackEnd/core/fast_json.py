@@ -0,0 +1,58 @@
+# core/fast_json.py
+# 목록 조회 응답의 빠른 JSON 직렬화 (orjson) + gzip 설정
+#
+# 기존 목록 응답은 ORM 객체 → dict → response_model(pydantic) 검증 → dict → json.dumps 순서로 변환했습니다.
+# RowSerializer 를 쓰는 라우트는 응답에 필요한 컬럼만 조회하고, 행 튜플을 orjson으로 바로 JSON 바이트로 만들어
+# 중간 변환을 모두 생략합니다. (benchmarks/bench_json_response.py)
+#
+# 사용 (라우트별 선택 적용):
+#   SHOP_ROW = RowSerializer(("hairshop_rec_id", Shop.hairshop_rec_id), ("is_saved", Shop.is_saved, bool), ...)
+#   rows = (await db.execute(select(*SHOP_ROW.columns).where(...))).all()
+#   return FastJSONResponse(SHOP_ROW.dumps(rows))
+# response_model 은 OpenAPI 문서용으로 그대로 두되, 검증을 거치지 않으므로 필드 이름/순서는 RowSerializer 정의와
+# 맞춰야 하고 bool 처럼 DB 값과 응답 타입이 다른 필드는 변환 함수를 지정합니다.
+# NULL 허용 컬럼이 응답 모델에서 필수 필드이면 null이 그대로 나가므로 컬럼 대신 func.coalesce(컬럼, 기본값)을 조회합니다.
+#
+#   GZIP_MIN_SIZE=1024      이 크기(바이트) 이상인 응답만 gzip 압축 (Accept-Encoding: gzip 요청에 한함, 0이면 끔)
+#   GZIP_LEVEL=6            압축 수준 (1~9, 높을수록 작지만 느림)
+
+import os
+
+import orjson
+from fastapi.responses import Response
+
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    # 이미 직렬화된 바이트는 그대로 사용
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
+
+
+class RowSerializer:
+    # fields: (응답 필드 이름, 조회할 컬럼) 또는 (응답 필드 이름, 조회할 컬럼, 변환 함수)
+    def __init__(self, *fields):
+        self.names = tuple(field[0] for field in fields)
+        # 응답 필드 이름으로 label (coalesce 같은 식도 행에서 row.필드이름 으로 읽을 수 있도록)
+        self.columns = tuple(field[1].label(field[0]) for field in fields)
+        self.converters = tuple(field[2] if len(field) > 2 else None for field in fields)
+        # 변환이 필요한 필드 위치만 따로 보관 (행마다 모든 필드를 검사하지 않도록)
+        self._converted = tuple((i, convert) for i, convert in enumerate(self.converters) if convert is not None)
+
+    # select(*serializer.columns) 결과 행 → dict
+    def row(self, row) -> dict:
+        if not self._converted:
+            return dict(zip(self.names, row))
+        values = list(row)
+        for i, convert in self._converted:
+            values[i] = convert(values[i])
+        return dict(zip(self.names, values))
+
+    def dumps(self, rows) -> bytes:
+        return orjson.dumps([self.row(row) for row in rows])
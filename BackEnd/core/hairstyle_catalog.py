@@ -0,0 +1,173 @@
+# core/hairstyle_catalog.py
+# GraphRAG 추천 스타일명 → hair_id 매핑용 프로세스 내 헤어스타일 카탈로그 인덱스
+#
+# hairstyle_table은 작고 거의 바뀌지 않으므로 시작 시 한 번 읽어 메모리에 둡니다.
+# (정규화된 이름, 성별)마다 가능한 (type, face, length) 조합별 최적 후보를 미리 계산해 두어
+# 조회는 딕셔너리 접근만으로 끝납니다.
+#
+# 갱신 시점
+# - HAIRSTYLE_CATALOG_TTL 초가 지난 뒤 다음 조회 시 (다른 워커/수동 SQL 변경 반영)
+# - 같은 프로세스에서 ORM으로 Hairstyle을 추가/수정/삭제하면 버전이 올라가 다음 조회 시
+
+import asyncio
+import logging
+import os
+import re
+import time
+from itertools import product
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, select
+
+from core.database import AsyncSessionLocal
+from models.hairstyle import Hairstyle
+
+logger = logging.getLogger(__name__)
+
+HAIRSTYLE_CATALOG_TTL = float(os.getenv("HAIRSTYLE_CATALOG_TTL", 600))
+
+# 표기가 흔들리는 스타일명 (GraphRAG 스타일 사전과 hairstyle_table 간 불일치)
+NAME_VARIANTS = {
+    "테슬": "태슬",
+    "엘리자벳": "엘리자베스",
+    "글래펌": "글램펌",
+}
+# 공백과 조합 스타일 구분자 (예: "태슬펌_태슬컷", "태슬펌 + 태슬컷")
+_SEPARATORS = re.compile(r"[\s_+/,·]+")
+
+# 후보에 없는 선택 조건 값 (어떤 후보와도 일치하지 않음)
+_OTHER = object()
+
+
+def normalize_style_name(name: str) -> str:
+    key = _SEPARATORS.sub("", name or "")
+    for variant, canonical in NAME_VARIANTS.items():
+        key = key.replace(variant, canonical)
+    return key.lower()
+
+
+# 후보 목록에 대해 (type, face, length) 조합별 최적 hair_id 계산
+# 점수가 같으면 hair_id가 작은 후보 (기존 DB 조회 순서와 동일)
+def _best_matches(candidates):
+    types = {h.hairstyle_type for h in candidates} | {_OTHER}
+    faces = {h.hairstyle_face for h in candidates} | {_OTHER}
+    lengths = {h.hairstyle_length for h in candidates} | {_OTHER}
+
+    table = {}
+    for key in product(types, faces, lengths):
+        best, best_score = None, -1
+        for h in candidates:
+            score = (
+                (h.hairstyle_type == key[0])
+                + (h.hairstyle_face == key[1])
+                + (h.hairstyle_length == key[2])
+            )
+            if score > best_score:
+                best, best_score = h, score
+        table[key] = best.hair_id
+    return table, types, faces, lengths
+
+
+class HairstyleCatalog:
+    def __init__(self, ttl: float = HAIRSTYLE_CATALOG_TTL):
+        self.ttl = ttl
+        self.version = 0            # ORM 변경 시 증가
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._index = {}            # (정규화 이름, 성별) -> (조합 테이블, types, faces, lengths)
+        self._names = {}            # hair_id -> 스타일명
+        self._build_hooks = []      # 같은 행으로 함께 만드는 다른 인덱스 (core/style_search)
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self._loaded_version != self.version
+            or time.monotonic() - self._loaded_at >= self.ttl
+        )
+
+    def bump_version(self):
+        self.version += 1
+
+    def build(self, hairstyles):
+        grouped = {}
+        for h in sorted(hairstyles, key=lambda h: h.hair_id):
+            key = (normalize_style_name(h.hairstyle_name), (h.hairstyle_sex or "").strip())
+            grouped.setdefault(key, []).append(h)
+        self._index = {key: _best_matches(candidates) for key, candidates in grouped.items()}
+        self._names = {h.hair_id: h.hairstyle_name for h in hairstyles}
+        for hook in self._build_hooks:
+            hook(hairstyles)
+
+    def on_build(self, hook):
+        self._build_hooks.append(hook)
+
+    async def _load(self, db=None):
+        version = self.version
+        if db is None:
+            async with AsyncSessionLocal() as session:
+                hairstyles = (await session.execute(select(Hairstyle))).scalars().all()
+        else:
+            hairstyles = (await db.execute(select(Hairstyle))).scalars().all()
+        # 검색 인덱스 생성까지 포함되므로 이벤트 루프 밖에서 실행
+        await run_in_threadpool(self.build, hairstyles)
+        self._loaded_version = version
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+        logger.info("헤어스타일 카탈로그 로드", extra={"hairstyles": len(hairstyles), "styles": len(self._index)})
+
+    async def refresh(self, db=None):
+        async with self._lock:
+            await self._load(db)
+
+    async def ensure_fresh(self, db=None):
+        if not self.stale:
+            return
+        # 동시에 만료를 감지한 요청들은 한 번만 로드
+        async with self._lock:
+            if self.stale:
+                await self._load(db)
+
+    # 필수 조건(이름, 성별) + 선택 조건 일치 수가 가장 많은 hair_id (없으면 None)
+    def best_match(self, name: str, sex: str, hair_type=None, face=None, length=None):
+        entry = self._index.get((normalize_style_name(name), (sex or "").strip()))
+        if entry is None:
+            self.misses += 1
+            return None
+        table, types, faces, lengths = entry
+        self.hits += 1
+        return table[(
+            hair_type if hair_type in types else _OTHER,
+            face if face in faces else _OTHER,
+            length if length in lengths else _OTHER,
+        )]
+
+    def name_of(self, hair_id: int):
+        return self._names.get(hair_id)
+
+    # 카탈로그의 정규화된 스타일명 전체
+    def style_keys(self) -> set:
+        return {name for name, _ in self._index}
+
+    def stats(self) -> dict:
+        return {
+            "styles": len(self._index),
+            "version": self.version,
+            "loads": self.loads,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+hairstyle_catalog = HairstyleCatalog()
+
+
+# 같은 프로세스에서 카탈로그가 바뀌면 다음 조회 때 다시 로드
+@event.listens_for(Hairstyle, "after_insert")
+@event.listens_for(Hairstyle, "after_update")
+@event.listens_for(Hairstyle, "after_delete")
+def _bump_catalog_version(mapper, connection, target):
+    hairstyle_catalog.bump_version()
@@ -0,0 +1,242 @@
+# core/http_client.py
+# 하위 서비스(face_extract, GraphRAG, StableHair) 호출용 공용 비동기 HTTP 클라이언트
+#
+# - 대상별 keep-alive 커넥션 풀과 동시 연결 수 제한
+# - 연결/응답 타임아웃
+# - 재시도 예산: 요청이 전송되지 않은 연결 오류만 재시도하고, 재시도 비율을 전체 요청의 일정 비율로 제한
+# - 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 즉시 실패 처리 (느린 서비스가 워커를 붙잡지 않도록)
+# - 대상별 응답 시간 히스토그램 (/metrics 의 downstream_request_duration_seconds)
+
+import asyncio
+import os
+import time
+
+import httpx
+
+from core.metrics import LatencyHistogram, register_collector, render_family
+
+# 응답 시간 히스토그램 구간 (초). GraphRAG/StableHair는 수 분 단위이므로 넓게 잡음
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출하지 않고 즉시 실패"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.half_open_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        # half_open: 시험 요청 1건만 허용
+        if state == "half_open" and not self.half_open_in_flight:
+            self.half_open_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.half_open_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.half_open_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    # 재시도는 최근 요청 수의 ratio 비율 + 최소 min_per_window 건까지만 허용
+    def __init__(self, ratio: float = 0.2, min_per_window: int = 3, window: float = 60):
+        self.ratio = ratio
+        self.min_per_window = min_per_window
+        self.window = window
+        self._window_started = time.monotonic()
+        self.requests = 0
+        self.retries = 0
+
+    def _roll(self):
+        if time.monotonic() - self._window_started >= self.window:
+            self._window_started = time.monotonic()
+            self.requests = 0
+            self.retries = 0
+
+    def record_request(self):
+        self._roll()
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        self._roll()
+        if self.retries < self.min_per_window + self.requests * self.ratio:
+            self.retries += 1
+            return True
+        return False
+
+
+# 요청이 서버에 전달되지 않았음이 확실한 오류 (POST 재시도해도 중복 처리 위험 없음)
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class ServiceClient:
+    def __init__(self, name: str, base_url: str, max_connections: int, connect_timeout: float,
+                 read_timeout: float, max_retries: int, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.budget = RetryBudget()
+        self.histogram = LatencyHistogram(LATENCY_BUCKETS)
+        self.in_flight = 0
+        self.errors = 0
+        self.rejected = 0
+        self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            )
+        return self._client
+
+    async def request(self, method: str, path: str, timeout: float = None, **kwargs) -> httpx.Response:
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} 서킷 열림 - 호출 생략")
+
+        self.budget.record_request()
+        if timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(timeout, connect=self.connect_timeout)
+
+        attempt = 0
+        self.in_flight += 1
+        started = time.monotonic()
+        try:
+            while True:
+                try:
+                    response = await self.client.request(method, path, **kwargs)
+                except RETRYABLE_ERRORS:
+                    if attempt < self.max_retries and self.budget.try_spend():
+                        attempt += 1
+                        await asyncio.sleep(min(0.1 * (2 ** attempt), 2))
+                        continue
+                    raise
+                break
+        except asyncio.CancelledError:
+            # 시험 요청이 취소되면 다음 요청이 다시 시험할 수 있도록 해제
+            self.breaker.half_open_in_flight = False
+            raise
+        except Exception:
+            self.errors += 1
+            self.breaker.record_failure()
+            raise
+        finally:
+            self.in_flight -= 1
+            self.histogram.observe(time.monotonic() - started)
+
+        if response.status_code >= 500:
+            self.errors += 1
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+    async def post(self, path: str, json=None, timeout: float = None) -> httpx.Response:
+        return await self.request("POST", path, json=json, timeout=timeout)
+
+    async def get(self, path: str, timeout: float = None, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, timeout=timeout, **kwargs)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def snapshot(self) -> dict:
+        return {
+            "base_url": self.base_url,
+            "circuit": self.breaker.state,
+            "in_flight": self.in_flight,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "retries": self.budget.retries,
+            "latency_seconds": self.histogram.snapshot(),
+        }
+
+
+def _service(name: str, default_url: str, max_connections: int, read_timeout: float):
+    prefix = f"{name.upper()}_"
+    return ServiceClient(
+        name=name,
+        base_url=os.getenv(prefix + "URL", default_url),
+        max_connections=int(os.getenv(prefix + "MAX_CONNECTIONS", max_connections)),
+        connect_timeout=float(os.getenv(prefix + "CONNECT_TIMEOUT", 3)),
+        read_timeout=float(os.getenv(prefix + "READ_TIMEOUT", read_timeout)),
+        max_retries=int(os.getenv(prefix + "MAX_RETRIES", 2)),
+        failure_threshold=int(os.getenv(prefix + "FAILURE_THRESHOLD", 5)),
+        reset_timeout=float(os.getenv(prefix + "RESET_TIMEOUT", 30)),
+    )
+
+
+# 하위 서비스 ([개발용] Docker 내부 통신: http://extract_face:8001, http://graphrag:8002, http://stablehair:8003)
+face_extract = _service("face_extract", "http://43.201.129.41:8001", 8, 180)
+graphrag = _service("graphrag", "http://43.201.129.41:8002", 4, 600)
+stablehair = _service("stablehair", "http://43.201.129.41:8003", 2, 1200)
+
+SERVICES = {client.name: client for client in (face_extract, graphrag, stablehair)}
+
+
+async def close_clients():
+    for client in SERVICES.values():
+        await client.close()
+
+
+def http_stats() -> dict:
+    return {name: client.snapshot() for name, client in SERVICES.items()}
+
+
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def _collect_metrics() -> list:
+    clients = list(SERVICES.values())
+    return (
+        render_family("downstream_request_duration_seconds", "histogram", "하위 서비스 호출 시간 (재시도 포함)",
+                      [({"service": c.name}, c.histogram) for c in clients])
+        + render_family("downstream_requests_in_flight", "gauge", "하위 서비스 호출 중인 요청 수",
+                        [({"service": c.name}, c.in_flight) for c in clients])
+        + render_family("downstream_errors_total", "counter", "하위 서비스 호출 실패 수 (5xx 포함)",
+                        [({"service": c.name}, c.errors) for c in clients])
+        + render_family("downstream_circuit_rejected_total", "counter", "서킷이 열려 호출하지 않은 수",
+                        [({"service": c.name}, c.rejected) for c in clients])
+        + render_family("downstream_circuit_state", "gauge", "서킷 상태 (0 closed, 1 half_open, 2 open)",
+                        [({"service": c.name}, CIRCUIT_STATES[c.breaker.state]) for c in clients])
+    )
+
+
+register_collector(_collect_metrics)
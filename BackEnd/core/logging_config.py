@@ -0,0 +1,100 @@
+# core/logging_config.py
+# 레벨별 구조화 로그 (print 대체)
+#
+# 핸들러에서 바로 출력하지 않고 QueueHandler로 큐에 넣기만 하고, 별도 스레드(QueueListener)가 stdout에 씁니다.
+# 요청 처리 중에는 로그 기록 비용이 레코드 복사 + 큐 삽입뿐이고, 출력이 느려도 이벤트 루프가 막히지 않습니다.
+#
+#   LOG_LEVEL=INFO          DEBUG / INFO / WARNING / ERROR
+#   LOG_FORMAT=json         json: 한 줄에 JSON 객체 하나 (수집기용), text: 사람이 읽는 형식
+#
+# 사용:
+#   logger = logging.getLogger(__name__)
+#   logger.info("추천 결과 저장", extra={"user_id": user_id, "request_id": request_id})
+# extra 로 넘긴 값은 JSON 필드 (text 형식에서는 key=value)로 출력됩니다.
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# LogRecord 기본 속성 (나머지는 extra 로 넘긴 값)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+def _extra(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RESERVED}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **_extra(record),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _QueueHandler(QueueHandler):
+    # 기본 prepare는 메시지에 예외 traceback까지 합쳐 버리므로, 메시지와 traceback을 따로 보존
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener = None
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_QueueHandler(records)]
+    root.setLevel(level)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    # 종료 시 큐에 남은 로그를 모두 출력
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,263 @@
+# core/metrics.py
+# Main API 지표 수집 + Prometheus 텍스트 형식 출력 (GET /metrics)
+#
+# - MetricsMiddleware: 라우트별 응답 시간 히스토그램(요청 수 = _count), 처리 중 요청 수
+# - instrument_engine: SQLAlchemy 커서 이벤트로 쿼리 시간을 재고, 요청별 쿼리 수/DB 시간을 라우트 단위로 기록
+# - 다른 모듈의 상태(하위 서비스 호출 시간, 분석 요청 수락 제어 등)는 register_collector 로 출력 시점에 수집
+#
+# 워커 프로세스마다 따로 집계되므로 uvicorn 워커를 여러 개 띄우면 Prometheus가 워커별로 수집해 합산합니다.
+# 라벨에는 요청 경로 대신 라우트 경로 템플릿(/user/result/{request_id})을 사용해 시계열 수가 늘지 않게 합니다.
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+# 구간 (초 / 건)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+# 라우트에 해당하지 않는 요청 (스캐너 등) 라벨
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=REQUEST_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def snapshot(self) -> dict:
+        # Prometheus와 같은 누적 구간 값
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative[str(bound)] = total
+        cumulative["+Inf"] = self.count
+        return {"buckets": cumulative, "count": self.count, "sum": round(self.sum, 3)}
+
+
+# ─────────────────────────────────────────────
+# Prometheus 텍스트 형식
+# ─────────────────────────────────────────────
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+# samples: [(라벨 dict, 값)] 또는 histogram이면 [(라벨 dict, LatencyHistogram)]
+def render_family(name: str, kind: str, help_text: str, samples) -> list:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if kind == "histogram":
+            total = 0
+            for bound, count in zip(value.buckets, value.counts):
+                total += count
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {total}")
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {value.count}")
+            lines.append(f"{name}_sum{_labels(labels)} {round(value.sum, 6)}")
+            lines.append(f"{name}_count{_labels(labels)} {value.count}")
+        else:
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+    return lines
+
+
+class Family:
+    def __init__(self, name: str, kind: str, help_text: str, labelnames=(), buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._series = {}   # 라벨 값 tuple -> 값 (histogram이면 LatencyHistogram)
+        # 동기 라우트(스레드풀)와 DB 이벤트에서도 기록하므로 잠금 사용
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            histogram = self._series.get(labels)
+            if histogram is None:
+                histogram = self._series[labels] = LatencyHistogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, amount: float = 1, *labels):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def dec(self, amount: float = 1, *labels):
+        self.inc(-amount, *labels)
+
+    def render(self) -> list:
+        with self._lock:
+            samples = [(dict(zip(self.labelnames, labels)), value) for labels, value in sorted(self._series.items())]
+        return render_family(self.name, self.kind, self.help, samples)
+
+
+class Registry:
+    def __init__(self):
+        self._families = []
+        self._collectors = []
+
+    def histogram(self, name, help_text, labelnames=(), buckets=REQUEST_BUCKETS) -> Family:
+        family = Family(name, "histogram", help_text, labelnames, buckets)
+        self._families.append(family)
+        return family
+
+    def counter(self, name, help_text, labelnames=()) -> Family:
+        family = Family(name, "counter", help_text, labelnames)
+        self._families.append(family)
+        return family
+
+    def gauge(self, name, help_text, labelnames=()) -> Family:
+        family = Family(name, "gauge", help_text, labelnames)
+        self._families.append(family)
+        return family
+
+    # collector(): render_family 결과 줄 목록을 반환하는 함수
+    def register_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+register_collector = registry.register_collector
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "라우트별 응답 시간", ("method", "route", "status"))
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "처리 중인 요청 수", ("method", "route"))
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "SQL 실행 시간", ("engine",), QUERY_BUCKETS)
+db_queries_per_request = registry.histogram(
+    "http_request_db_queries", "요청 1건의 SQL 실행 수", ("route",), QUERY_COUNT_BUCKETS)
+db_time_per_request = registry.histogram(
+    "http_request_db_seconds", "요청 1건의 SQL 실행 시간 합계", ("route",), REQUEST_BUCKETS)
+
+
+# ─────────────────────────────────────────────
+# 요청별 DB 사용량 (SQLAlchemy 이벤트)
+# ─────────────────────────────────────────────
+
+class RequestUsage:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# 현재 요청의 사용량 (스레드풀/greenlet 안의 커서 이벤트에서도 같은 객체를 봄)
+_current_usage = ContextVar("request_usage", default=None)
+
+
+def instrument_engine(engine, name: str):
+    if not METRICS_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _started(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _finished(conn):
+        started = conn.info.get("query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        db_query_duration.observe(elapsed, name)
+        usage = _current_usage.get()
+        if usage is not None:
+            usage.queries += 1
+            usage.db_seconds += elapsed
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _finished(conn)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        if context.connection is not None:
+            _finished(context.connection)
+
+
+# ─────────────────────────────────────────────
+# ASGI 미들웨어
+# ─────────────────────────────────────────────
+
+def _route_path(scope) -> str:
+    app = scope.get("app")
+    partial = None
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path   # 경로는 같고 메서드만 다른 경우 (405)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_path(scope)
+        status = 500
+        usage = RequestUsage()
+        token = _current_usage.set(usage)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(1, method, route)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec(1, method, route)
+            _current_usage.reset(token)
+            http_request_duration.observe(elapsed, method, route, str(status))
+            db_queries_per_request.observe(usage.queries, route)
+            db_time_per_request.observe(usage.db_seconds, route)
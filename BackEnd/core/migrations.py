@@ -0,0 +1,155 @@
+# core/migrations.py
+# DB 스키마 버전 관리 (import 시점의 Base.metadata.create_all 대체)
+#
+# schema_version 테이블에 적용한 버전을 기록하고, 아직 적용되지 않은 마이그레이션만 순서대로 실행합니다.
+# 서버 시작 시 자동 실행되며(DB_AUTO_MIGRATE=0 으로 끔) 직접 실행할 수도 있습니다.
+#   python -m core.migrations            # 미적용 마이그레이션 실행
+#   python -m core.migrations --status   # 적용된 버전 확인
+#
+# 새 마이그레이션은 파일 아래쪽에 @migration(다음 번호, "설명") 함수로 추가합니다.
+# 이미 운영 중인 RDS 테이블에도 적용되므로 각 단계는 여러 번 실행해도 안전하게 작성합니다.
+
+import logging
+import os
+import sys
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, insert, select, text
+
+from core.database import Base, engine
+from core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1") == "1"
+
+# 여러 uvicorn 워커가 동시에 시작해도 한 번만 실행되도록 MySQL 이름 잠금 사용
+MIGRATION_LOCK = "hairfit_schema_migration"
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(100), nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+MIGRATIONS = []  # (버전, 설명, 함수(conn))
+
+
+def migration(version: int, description: str):
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        return func
+    return register
+
+
+# 모델에 정의된 인덱스 중 DB에 없는 것만 생성
+def create_missing_indexes(conn, names):
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in names and index.name not in existing:
+                logger.info("인덱스 생성", extra={"table": table.name, "index": index.name})
+                index.create(conn)
+
+
+@migration(1, "기본 테이블 생성")
+def _create_tables(conn):
+    import models  # noqa: F401  (모든 모델을 Base.metadata에 등록)
+    Base.metadata.create_all(bind=conn)
+
+
+@migration(2, "조회 경로 복합 인덱스")
+def _composite_indexes(conn):
+    create_missing_indexes(conn, {
+        "ix_request_user_created",
+        "ix_result_request",
+        "ix_hair_rec_request_user",
+        "ix_hair_rec_user_saved",
+        "ix_hairshop_rec_hair_rec_review",
+        "ix_hairshop_rec_user_saved",
+    })
+
+
+@migration(3, "추천 결과 수신 기록 (멱등 키)")
+def _recommendation_ingest(conn):
+    from models.recommendation_ingest import RecommendationIngest
+    RecommendationIngest.__table__.create(conn, checkfirst=True)
+
+
+@migration(4, "분석 요청 이미지/설문 해시 (중복 요청 결과 복제)")
+def _request_fingerprint(conn):
+    from models.request_fingerprint import RequestFingerprint
+    RequestFingerprint.__table__.create(conn, checkfirst=True)
+
+
+# (review_count, hairshop_rec_id) 키셋 커서는 NULL 행과 비교되지 않아 NULL 리뷰 수 미용실이 페이지에서 빠지므로
+# 기존 NULL 값을 0으로 채우고 NOT NULL로 변경 (저장 경로는 이미 NULL 대신 0을 기록)
+# sqlite는 컬럼 변경을 지원하지 않아 값만 채우고, 새 DB는 모델 정의대로 NOT NULL로 생성됨
+@migration(5, "추천 미용실 review_count NOT NULL")
+def _hairshop_review_count_not_null(conn):
+    conn.execute(text("UPDATE hairshop_recommendation_table SET review_count = 0 WHERE review_count IS NULL"))
+    if conn.dialect.name == "mysql":
+        conn.execute(text("ALTER TABLE hairshop_recommendation_table MODIFY review_count INT NOT NULL DEFAULT 0"))
+
+
+# 다른 워커/컨테이너와 동시에 마이그레이션하지 않도록 MySQL 이름 잠금 획득 (잠금을 잡았으면 True)
+# GET_LOCK 은 60초 안에 못 잡으면 0, 오류면 NULL 을 반환하므로 1이 아니면 예외 (warmup 단계가 백오프 후 재시도)
+def _lock(conn) -> bool:
+    if conn.dialect.name != "mysql":
+        return False
+    acquired = conn.execute(text("SELECT GET_LOCK(:name, 60)"), {"name": MIGRATION_LOCK}).scalar()
+    conn.commit()
+    if acquired != 1:
+        raise RuntimeError(f"마이그레이션 잠금을 얻지 못했습니다: {MIGRATION_LOCK} (GET_LOCK={acquired})")
+    return True
+
+
+def _unlock(conn):
+    conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK})
+    conn.commit()
+
+
+def applied_versions(conn) -> set:
+    schema_version.create(conn, checkfirst=True)
+    conn.commit()
+    versions = set(conn.execute(select(schema_version.c.version)).scalars())
+    conn.commit()
+    return versions
+
+
+# 미적용 마이그레이션 실행 후 이번에 적용한 버전 목록 반환
+def run_migrations(bind=engine) -> list:
+    applied = []
+    with bind.connect() as conn:
+        locked = _lock(conn)
+        try:
+            done = applied_versions(conn)
+            for version, description, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+                if version in done:
+                    continue
+                logger.info("마이그레이션 적용", extra={"version": version, "description": description})
+                func(conn)
+                conn.execute(insert(schema_version).values(version=version, description=description))
+                conn.commit()
+                applied.append(version)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if locked:
+                _unlock(conn)
+    return applied
+
+
+if __name__ == "__main__":
+    setup_logging()
+    if "--status" in sys.argv:
+        with engine.connect() as conn:
+            done = applied_versions(conn)
+        for version, description, _ in sorted(MIGRATIONS, key=lambda m: m[0]):
+            print(f"{version:>3} {'적용됨' if version in done else '미적용'}  {description}")
+    else:
+        logger.info("적용된 마이그레이션", extra={"versions": run_migrations()})
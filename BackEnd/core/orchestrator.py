@@ -0,0 +1,361 @@
+# core/orchestrator.py
+# 분석 요청 파이프라인 작업 관리 (extract → recommend → simulate)
+#
+# 각 요청의 진행 단계는 pipeline_job_table에 저장되고, 단계별 워커가 DB에서 작업을 선점해
+# 하위 서비스를 호출합니다. 단계마다 동시 실행 수 / 타임아웃 / 재시도(지수 백오프)를 둡니다.
+# 실행 중인 작업은 임대(locked_until)를 가지므로 서버가 재시작되면 임대 만료 후 다시 실행됩니다.
+#
+# 동시 실행 수 제한은 프로세스 단위입니다. uvicorn 워커를 여러 개 띄우면 한 워커에서만
+# PIPELINE_ENABLED=1 로 실행하거나 제한값을 워커 수로 나눠 설정합니다.
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.exc import IntegrityError
+
+from core.database import AsyncSessionLocal
+from core.http_client import face_extract, graphrag, stablehair
+from core.recommendation import get_analysis_payload
+from models.pipeline_job import PipelineJob
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_ENABLED = os.getenv("PIPELINE_ENABLED", "1") == "1"
+POLL_INTERVAL = float(os.getenv("PIPELINE_POLL_INTERVAL", 1.0))
+
+
+@dataclass
+class StageConfig:
+    name: str
+    handler: Callable[[PipelineJob, float], Awaitable[None]]
+    next_stage: Optional[str]
+    concurrency: int
+    timeout: float
+    max_attempts: int
+    backoff_base: float
+
+    @property
+    def lease(self) -> timedelta:
+        # 타임아웃 + 여유 시간 동안 다른 워커가 선점하지 못하도록 임대
+        return timedelta(seconds=self.timeout + 60)
+
+    def backoff(self, attempts: int) -> float:
+        return self.backoff_base * (2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+
+
+# ─────────────────────────────────────────────
+# 단계별 하위 서비스 호출 (core/http_client 공용 클라이언트 사용)
+# ─────────────────────────────────────────────
+
+async def _post(service, path: str, payload: dict, timeout: float):
+    response = await service.post(path, json=payload, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+async def run_extract(job: PipelineJob, timeout: float):
+    body = await _post(
+        face_extract, "/run-extract/",
+        {"user_id": job.user_id, "request_id": job.request_id}, timeout
+    )
+    # face_extract는 실패해도 200 + {"error": ...} 로 응답함
+    if isinstance(body, dict) and body.get("error"):
+        raise RuntimeError(body["error"])
+
+async def run_recommend(job: PipelineJob, timeout: float):
+    async with AsyncSessionLocal() as db:
+        payload = await get_analysis_payload(db, job.user_id, job.request_id)
+    if not payload:
+        raise RuntimeError("요청 또는 분석 결과가 없습니다.")
+    # GraphRAG가 /save-recommendation/ 으로 결과를 저장한 뒤 응답함
+    await _post(graphrag, "/recommend", payload, timeout)
+
+async def run_simulate(job: PipelineJob, timeout: float):
+    await _post(
+        stablehair, "/run-stablehair",
+        {"user_id": job.user_id, "request_id": job.request_id}, timeout
+    )
+
+
+def _stage(name, handler, next_stage, concurrency, timeout, max_attempts, backoff_base):
+    prefix = f"PIPELINE_{name.upper()}_"
+    return StageConfig(
+        name=name,
+        handler=handler,
+        next_stage=next_stage,
+        concurrency=int(os.getenv(prefix + "CONCURRENCY", concurrency)),
+        timeout=float(os.getenv(prefix + "TIMEOUT", timeout)),
+        max_attempts=int(os.getenv(prefix + "MAX_ATTEMPTS", max_attempts)),
+        backoff_base=float(os.getenv(prefix + "BACKOFF", backoff_base)),
+    )
+
+STAGES = {
+    "extract": _stage("extract", run_extract, "recommend", 4, 180, 3, 5),
+    "recommend": _stage("recommend", run_recommend, "simulate", 2, 600, 3, 10),
+    # GPU 단계이므로 기본 동시 실행 1
+    "simulate": _stage("simulate", run_simulate, None, 1, 1200, 2, 30),
+}
+
+
+# ─────────────────────────────────────────────
+# 작업 등록 / 단계 이동
+# ─────────────────────────────────────────────
+
+async def enqueue_job(db, user_id: int, request_id: int, stage: str = "extract", from_stages=None):
+    """
+    request_id의 작업을 stage 단계 대기열에 넣는다. (commit은 호출한 쪽에서 수행)
+    - 작업이 없으면 새로 생성
+    - 작업이 from_stages 중 한 단계에 있으면 stage로 이동 (중복 호출 시 한 번만 반영)
+    - 작업이 stage 단계에서 최종 실패(failed)했다면 다시 대기열에 넣음
+    - 그 외에는 아무것도 하지 않음 (이미 진행/완료된 요청 재실행 방지)
+    """
+    job = (await db.execute(
+        select(PipelineJob).where(PipelineJob.request_id == request_id)
+    )).scalars().first()
+    now = datetime.utcnow()
+
+    if job is None:
+        job = PipelineJob(
+            request_id=request_id, user_id=user_id, stage=stage, status="queued",
+            attempts=0, next_run_at=now, enqueued_at=now
+        )
+        try:
+            async with db.begin_nested():
+                db.add(job)
+        except IntegrityError:
+            # 동시에 다른 호출이 먼저 생성한 경우
+            job = (await db.execute(
+                select(PipelineJob).where(PipelineJob.request_id == request_id)
+            )).scalars().first()
+        else:
+            orchestrator.wake(stage)
+            return job
+
+    retry_failed = job.stage == stage and job.status == "failed"
+    if retry_failed or (from_stages and job.stage in from_stages and job.stage != stage):
+        await db.execute(
+            update(PipelineJob)
+            .where(PipelineJob.job_id == job.job_id, PipelineJob.stage == job.stage,
+                   PipelineJob.status == job.status)
+            .values(stage=stage, status="queued", attempts=0, last_error=None,
+                    next_run_at=now, enqueued_at=now, locked_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        orchestrator.wake(stage)
+    return job
+
+
+async def get_job(db, request_id: int):
+    return (await db.execute(
+        select(PipelineJob).where(PipelineJob.request_id == request_id)
+    )).scalars().first()
+
+
+# ─────────────────────────────────────────────
+# 워커 풀
+# ─────────────────────────────────────────────
+
+class StageStats:
+    def __init__(self, window: int = 500):
+        self.durations = deque(maxlen=window)    # 실행 시간 (초)
+        self.waits = deque(maxlen=window)        # 대기열 대기 시간 (초)
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.running = 0
+
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return {"count": 0, "p50": None, "p95": None, "max": None}
+        ordered = sorted(values)
+        return {
+            "count": len(ordered),
+            "p50": round(ordered[len(ordered) // 2], 3),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max": round(ordered[-1], 3),
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "latency_seconds": self._summary(self.durations),
+            "queue_wait_seconds": self._summary(self.waits),
+        }
+
+
+class Orchestrator:
+    def __init__(self, stages: dict):
+        self.stages = stages
+        self.stats = {name: StageStats() for name in stages}
+        self._wake = {name: asyncio.Event() for name in stages}
+        self._tasks = []
+
+    def wake(self, stage: str):
+        if stage in self._wake:
+            self._wake[stage].set()
+
+    async def start(self):
+        if self._tasks:
+            return
+        for stage in self.stages.values():
+            for i in range(stage.concurrency):
+                self._tasks.append(asyncio.create_task(self._worker(stage), name=f"pipeline-{stage.name}-{i}"))
+        logger.info("파이프라인 워커 시작", extra={"workers": {s.name: s.concurrency for s in self.stages.values()}})
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, stage: StageConfig):
+        while True:
+            try:
+                job = await self._claim(stage)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("작업 선점 실패", extra={"stage": stage.name})
+                job = None
+
+            if job is None:
+                event = self._wake[stage.name]
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+                continue
+
+            await self._run(stage, job)
+
+    async def _claim(self, stage: StageConfig):
+        now = datetime.utcnow()
+        claimable = or_(
+            and_(PipelineJob.status == "queued", PipelineJob.next_run_at <= now),
+            # 실행 중 서버가 죽어 임대가 만료된 작업 회수
+            and_(PipelineJob.status == "running", PipelineJob.locked_until < now),
+        )
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(
+                select(PipelineJob)
+                .where(PipelineJob.stage == stage.name, claimable)
+                .order_by(PipelineJob.next_run_at)
+                .limit(1)
+            )).scalars().first()
+            if job is None:
+                return None
+
+            # 다른 워커/프로세스와 경쟁하므로 조건부 UPDATE 로 선점
+            result = await db.execute(
+                update(PipelineJob)
+                .where(PipelineJob.job_id == job.job_id, PipelineJob.stage == stage.name, claimable)
+                .values(status="running", attempts=PipelineJob.attempts + 1,
+                        locked_until=now + stage.lease)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            if result.rowcount != 1:
+                return None
+            await db.refresh(job)
+            return job
+
+    async def _run(self, stage: StageConfig, job: PipelineJob):
+        stats = self.stats[stage.name]
+        if job.enqueued_at:
+            stats.waits.append((datetime.utcnow() - job.enqueued_at).total_seconds())
+        logger.info("단계 시작", extra={"stage": stage.name, "request_id": job.request_id, "attempt": job.attempts})
+
+        started = time.monotonic()
+        stats.running += 1
+        try:
+            await asyncio.wait_for(stage.handler(job, stage.timeout), timeout=stage.timeout)
+            error = None
+        except asyncio.CancelledError:
+            # 서버 종료: 임대가 만료되면 재시작 후 다시 실행됨
+            raise
+        except asyncio.TimeoutError:
+            error = f"{stage.timeout}초 타임아웃"
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        finally:
+            stats.running -= 1
+        stats.durations.append(time.monotonic() - started)
+
+        now = datetime.utcnow()
+        if error is None:
+            stats.succeeded += 1
+            values = dict(status="queued", stage=stage.next_stage, attempts=0, last_error=None,
+                          next_run_at=now, enqueued_at=now, locked_until=None)
+            if stage.next_stage is None:
+                values.update(stage="done", status="done")
+            logger.info("단계 완료", extra={"stage": stage.name, "request_id": job.request_id, "next_stage": values["stage"]})
+        elif job.attempts < stage.max_attempts:
+            stats.retried += 1
+            delay = stage.backoff(job.attempts)
+            values = dict(status="queued", last_error=error, locked_until=None,
+                          next_run_at=now + timedelta(seconds=delay))
+            logger.warning("단계 실패, 재시도 예약", extra={
+                "stage": stage.name, "request_id": job.request_id, "retry_in": round(delay, 1), "error": error,
+            })
+        else:
+            stats.failed += 1
+            values = dict(status="failed", last_error=error, locked_until=None)
+            logger.error("단계 최종 실패", extra={"stage": stage.name, "request_id": job.request_id, "error": error})
+
+        async with AsyncSessionLocal() as db:
+            # 그 사이 다른 경로(/run-recommendation/ 등)로 단계가 이미 넘어갔다면 반영하지 않음
+            await db.execute(
+                update(PipelineJob)
+                .where(PipelineJob.job_id == job.job_id, PipelineJob.stage == stage.name,
+                       PipelineJob.status == "running")
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if error is None and stage.next_stage:
+            self.wake(stage.next_stage)
+
+    async def queue_depth(self) -> dict:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(PipelineJob.stage, PipelineJob.status, func.count())
+                .group_by(PipelineJob.stage, PipelineJob.status)
+            )).all()
+        depth = {}
+        for stage, status, count in rows:
+            depth.setdefault(stage, {})[status] = count
+        return depth
+
+    async def snapshot(self) -> dict:
+        depth = await self.queue_depth()
+        return {
+            "enabled": PIPELINE_ENABLED,
+            "stages": {
+                name: {
+                    "concurrency": stage.concurrency,
+                    "timeout": stage.timeout,
+                    "max_attempts": stage.max_attempts,
+                    "queued": depth.get(name, {}).get("queued", 0),
+                    "running_in_db": depth.get(name, {}).get("running", 0),
+                    "failed": depth.get(name, {}).get("failed", 0),
+                    **self.stats[name].snapshot(),
+                }
+                for name, stage in self.stages.items()
+            },
+            "done": depth.get("done", {}).get("done", 0),
+        }
+
+
+orchestrator = Orchestrator(STAGES)
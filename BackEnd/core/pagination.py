@@ -0,0 +1,26 @@
+# core/pagination.py
+# 키셋(커서) 페이지네이션용 불투명 커서 인코딩/디코딩
+#
+# 커서는 마지막 행의 정렬 키 값들을 base64url로 감싼 문자열입니다.
+# 클라이언트는 내용을 해석하지 않고 다음 요청에 그대로 넘깁니다.
+
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+    return values
@@ -1,14 +1,124 @@
 # core/password.py
 # 해시 + 솔트 추가 코드
+#
+# bcrypt 해시/검증은 요청당 수십~수백 ms의 CPU 작업이라 전용 스레드 풀에서 실행합니다.
+# (bcrypt는 해시 계산 중 GIL을 놓으므로 스레드로도 병렬 실행되고, FastAPI 기본 스레드 풀은
+#  동기 라우트용으로 남겨 로그인이 몰려도 다른 API가 밀리지 않음)
+#
+# 비용(rounds)은 BCRYPT_ROUNDS 로 고정하거나, 지정하지 않으면 처음 시작할 때 한 번만
+# PASSWORD_HASH_TARGET_MS 에 가장 가까운(넘지 않는) 값으로 보정해 BCRYPT_ROUNDS_FILE 에 저장합니다.
+# 이후 재시작과 다른 워커는 측정하지 않고 저장된 값을 import 시점에 읽어 사용 (워커마다 측정값이 달라지지 않도록)
+# 저장된 해시의 rounds가 현재 설정보다 낮을 때만 로그인 성공 시 새 비용으로 다시 해시합니다.
+# (더 높은 비용의 해시는 그대로 두어 약한 해시로 바뀌거나 워커 사이에서 반복 재해시되지 않음)
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+logger = logging.getLogger(__name__)
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 0))  # 0이면 시작 시 보정
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", 250))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", max(1, min(4, (os.cpu_count() or 1) // 2))))
+MIN_ROUNDS = 10  # 보정 결과가 이보다 낮아지지 않도록 하는 하한 (OWASP 권장)
+MAX_ROUNDS = 15
+DEFAULT_ROUNDS = 12  # 보정 전 기본값 (passlib 기본값과 동일)
+BCRYPT_ROUNDS_FILE = os.getenv("BCRYPT_ROUNDS_FILE", os.path.join(os.path.dirname(os.path.dirname(__file__)), ".bcrypt_rounds"))
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password")
+
+
+def _context(rounds: int) -> CryptContext:
+    # min_rounds만 지정: rounds가 더 낮은 해시만 needs_update 대상 (max_rounds 미지정)
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+    )
+
+
+# 이전에 보정해 저장한 rounds (없거나 읽을 수 없으면 None)
+def load_saved_rounds():
+    try:
+        with open(BCRYPT_ROUNDS_FILE) as f:
+            rounds = int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+    return rounds if MIN_ROUNDS <= rounds <= MAX_ROUNDS else None
+
+
+# 보정 결과 저장. 여러 워커가 동시에 보정한 경우 먼저 저장한 값을 모두 사용
+def save_rounds(rounds: int) -> int:
+    try:
+        fd = os.open(BCRYPT_ROUNDS_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        return load_saved_rounds() or rounds
+    except OSError:
+        logger.warning("bcrypt 비용 저장 실패", extra={"path": BCRYPT_ROUNDS_FILE}, exc_info=True)
+        return rounds
+    with os.fdopen(fd, "w") as f:
+        f.write(str(rounds))
+    return rounds
+
+
 # bcrypt를 기본 알고리즘으로 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = _context(BCRYPT_ROUNDS or load_saved_rounds() or DEFAULT_ROUNDS)
+
+
+def current_rounds() -> int:
+    return pwd_context.handler("bcrypt").default_rounds
+
+
+def set_rounds(rounds: int):
+    global pwd_context
+    pwd_context = _context(rounds)
+
+
+# target_ms를 넘지 않는 가장 큰 rounds 계산 (rounds가 1 늘 때마다 시간은 2배)
+def calibrate_rounds(target_ms: float = PASSWORD_HASH_TARGET_MS, base_rounds: int = MIN_ROUNDS) -> int:
+    context = _context(base_rounds)
+    context.hash("calibration")  # 백엔드 로드 시간 제외
+    started = time.perf_counter()
+    context.hash("calibration")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    rounds = base_rounds
+    while rounds < MAX_ROUNDS and elapsed_ms * 2 <= target_ms:
+        elapsed_ms *= 2
+        rounds += 1
+    logger.info("bcrypt 비용 보정", extra={"rounds": rounds, "expected_ms": round(elapsed_ms), "target_ms": round(target_ms)})
+    return rounds
+
+
+async def _run(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, func, *args)
+
+
+# 서버 시작 시 호출: BCRYPT_ROUNDS도 저장된 값도 없을 때만 해시 풀에서 보정 후 저장
+async def configure_password_hashing() -> int:
+    rounds = BCRYPT_ROUNDS or load_saved_rounds()
+    if not rounds:
+        rounds = save_rounds(await _run(calibrate_rounds))
+    set_rounds(rounds)
+    return rounds
+
 
 # 해시 생성 함수
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
 
 # 해시 검증 함수
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# 반환: (일치 여부, 새 해시). 새 해시는 저장된 해시의 rounds가 현재 설정보다 낮아 다시 저장해야 할 때만 값이 있음
+async def verify_password(plain_password: str, hashed_password: str) -> tuple:
+    try:
+        return await _run(pwd_context.verify_and_update, plain_password, hashed_password)
+    except ValueError:
+        # 형식이 잘못된 저장 값
+        return False, None
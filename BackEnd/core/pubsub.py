@@ -0,0 +1,116 @@
+# core/pubsub.py
+# request_id 단위 이벤트 발행/구독 (WebSocket 푸시용)
+#
+# 기본은 프로세스 내부(in-memory) 브로커입니다. uvicorn 워커를 여러 개 띄우면
+# 워커끼리 이벤트가 공유되지 않으므로 PUBSUB_URL=redis://... 로 Redis 브로커로 교체합니다.
+# 응답 캐시 무효화와 read-your-writes 표시도 이 브로커로 전달되므로, 여러 워커로 실행할 때는
+# WEB_CONCURRENCY(uvicorn --workers 기본값)로 워커 수를 지정하고 PUBSUB_URL 이 없으면 시작하지 않습니다.
+
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# 구독자별 대기 큐 크기 (느린 클라이언트 때문에 메모리가 늘지 않도록 제한)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class InMemoryBroker:
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+
+    async def publish(self, channel: str, message: dict):
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning("구독자 큐가 가득 차 이벤트를 버림", extra={"channel": channel})
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    async def close(self):
+        self._subscribers.clear()
+
+
+class RedisBroker:
+    def __init__(self, url: str):
+        # redis는 멀티 워커 배포에서만 필요하므로 사용할 때만 import
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+
+    async def publish(self, channel: str, message: dict):
+        await self._redis.publish(channel, json.dumps(message, ensure_ascii=False))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel)
+
+        async def reader():
+            async for item in pubsub.listen():
+                if item.get("type") != "message":
+                    continue
+                try:
+                    queue.put_nowait(json.loads(item["data"]))
+                except asyncio.QueueFull:
+                    logger.warning("구독자 큐가 가득 차 이벤트를 버림", extra={"channel": channel})
+
+        task = asyncio.create_task(reader())
+        try:
+            yield queue
+        finally:
+            task.cancel()
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+    async def close(self):
+        await self._redis.close()
+
+
+def create_broker():
+    url = os.getenv("PUBSUB_URL", "")
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisBroker(url)
+    return InMemoryBroker()
+
+
+broker = create_broker()
+
+WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))
+
+
+# 서버 시작 시 호출: 여러 워커인데 공유 브로커가 없으면 실행 거부
+# (워커별 캐시 버전/쓰기 표시가 다른 워커에 전달되지 않아 이전 응답이 TTL 동안 남음)
+def check_broker_for_workers():
+    if WORKERS > 1 and isinstance(broker, InMemoryBroker):
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={WORKERS} 워커 실행에는 공유 브로커가 필요합니다. PUBSUB_URL=redis://... 를 설정하세요."
+        )
+
+
+def request_channel(request_id: int) -> str:
+    return f"request:{int(request_id)}"
+
+
+# 분석/추천/합성 단계 완료 이벤트 발행
+async def publish_request_event(request_id: int, event: str, **data):
+    message = {"event": event, "request_id": int(request_id), **data}
+    try:
+        await broker.publish(request_channel(request_id), message)
+    except Exception:
+        # 푸시 실패가 저장 로직을 깨뜨리지 않도록 로그만 남김 (클라이언트는 폴링으로 복구)
+        logger.exception("이벤트 발행 실패", extra={"event": message})
@@ -1,24 +1,38 @@
-from sqlalchemy.orm import Session
+import hashlib
+import json
+import logging
+
+from sqlalchemy import select, insert, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.request import Request
 from models.result import Result
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.recommendation_ingest import RecommendationIngest
+from core.hairstyle_catalog import hairstyle_catalog
 
-def get_analysis_payload(db: Session, user_id: int, request_id: int):
-    print(f"[DEBUG] 분석 시작 - user_id: {user_id}, request_id: {request_id}")
+logger = logging.getLogger(__name__)
 
-    # 1. 요청 정보 (설문 결과)
-    request_info = db.query(Request).filter_by(user_id=user_id, request_id=request_id).first()
-    print(f"[DEBUG] request_info 조회 결과: {request_info}")
+# Stable-Hair 합성 전 기본 이미지 값
+DUMMY_SIMULATION_URL = "dummy.jpg"
 
+async def get_analysis_payload(db: AsyncSession, user_id: int, request_id: int):
+    # 1. 요청 정보 (설문 결과)
+    request_info = (await db.execute(
+        select(Request).filter_by(user_id=user_id, request_id=request_id)
+    )).scalars().first()
     # 2. 얼굴 분석 결과
-    result_info = db.query(Result).filter_by(request_id=request_id).first()
-    print(f"[DEBUG] result_info 조회 결과: {result_info}")
-
+    result_info = (await db.execute(
+        select(Result).filter_by(request_id=request_id)
+    )).scalars().first()
     if not request_info or not result_info:
-        print("[ERROR] request_info 또는 result_info가 존재하지 않습니다.")
+        logger.warning("요청 또는 분석 결과 없음", extra={
+            "user_id": user_id, "request_id": request_id,
+            "has_request": request_info is not None, "has_result": result_info is not None,
+        })
         return None
 
-    print("[INFO] DB에서 request/result 정보 모두 정상 조회됨")
-
     mood = request_info.mood
     if isinstance(mood, list):
         mood = ", ".join(mood)
@@ -44,3 +58,197 @@ def get_analysis_payload(db: Session, user_id: int, request_id: int):
         # "forehead": result_info.forehead,
         "summary": result_info.summary
     }
+
+
+# 설문 기장 → hairstyle_table.hairstyle_length 코드
+def map_length(hair_length: str) -> str:
+    return {'숏': 'S', '미디움': 'M'}.get(hair_length.strip(), 'L')
+
+# 분석 얼굴형 → hairstyle_table.hairstyle_face 코드
+def map_face(face_type: str):
+    face_type = face_type.strip()
+    if face_type in ['네모형', '둥근형']:
+        return 'R'
+    if face_type in ['긴형', '계란형', '하트형']:
+        return 'S'
+    return None
+
+# 추천 스타일 행을 한 번에 INSERT 하고 입력 순서대로 PK 반환
+async def _insert_hair_recommendations(db: AsyncSession, rows: list, user_id: int, request_id: int):
+    dialect = db.bind.dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        # sqlite / MariaDB / PostgreSQL: INSERT ... RETURNING (1회 왕복)
+        result = await db.execute(
+            insert(HairRecommendation).returning(
+                HairRecommendation.hair_rec_id, sort_by_parameter_order=True
+            ),
+            rows
+        )
+        return list(result.scalars())
+
+    # MySQL: RETURNING 미지원 → multi-row INSERT 1회 + 방금 넣은 행 ID 조회 1회
+    # (수신 기록 행 잠금 또는 같은 트랜잭션에서 만든 새 요청이므로 동시 저장이 없어 request_id 기준 최신 n개가 방금 넣은 행)
+    await db.execute(insert(HairRecommendation).values(rows))
+    ids = (await db.execute(
+        select(HairRecommendation.hair_rec_id)
+        .where(HairRecommendation.request_id == request_id, HairRecommendation.user_id == user_id)
+        .order_by(HairRecommendation.hair_rec_id.desc())
+        .limit(len(rows))
+    )).scalars().all()
+    return ids[::-1]
+
+# GraphRAG payload 해시 (멱등 키). 필드 순서와 무관하도록 정렬된 JSON으로 계산
+def payload_hash(payload) -> str:
+    canonical = json.dumps(payload.model_dump(mode="json"), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+# 요청별 수신 기록을 잠그고 반환. 처음이면 생성 (동시에 같은 요청이 들어오면 한쪽은 기존 행을 잠금 대기)
+# 없는 request_id는 MySQL에서 외래 키 위반(IntegrityError)이 나므로 재조회도 비어 있으면 (None, False)
+async def _lock_ingest(db: AsyncSession, request_id: int, digest: str):
+    query = select(RecommendationIngest).where(RecommendationIngest.request_id == request_id).with_for_update()
+    ingest = (await db.execute(query)).scalars().first()
+    if ingest is not None:
+        return ingest, False
+    try:
+        async with db.begin_nested():
+            ingest = RecommendationIngest(request_id=request_id, payload_hash=digest)
+            db.add(ingest)
+        return ingest, True
+    except IntegrityError:
+        return (await db.execute(query)).scalars().first(), False
+
+def _shop_row(shop, hair_rec_id: int, user_id: int) -> dict:
+    return {
+        "hairshop": shop.hairshop or "미정",
+        "is_saved": 0,
+        "latitude": shop.latitude or 0.0,
+        "longitude": shop.longitude or 0.0,
+        "final_menu_price": shop.final_menu_price or 0,
+        "review_count": shop.review_count or 0,
+        "mean_score": shop.mean_score or 0.0,
+        "hair_rec_id": hair_rec_id,
+        "user_id": user_id,
+    }
+
+# GraphRAG 추천 결과 저장 (호출자가 commit)
+# 반환: (hair_rec_ids, replayed). 요청 또는 분석 결과가 없으면 None
+#
+# 멱등성: (request_id, payload 해시)가 마지막 반영분과 같으면 수신 기록 1행 조회만으로 끝나는 no-op.
+# 해시가 다르면(재시도 중 GraphRAG가 다른 결과를 만든 경우) 스타일명 기준 upsert
+#   - 같은 스타일은 기존 행(hair_rec_id, 저장 여부, 합성 이미지)을 유지하고 설명/hair_id만 갱신
+#   - 새 스타일은 추가, payload에서 빠진 스타일은 사용자가 저장하지 않았으면 삭제
+#   - 미용실은 사용자가 저장한 행을 남기고 나머지를 새 목록으로 교체
+# 왕복 횟수: 재전송 1 (수신 기록 조회)
+#           최초 저장 ~9 (수신 기록 조회 + SAVEPOINT/INSERT/RELEASE, 요청/결과, 기존 추천, 추천 INSERT 1~2, 미용실 executemany)
+async def save_recommendations(db: AsyncSession, user_id: int, request_id: int, recommendations, digest: str):
+    ingest, created = await _lock_ingest(db, request_id, digest)
+    if ingest is None:
+        logger.warning("추천 결과 저장 대상 요청 없음", extra={"user_id": user_id, "request_id": request_id})
+        return None
+    if not created and ingest.payload_hash == digest:
+        logger.info("동일한 추천 결과 재전송 무시", extra={"request_id": request_id})
+        return [], True
+
+    row = (await db.execute(
+        select(Request, Result)
+        .join(Result, Result.request_id == Request.request_id)
+        .where(Request.user_id == user_id, Request.request_id == request_id)
+        .limit(1)
+    )).first()
+    if not row:
+        return None
+    request_info, result_info = row
+
+    hair_type = request_info.hair_type.strip()
+    mapped_length = map_length(request_info.hair_length)
+    mapped_face = map_face(result_info.face_type)
+    sex = result_info.sex.strip()
+    logger.debug("스타일 선택 조건", extra={"sex": sex, "hair_type": hair_type, "face": mapped_face, "length": mapped_length})
+
+    # 스타일명 → hair_id는 메모리 카탈로그에서 조회 (만료 시에만 DB 재로드)
+    await hairstyle_catalog.ensure_fresh()
+
+    # 한 payload 안의 중복 스타일은 처음 것만 사용
+    unique_recs, seen = [], set()
+    for rec in recommendations:
+        if rec.style not in seen:
+            seen.add(rec.style)
+            unique_recs.append(rec)
+
+    # 이전에 저장된 추천 (멱등 키 도입 전 데이터 포함). 중복 행은 compaction 작업이 정리
+    existing = {}
+    for h in (await db.execute(
+        select(HairRecommendation)
+        .where(HairRecommendation.request_id == request_id, HairRecommendation.user_id == user_id)
+        .order_by(HairRecommendation.hair_rec_id)
+    )).scalars():
+        existing.setdefault(h.hair_name, h)
+
+    hair_rec_ids = [None] * len(unique_recs)
+    new_rows, new_positions, reused_ids = [], [], []
+    for i, rec in enumerate(unique_recs):
+        hair_id = hairstyle_catalog.best_match(rec.style, sex, hair_type, mapped_face, mapped_length)
+        if hair_id is None:
+            logger.warning("조건에 맞는 hairstyle 없음", extra={"request_id": request_id, "style": rec.style})
+        current = existing.pop(rec.style, None)
+        if current is not None:
+            # 변경된 경우에만 flush 시 UPDATE
+            current.description = rec.description
+            current.hair_id = hair_id
+            hair_rec_ids[i] = current.hair_rec_id
+            reused_ids.append(current.hair_rec_id)
+            continue
+        new_rows.append({
+            "simulation_image_url": DUMMY_SIMULATION_URL,
+            "hair_name": rec.style,
+            "description": rec.description,
+            "is_saved": 0,
+            "request_id": request_id,
+            "hair_id": hair_id,
+            "user_id": user_id,
+        })
+        new_positions.append(i)
+
+    # payload에서 빠진 스타일 중 사용자가 저장하지 않은 것은 미용실과 함께 삭제
+    stale_ids = [h.hair_rec_id for h in existing.values() if not h.is_saved]
+    if stale_ids:
+        await db.execute(delete(HairshopRecommendation).where(HairshopRecommendation.hair_rec_id.in_(stale_ids)))
+        await db.execute(delete(HairRecommendation).where(HairRecommendation.hair_rec_id.in_(stale_ids)))
+
+    # 유지되는 스타일의 미용실: 저장된 행은 남기고 나머지는 새 목록으로 교체
+    kept_shops = set()
+    if reused_ids:
+        kept_shops = set((await db.execute(
+            select(HairshopRecommendation.hair_rec_id, HairshopRecommendation.hairshop).where(
+                HairshopRecommendation.hair_rec_id.in_(reused_ids),
+                HairshopRecommendation.is_saved == 1
+            )
+        )).all())
+        await db.execute(delete(HairshopRecommendation).where(
+            HairshopRecommendation.hair_rec_id.in_(reused_ids),
+            HairshopRecommendation.is_saved == 0
+        ))
+
+    if new_rows:
+        for i, hair_rec_id in zip(new_positions, await _insert_hair_recommendations(db, new_rows, user_id, request_id)):
+            hair_rec_ids[i] = hair_rec_id
+
+    # 미용실은 PK가 필요 없으므로 executemany 한 번으로 저장
+    shop_rows = [
+        _shop_row(shop, hair_rec_id, user_id)
+        for rec, hair_rec_id in zip(unique_recs, hair_rec_ids)
+        for shop in rec.hair_shops
+        if (hair_rec_id, shop.hairshop or "미정") not in kept_shops
+    ]
+    if shop_rows:
+        await db.execute(insert(HairshopRecommendation), shop_rows)
+
+    if not created:
+        ingest.payload_hash = digest
+        ingest.applied_count += 1
+
+    logger.debug("추천 결과 반영", extra={
+        "request_id": request_id, "recommendations": len(hair_rec_ids), "created": len(new_rows),
+        "updated": len(reused_ids), "deleted": len(stale_ids), "hairshops": len(shop_rows),
+    })
+    return hair_rec_ids, False
@@ -0,0 +1,152 @@
+# core/recommendation_compaction.py
+# 같은 요청에 중복 저장된 추천 스타일 정리 (멱등 키 도입 전 GraphRAG 재전송으로 생긴 데이터)
+#
+# (request_id, hair_name)이 같은 추천 행 중 하나만 남기고 나머지와 그 미용실을 삭제합니다.
+#   - 남길 행: 사용자가 저장한 행 > 합성 이미지가 있는 행 > hair_rec_id가 가장 작은 행
+#   - 삭제되는 행의 저장 표시/합성 이미지는 남는 행으로 옮김
+#   - 삭제되는 행의 저장된 미용실은 남는 행의 같은 이름 미용실에 저장 표시, 없으면 남는 행으로 이동
+#
+# request_id 순서로 batch-size 개 요청씩 한 트랜잭션에서 처리하고, 배치 사이에 쉬어 운영 DB 부하를 줄입니다.
+#   python -m core.recommendation_compaction                  # 정리 실행
+#   python -m core.recommendation_compaction --dry-run        # 삭제 대상 수만 확인
+#   python -m core.recommendation_compaction --batch-size 500 --pause 0.5
+
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import delete, func, select, update
+
+from core.database import AsyncSessionLocal, async_engine
+from core.logging_config import setup_logging
+from core.recommendation import DUMMY_SIMULATION_URL
+from core.response_cache import invalidate, request_scope, saved_scope
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+
+logger = logging.getLogger(__name__)
+
+
+def _keep_key(hair_rec: HairRecommendation):
+    return (
+        not hair_rec.is_saved,
+        hair_rec.simulation_image_url == DUMMY_SIMULATION_URL,
+        hair_rec.hair_rec_id,
+    )
+
+
+# 중복 스타일이 있는 request_id를 after 이후부터 limit개 조회
+async def _duplicate_request_ids(db, after: int, limit: int) -> list:
+    return list((await db.execute(
+        select(HairRecommendation.request_id)
+        .where(HairRecommendation.request_id > after)
+        .group_by(HairRecommendation.request_id, HairRecommendation.hair_name)
+        .having(func.count() > 1)
+        .order_by(HairRecommendation.request_id)
+        .distinct()
+        .limit(limit)
+    )).scalars())
+
+
+# 한 배치 정리. 반환: (삭제한 추천 수, 삭제한 미용실 수, 영향받은 user_id 목록)
+async def _compact_batch(db, request_ids: list, dry_run: bool):
+    groups = defaultdict(list)
+    for hair_rec in (await db.execute(
+        select(HairRecommendation).where(HairRecommendation.request_id.in_(request_ids))
+    )).scalars():
+        groups[(hair_rec.request_id, hair_rec.hair_name)].append(hair_rec)
+
+    drop_ids, merges = [], {}  # merges: 삭제되는 hair_rec_id -> 남는 행
+    for recs in groups.values():
+        if len(recs) < 2:
+            continue
+        recs.sort(key=_keep_key)
+        keep = recs[0]
+        for dup in recs[1:]:
+            drop_ids.append(dup.hair_rec_id)
+            merges[dup.hair_rec_id] = keep
+            if keep.simulation_image_url == DUMMY_SIMULATION_URL and dup.simulation_image_url != DUMMY_SIMULATION_URL:
+                keep.simulation_image_url = dup.simulation_image_url
+
+    if not drop_ids:
+        return 0, 0, set()
+
+    shop_count = (await db.execute(
+        select(func.count()).select_from(HairshopRecommendation).where(HairshopRecommendation.hair_rec_id.in_(drop_ids))
+    )).scalar_one()
+    user_ids = {keep.user_id for keep in merges.values()}
+    if dry_run:
+        return len(drop_ids), shop_count, user_ids
+
+    # 삭제되는 행에서 저장한 미용실을 남는 행으로 합침
+    saved_shops = (await db.execute(
+        select(HairshopRecommendation).where(
+            HairshopRecommendation.hair_rec_id.in_(drop_ids),
+            HairshopRecommendation.is_saved == 1
+        )
+    )).scalars().all()
+    moved = set()  # 이번 배치에서 남는 행으로 옮긴 (hair_rec_id, 미용실 이름)
+    for shop in saved_shops:
+        keep = merges[shop.hair_rec_id]
+        # 다른 중복 행에서 같은 이름을 이미 옮겼으면 그 행이 저장 표시를 가지므로 이 행은 삭제 대상에 둠
+        if (keep.hair_rec_id, shop.hairshop) in moved:
+            continue
+        matched = (await db.execute(
+            update(HairshopRecommendation)
+            .where(HairshopRecommendation.hair_rec_id == keep.hair_rec_id, HairshopRecommendation.hairshop == shop.hairshop)
+            .values(is_saved=1)
+        )).rowcount
+        if not matched:
+            shop.hair_rec_id = keep.hair_rec_id
+            moved.add((keep.hair_rec_id, shop.hairshop))
+            shop_count -= 1
+    await db.flush()
+
+    await db.execute(delete(HairshopRecommendation).where(HairshopRecommendation.hair_rec_id.in_(drop_ids)))
+    await db.execute(delete(HairRecommendation).where(HairRecommendation.hair_rec_id.in_(drop_ids)))
+    await db.commit()
+    await invalidate(
+        *{request_scope(keep.user_id, keep.request_id) for keep in merges.values()},
+        *{saved_scope(user_id) for user_id in user_ids}
+    )
+    return len(drop_ids), shop_count, user_ids
+
+
+async def compact_duplicate_recommendations(batch_size: int = 200, pause: float = 0.1, dry_run: bool = False) -> dict:
+    totals = {"requests": 0, "hair_recommendations": 0, "hairshop_recommendations": 0}
+    last_request_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            request_ids = await _duplicate_request_ids(db, last_request_id, batch_size)
+            if not request_ids:
+                break
+            hair_count, shop_count, _ = await _compact_batch(db, request_ids, dry_run)
+
+        last_request_id = request_ids[-1]
+        totals["requests"] += len(request_ids)
+        totals["hair_recommendations"] += hair_count
+        totals["hairshop_recommendations"] += shop_count
+        logger.info("중복 추천 확인" if dry_run else "중복 추천 정리", extra={
+            "last_request_id": last_request_id, "hair_recommendations": hair_count, "hairshop_recommendations": shop_count,
+        })
+        if pause:
+            await asyncio.sleep(pause)
+    return totals
+
+
+async def _main(args):
+    try:
+        totals = await compact_duplicate_recommendations(args.batch_size, args.pause, args.dry_run)
+        logger.info("완료", extra={"dry_run": args.dry_run, **totals})
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--pause", type=float, default=0.1)
+    parser.add_argument("--dry-run", action="store_true")
+    setup_logging()
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,141 @@
+# core/request_dedup.py
+# 같은 사진 + 같은 설문으로 다시 요청하면 이전 분석 결과를 복제 (파이프라인 재실행 생략)
+#
+# 분석 요청 1건은 얼굴 분석, LLM 호출 2회, Stable-Hair 합성 4건을 실행하므로 사용자가 같은 사진과 설문으로
+# 다시 제출하면 그대로 다시 계산하는 대신 완료된 이전 요청의 분석/추천/합성 결과 행을 새 요청으로 복사합니다.
+#
+# - 이미지: 보정/재인코딩한 JPEG의 sha256 + 64비트 dHash(perceptual hash)
+#   재압축, 해상도 변경, 메타데이터 차이가 있는 같은 사진도 dHash가 같으면 중복으로 봄
+# - 설문: 항목별 값을 정규화한 JSON의 sha256
+# - 같은 사용자의 요청만 비교하고, 파이프라인이 끝까지 완료(done)된 요청만 원본으로 사용
+# - 조회는 request_fingerprint_table 의 (user_id, survey_hash, image_phash) 인덱스 1회
+#
+# /analyze-face 에서 reanalyze=true 로 보내거나 ANALYSIS_DEDUP_ENABLED=0 이면 항상 새로 분석합니다.
+
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+
+from PIL import Image
+from sqlalchemy import case, desc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.recommendation import _insert_hair_recommendations
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+from models.pipeline_job import PipelineJob
+from models.request import Request
+from models.request_fingerprint import RequestFingerprint
+from models.result import Result
+
+ANALYSIS_DEDUP_ENABLED = os.getenv("ANALYSIS_DEDUP_ENABLED", "1") == "1"
+
+# dHash 크기: (HASH_SIZE + 1) x HASH_SIZE 흑백 축소 이미지의 가로 인접 픽셀 비교 → 64비트
+HASH_SIZE = 8
+
+SURVEY_FIELDS = (
+    "hair_length", "hair_type", "sex", "location", "cheekbone",
+    "mood", "dyed", "forehead_shape", "difficulty", "has_bangs",
+)
+
+
+# 보정된 JPEG 바이트 → (sha256, dHash 16진수). 이미지 스레드풀에서 실행
+def image_fingerprint(buffer: io.BytesIO):
+    data = buffer.getvalue()
+    img = Image.open(io.BytesIO(data))
+    img.draft("L", (HASH_SIZE * 8, HASH_SIZE * 8))
+    pixels = list(img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return hashlib.sha256(data).hexdigest(), f"{bits:016x}"
+
+
+def survey_hash(survey: dict) -> str:
+    normalized = {field: str(survey.get(field, "")).strip() for field in SURVEY_FIELDS}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+# 복제할 원본 요청 (바이트까지 같은 요청 우선, 그다음 최신 요청)
+# fingerprint: {"image_sha256", "image_phash", "survey_hash"}
+async def find_duplicate(db: AsyncSession, user_id: int, fingerprint: dict):
+    return (await db.execute(
+        select(Request)
+        .join(RequestFingerprint, RequestFingerprint.request_id == Request.request_id)
+        .join(PipelineJob, PipelineJob.request_id == Request.request_id)
+        .where(
+            RequestFingerprint.user_id == user_id,
+            RequestFingerprint.survey_hash == fingerprint["survey_hash"],
+            RequestFingerprint.image_phash == fingerprint["image_phash"],
+            PipelineJob.stage == "done",
+        )
+        .order_by(case((RequestFingerprint.image_sha256 == fingerprint["image_sha256"], 0), else_=1), desc(Request.request_id))
+        .limit(1)
+    )).scalars().first()
+
+
+# source 요청의 분석 결과 / 추천 스타일(합성 이미지 포함) / 추천 미용실을 새 요청으로 복사 (commit은 호출한 쪽에서 수행)
+# 저장 표시(is_saved)는 복사하지 않음
+async def clone_request(db: AsyncSession, source: Request, survey: dict, fingerprint: dict) -> Request:
+    now = datetime.utcnow()
+    req = Request(user_id=source.user_id, user_image_url=source.user_image_url, created_at=now, **survey)
+    db.add(req)
+    await db.flush()
+
+    results = (await db.execute(
+        select(Result).where(Result.request_id == source.request_id).order_by(Result.result_id)
+    )).scalars().all()
+    for r in results:
+        db.add(Result(
+            face_type=r.face_type, skin_tone=r.skin_tone, forehead=r.forehead, sex=r.sex,
+            top_rate=r.top_rate, middle_rate=r.middle_rate, bottom_rate=r.bottom_rate,
+            rec_color=r.rec_color, summary=r.summary, request_id=req.request_id, created_at=now,
+        ))
+
+    hair_recs = (await db.execute(
+        select(HairRecommendation)
+        .where(HairRecommendation.request_id == source.request_id, HairRecommendation.user_id == source.user_id)
+        .order_by(HairRecommendation.hair_rec_id)
+    )).scalars().all()
+    shops = (await db.execute(
+        select(HairshopRecommendation)
+        .where(HairshopRecommendation.hair_rec_id.in_([h.hair_rec_id for h in hair_recs]))
+        .order_by(HairshopRecommendation.hairshop_rec_id)
+    )).scalars().all() if hair_recs else []
+
+    # 추천 스타일은 RETURNING(또는 multi-row INSERT) 1회, 미용실은 반환된 ID로 executemany 1회
+    if hair_recs:
+        clone_ids = await _insert_hair_recommendations(db, [
+            {
+                "simulation_image_url": h.simulation_image_url, "hair_name": h.hair_name, "description": h.description,
+                "is_saved": 0, "request_id": req.request_id, "hair_id": h.hair_id, "user_id": req.user_id,
+            }
+            for h in hair_recs
+        ], req.user_id, req.request_id)
+        clone_id_of = {h.hair_rec_id: clone_id for h, clone_id in zip(hair_recs, clone_ids)}
+        shop_rows = [
+            {
+                "hairshop": s.hairshop, "is_saved": 0, "latitude": s.latitude, "longitude": s.longitude,
+                "final_menu_price": s.final_menu_price, "review_count": s.review_count, "mean_score": s.mean_score,
+                "hair_rec_id": clone_id_of[s.hair_rec_id], "user_id": s.user_id,
+            }
+            for s in shops
+        ]
+        if shop_rows:
+            await db.execute(insert(HairshopRecommendation), shop_rows)
+
+    # 진행 상태 조회(/pipeline/jobs, WebSocket)에서 바로 완료로 보이도록 완료된 작업 기록
+    db.add(PipelineJob(
+        request_id=req.request_id, user_id=req.user_id, stage="done", status="done",
+        attempts=0, next_run_at=now, enqueued_at=now,
+    ))
+    db.add(RequestFingerprint(
+        request_id=req.request_id, user_id=req.user_id, cloned_from=source.request_id, **fingerprint
+    ))
+    await db.flush()
+    return req
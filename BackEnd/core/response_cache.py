@@ -0,0 +1,219 @@
+# core/response_cache.py
+# 자주 읽고 드물게 바뀌는 사용자 조회 응답의 버전 기반 read-through 캐시 + ETag
+#
+# - 응답은 직렬화된 JSON 바이트로 저장하므로 캐시 적중 시 DB 조회와 직렬화를 모두 생략
+# - 범위(scope)별 버전: ("request", user_id, request_id), ("saved", user_id)
+#   쓰기 경로가 invalidate()로 버전을 올리면 이전 버전으로 채워진 항목은 더 이상 사용되지 않음
+# - 클라이언트가 If-None-Match로 같은 ETag를 보내면 본문 없이 304 응답
+#
+# 버전은 워커 프로세스마다 따로 관리합니다. 다른 워커의 변경은 브로커(core.pubsub)의
+# 무효화 채널로 전달되므로 여러 워커로 실행할 때는 PUBSUB_URL=redis://... 가 필요합니다 (없으면 시작 거부).
+# ETag는 본문 해시만으로 만들어 같은 본문이면 어느 워커에서 응답해도 같은 값이 되도록 합니다.
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from core.db_routing import note_user_write, read_from_replica, recent_writers
+from core.metrics import register_collector, render_family
+from core.pubsub import broker
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 60))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 5000))
+INVALIDATION_CHANNEL = "response-cache:invalidate"
+# 브로커로 받은 자기 자신의 무효화 메시지 구분용
+INSTANCE_ID = uuid.uuid4().hex
+
+
+def request_scope(user_id: int, request_id: int) -> tuple:
+    return ("request", int(user_id), int(request_id))
+
+
+def saved_scope(user_id: int) -> tuple:
+    return ("saved", int(user_id))
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()       # key -> (scope 버전, 만료 시각, body, etag)
+        # scope -> 버전. 버전은 전역 증가 값이고, 오래된 scope는 잘라내되 잘라낸 최대 버전을
+        # 기본값(_floor)으로 삼아 무효화 이전 항목이 다시 유효해지지 않도록 함
+        self._versions = OrderedDict()
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def version(self, scope: tuple) -> int:
+        with self._lock:
+            return self._versions.get(scope, self._floor)
+
+    def get(self, key: tuple, scope: tuple):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self._versions.get(scope, self._floor) or entry[1] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    # version: 조회 시작 전에 읽은 버전 (조회 도중 무효화되면 저장 즉시 낡은 항목이 됨)
+    def set(self, key: tuple, version: int, body: bytes, store: bool = True):
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        entry = (version, time.monotonic() + self.ttl, body, etag)
+        if self.enabled and store:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def bump(self, scope: tuple):
+        with self._lock:
+            self._counter += 1
+            self._versions[scope] = self._counter
+            self._versions.move_to_end(scope)
+            while len(self._versions) > self.maxsize * 2:
+                _, version = self._versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._floor = self._counter
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def _collect_metrics() -> list:
+    stats = response_cache.stats()
+    return (
+        render_family("response_cache_hits_total", "counter", "조회 응답 캐시 적중 수", [({}, stats["hits"])])
+        + render_family("response_cache_misses_total", "counter", "조회 응답 캐시 미적중 수", [({}, stats["misses"])])
+        + render_family("response_cache_not_modified_total", "counter", "ETag 일치로 304 응답한 수", [({}, stats["not_modified"])])
+        + render_family("response_cache_entries", "gauge", "조회 응답 캐시 항목 수", [({}, stats["size"])])
+    )
+
+
+register_collector(_collect_metrics)
+
+_adapters = {}
+
+
+def _adapter(response_model):
+    if response_model not in _adapters:
+        _adapters[response_model] = TypeAdapter(response_model)
+    return _adapters[response_model]
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 프록시가 약한 ETag 접두사를 바꾸는 경우가 있어 W/ 를 무시하고 비교
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+# 캐시된 응답 반환, 없으면 build()로 만들어 response_model 기준으로 직렬화 후 저장
+# build가 bytes를 반환하면 (core.fast_json.RowSerializer) 이미 직렬화된 본문으로 보고 검증 없이 저장
+# build 안에서 발생한 HTTPException(404 등)은 캐시하지 않고 그대로 전달
+async def cached_response(request: Request, name: str, scope: tuple, response_model, build) -> Response:
+    key = (name,) + scope
+    entry = response_cache.get(key, scope)
+    if entry is None:
+        version = response_cache.version(scope)
+        body = await build()
+        if not isinstance(body, bytes):
+            adapter = _adapter(response_model)
+            body = adapter.dump_json(adapter.validate_python(body))
+        # 복제본으로 정한 뒤 이 사용자의 쓰기 표시가 도착했으면 이전 값일 수 있으므로 캐시에 넣지 않음
+        stale_read = read_from_replica(request) and recent_writers.active(scope[1])
+        entry = response_cache.set(key, version, body, store=not stale_read)
+
+    _, _, body, etag = entry
+    # private: 사용자별 응답, no-cache: 매번 ETag로 재검증
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# 쓰기 경로에서 호출: 로컬 버전을 올리고 다른 워커에도 전달
+# 해당 사용자의 조회는 잠시 복제본 대신 기본 DB에서 읽음 (core/db_routing)
+async def invalidate(*scopes: tuple):
+    for scope in scopes:
+        response_cache.bump(scope)
+        note_user_write(scope[1])
+    try:
+        await broker.publish(INVALIDATION_CHANNEL, {"instance": INSTANCE_ID, "scopes": [list(s) for s in scopes]})
+    except Exception:
+        logger.exception("캐시 무효화 전파 실패", extra={"scopes": scopes})
+
+
+# 다른 워커의 무효화 메시지 수신 (startup에서 백그라운드 태스크로 실행)
+async def listen_invalidations():
+    async with broker.subscribe(INVALIDATION_CHANNEL) as queue:
+        while True:
+            message = await queue.get()
+            if message.get("instance") == INSTANCE_ID:
+                continue
+            for scope in message.get("scopes", []):
+                response_cache.bump(tuple(scope))
+                note_user_write(scope[1])
+
+
+_listener = None
+
+
+def start_invalidation_listener():
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.create_task(listen_invalidations())
+
+
+async def stop_invalidation_listener():
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
@@ -0,0 +1,272 @@
+# core/salon_index.py
+# 스타일별 가까운 미용실 검색용 프로세스 내 공간 인덱스
+#
+# hairshop_table을 읽어 스타일마다 위경도 격자(SALON_GRID_DEG 도 단위 셀)에 미용실을 나눠 둡니다.
+# 검색은 반경을 덮는 셀만 훑어 반경 안의 후보를 고르고, 거리/리뷰 수/평점을 합친 점수로
+# 크기 k의 힙을 유지해 상위 k개만 남깁니다. (전체 정렬 없음)
+#
+# 미용실이 어떤 스타일을 하는지는 두 곳에서 모읍니다.
+#   - hairshop_table.menu 에 스타일명이 들어 있는 경우 (GraphRAG의 미용실 매칭과 같은 기준)
+#   - GraphRAG가 해당 스타일로 추천한 적이 있는 경우 (hairshop_recommendation_table)
+# 리뷰 수/평점은 hairshop_table에 없어 hairshop_recommendation_table 값을 미용실 이름 기준으로 씁니다.
+#
+# hairshop_table.latitude/longitude는 문자열 컬럼이라 로드 시 한 번만 float으로 변환하고,
+# 변환할 수 없거나 범위를 벗어난 미용실은 제외합니다.
+# 갱신 시점은 헤어스타일 카탈로그와 같습니다 (SALON_INDEX_TTL 경과 또는 같은 프로세스의 ORM 변경).
+# 만료 후 재로드는 추천 미용실 테이블 전체 GROUP BY를 실행하므로 요청 경로에서 기다리지 않고 백그라운드 작업으로
+# 실행하며, 새 인덱스가 준비될 때까지는 이전 인덱스로 응답합니다. (아직 한 번도 로드되지 않았을 때만 요청이 대기)
+
+import asyncio
+import heapq
+import logging
+import math
+import os
+import time
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, func, select
+
+from core.database import AsyncSessionLocal
+from core.hairstyle_catalog import hairstyle_catalog, normalize_style_name
+from models.hair_recommendation import HairRecommendation
+from models.hairshop import Hairshop
+from models.hairshop_recommendation import HairshopRecommendation
+
+logger = logging.getLogger(__name__)
+
+SALON_INDEX_TTL = float(os.getenv("SALON_INDEX_TTL", 600))
+SALON_GRID_DEG = float(os.getenv("SALON_GRID_DEG", 0.01))  # 위도 0.01도 ≈ 1.1 km
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEG = math.pi * EARTH_RADIUS_M / 180
+
+# 점수 = 거리 가중치 x (1 - 거리/반경) + 리뷰 가중치 x log(리뷰 수) 비율 + 평점 가중치 x 평점 비율
+DISTANCE_WEIGHT = 0.6
+REVIEW_WEIGHT = 0.25
+SCORE_WEIGHT = 0.15
+
+
+class Salon:
+    __slots__ = (
+        "hairshop_id", "hairshop_name", "address", "menu", "phone", "intro",
+        "latitude", "longitude", "lat", "lon", "review_count", "mean_score", "review_rank",
+    )
+
+    def __init__(self, shop, lat: float, lon: float, review_count: int, mean_score: float):
+        self.hairshop_id = shop.hairshop_id
+        self.hairshop_name = shop.hairshop_name
+        self.address = shop.address
+        self.menu = shop.menu
+        self.phone = shop.phone
+        self.intro = shop.intro
+        self.latitude = shop.latitude
+        self.longitude = shop.longitude
+        self.lat = lat
+        self.lon = lon
+        self.review_count = review_count
+        self.mean_score = mean_score
+        self.review_rank = math.log1p(review_count)
+
+
+def parse_coordinate(value, limit: float):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(number) or abs(number) > limit:
+        return None
+    return number
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
+
+
+def _cell(lat: float, lon: float, size: float) -> tuple:
+    return (math.floor(lat / size), math.floor(lon / size))
+
+
+class SalonIndex:
+    def __init__(self, ttl: float = SALON_INDEX_TTL, grid_deg: float = SALON_GRID_DEG):
+        self.ttl = ttl
+        self.grid_deg = grid_deg
+        self.version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._salons = []
+        self._styles = {}           # 정규화 스타일명 -> (셀 -> [Salon], [Salon])
+        self._max_review_rank = 1.0
+        self._max_score = 1.0
+        self._lock = asyncio.Lock()
+        self._refresh_task = None   # 진행 중인 백그라운드 재로드
+        self.loads = 0
+        self.skipped = 0            # 좌표가 없거나 잘못되어 제외한 미용실 수
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self._loaded_version != self.version
+            or time.monotonic() - self._loaded_at >= self.ttl
+        )
+
+    def bump_version(self):
+        self.version += 1
+
+    # shops: Hairshop 목록, stats: 이름 -> (리뷰 수, 평점), offerings: 이름 -> {정규화 스타일명}
+    # style_keys: 메뉴에서 찾을 정규화 스타일명
+    def build(self, shops, stats: dict, offerings: dict, style_keys):
+        style_keys = [key for key in style_keys if key]
+        salons, styles, skipped = [], {}, 0
+        for shop in shops:
+            lat = parse_coordinate(shop.latitude, 90)
+            lon = parse_coordinate(shop.longitude, 180)
+            if lat is None or lon is None:
+                skipped += 1
+                continue
+            name = (shop.hairshop_name or "").strip()
+            review_count, mean_score = stats.get(name, (0, 0.0))
+            salon = Salon(shop, lat, lon, review_count or 0, mean_score or 0.0)
+            salons.append(salon)
+
+            menu = normalize_style_name(shop.menu or "")
+            keys = set(offerings.get(name, ()))
+            keys.update(key for key in style_keys if key in menu)
+            cell = _cell(lat, lon, self.grid_deg)
+            for key in keys:
+                grid, members = styles.setdefault(key, ({}, []))
+                grid.setdefault(cell, []).append(salon)
+                members.append(salon)
+
+        # 백그라운드 재로드 중에도 검색이 이어지므로 새 값을 모두 계산한 뒤 한꺼번에 교체
+        max_review_rank = max((s.review_rank for s in salons), default=0.0) or 1.0
+        max_score = max((s.mean_score for s in salons), default=0.0) or 1.0
+        self._salons = salons
+        self._styles = styles
+        self._max_review_rank = max_review_rank
+        self._max_score = max_score
+        self.skipped = skipped
+
+    async def _load(self):
+        version = self.version
+        await hairstyle_catalog.ensure_fresh()
+        async with AsyncSessionLocal() as db:
+            shops = (await db.execute(select(Hairshop))).scalars().all()
+            rows = (await db.execute(
+                select(
+                    HairshopRecommendation.hairshop,
+                    HairRecommendation.hair_name,
+                    func.max(HairshopRecommendation.review_count),
+                    func.max(HairshopRecommendation.mean_score),
+                )
+                .join(HairRecommendation, HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id)
+                .group_by(HairshopRecommendation.hairshop, HairRecommendation.hair_name)
+            )).all()
+
+        stats, offerings = {}, {}
+        for hairshop, hair_name, review_count, mean_score in rows:
+            name = (hairshop or "").strip()
+            best = stats.get(name, (0, 0.0))
+            stats[name] = (max(best[0], review_count or 0), max(best[1], mean_score or 0.0))
+            offerings.setdefault(name, set()).add(normalize_style_name(hair_name))
+
+        # 메뉴 문자열 검사는 미용실 수 x 스타일 수만큼 걸리므로 이벤트 루프 밖에서 실행
+        await run_in_threadpool(self.build, shops, stats, offerings, hairstyle_catalog.style_keys())
+        self._loaded_version = version
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+        logger.info("미용실 공간 인덱스 로드", extra={
+            "salons": len(self._salons), "skipped": self.skipped, "styles": len(self._styles),
+        })
+
+    async def refresh(self):
+        async with self._lock:
+            await self._load()
+
+    async def ensure_fresh(self):
+        if not self.stale:
+            return
+        if self.loads == 0:
+            # 첫 로드는 응답할 인덱스가 없으므로 기다림 (동시에 들어온 요청은 한 번만 로드)
+            async with self._lock:
+                if self.stale:
+                    await self._load()
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self):
+        try:
+            async with self._lock:
+                if self.stale:
+                    await self._load()
+        except Exception:
+            # 실패해도 이전 인덱스로 계속 응답하고 다음 요청에서 다시 시도
+            logger.exception("미용실 공간 인덱스 백그라운드 재로드 실패")
+
+    # 반경 안의 해당 스타일 미용실 중 점수 상위 k개 [(Salon, 거리 m)] (점수 내림차순)
+    def nearest(self, style_name: str, lat: float, lon: float, radius_m: float, k: int) -> list:
+        entry = self._styles.get(normalize_style_name(style_name))
+        if entry is None or k <= 0:
+            return []
+        grid, members = entry
+
+        # 반경을 덮는 셀 범위. 셀 수가 스타일 전체 미용실 수보다 많으면 그냥 전체를 훑음
+        size = self.grid_deg
+        dlat = radius_m / METERS_PER_DEG
+        dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        (row0, col0), (row1, col1) = _cell(lat - dlat, lon - dlon, size), _cell(lat + dlat, lon + dlon, size)
+        if (row1 - row0 + 1) * (col1 - col0 + 1) > len(members):
+            candidates = members
+        else:
+            candidates = (
+                salon
+                for row in range(row0, row1 + 1)
+                for col in range(col0, col1 + 1)
+                for salon in grid.get((row, col), ())
+            )
+
+        heap = []  # (점수, -hairshop_id, 거리, Salon) 최소 힙, 크기 k 유지
+        review_norm = REVIEW_WEIGHT / self._max_review_rank
+        score_norm = SCORE_WEIGHT / self._max_score
+        for salon in candidates:
+            # 위도 차이만으로 반경 밖이면 거리 계산 생략
+            if abs(salon.lat - lat) > dlat:
+                continue
+            distance = haversine_m(lat, lon, salon.lat, salon.lon)
+            if distance > radius_m:
+                continue
+            score = (
+                DISTANCE_WEIGHT * (1 - distance / radius_m)
+                + review_norm * salon.review_rank
+                + score_norm * salon.mean_score
+            )
+            item = (score, -salon.hairshop_id, distance, salon)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+
+        return [(salon, distance) for _, _, distance, salon in sorted(heap, key=lambda item: item[:2], reverse=True)]
+
+    def stats(self) -> dict:
+        return {
+            "salons": len(self._salons),
+            "styles": len(self._styles),
+            "skipped": self.skipped,
+            "version": self.version,
+            "loads": self.loads,
+        }
+
+
+salon_index = SalonIndex()
+
+
+@event.listens_for(Hairshop, "after_insert")
+@event.listens_for(Hairshop, "after_update")
+@event.listens_for(Hairshop, "after_delete")
+def _bump_index_version(mapper, connection, target):
+    salon_index.bump_version()
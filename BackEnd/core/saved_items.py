@@ -0,0 +1,70 @@
+# core/saved_items.py
+# 추천 스타일/미용실 저장 표시 변경 (호출자가 commit)
+#
+# 조회 → 파이썬에서 뒤집기 → commit → refresh 대신 UPDATE 한 문장으로 처리합니다.
+#   - UPDATE ... RETURNING 지원 DB(sqlite, PostgreSQL): 1회 왕복
+#   - MySQL, MariaDB: UPDATE 1회 + 결과 조회 1회 (UPDATE가 잡은 행 잠금 안에서 읽으므로 결과는 동일)
+#     (MariaDB의 RETURNING은 INSERT/DELETE에만 있고 UPDATE에는 없음)
+# 반환 행: (id, is_saved, request_id). request_id는 응답 캐시 무효화용
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.hair_recommendation import HairRecommendation
+from models.hairshop_recommendation import HairshopRecommendation
+
+HAIR = "hair"
+HAIRSHOP = "hairshop"
+
+# 종류 → (모델, PK 컬럼, 소속 요청 ID 식)
+_TARGETS = {
+    HAIR: (HairRecommendation, HairRecommendation.hair_rec_id, HairRecommendation.request_id),
+    HAIRSHOP: (
+        HairshopRecommendation,
+        HairshopRecommendation.hairshop_rec_id,
+        select(HairRecommendation.request_id)
+        .where(HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id)
+        .scalar_subquery(),
+    ),
+}
+
+
+async def _update_saved(db: AsyncSession, kind: str, ids: list, user_id: int, value) -> list:
+    model, pk, request_id = _TARGETS[kind]
+    stmt = (
+        update(model)
+        .where(pk.in_(ids), model.user_id == user_id)
+        .values(is_saved=value)
+        .execution_options(synchronize_session=False)
+    )
+    dialect = db.bind.dialect
+    if dialect.update_returning and not getattr(dialect, "is_mariadb", False):
+        return (await db.execute(stmt.returning(pk, model.is_saved, request_id))).all()
+
+    await db.execute(stmt)
+    return (await db.execute(
+        select(pk, model.is_saved, request_id).where(pk.in_(ids), model.user_id == user_id)
+    )).all()
+
+
+# 저장 표시 뒤집기. 본인 추천이 아니거나 없으면 None
+async def toggle_saved(db: AsyncSession, kind: str, item_id: int, user_id: int):
+    model = _TARGETS[kind][0]
+    rows = await _update_saved(db, kind, [item_id], user_id, 1 - model.is_saved)
+    return rows[0] if rows else None
+
+
+# 여러 저장/해제 요청을 한 번에 반영. operations: [(종류, id, 저장 여부)], 같은 항목은 마지막 요청 기준
+# 종류별로 저장/해제 UPDATE 최대 2문장. 반환: 종류 → 반영된 행 목록
+async def apply_saved(db: AsyncSession, operations: list, user_id: int) -> dict:
+    latest = {}
+    for kind, item_id, is_saved in operations:
+        latest[(kind, item_id)] = is_saved
+
+    results = {kind: [] for kind in _TARGETS}
+    for kind in _TARGETS:
+        for value in (1, 0):
+            ids = [item_id for (k, item_id), is_saved in latest.items() if k == kind and int(is_saved) == value]
+            if ids:
+                results[kind].extend(await _update_saved(db, kind, ids, user_id, value))
+    return results
@@ -4,8 +4,10 @@
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError, ExpiredSignatureError
-from sqlalchemy.orm import Session
-from core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_async_db
+from core.auth_cache import principal_cache
 from models.user import User  # 실제 사용자 모델 import
 
 # JWT 설정
@@ -26,23 +28,32 @@ def decode_jwt(token: str):
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
 
 # 인증된 사용자 반환 함수
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     token = credentials.credentials
+
+    # 캐시 적중 시 JWT 디코딩과 DB 조회 모두 생략 (캐시 항목은 토큰 만료 전에 만료됨)
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached
+
     payload = decode_jwt(token)
 
     user_id = int(payload.get("sub", 0))
     if not user_id:
         raise HTTPException(status_code=401, detail="토큰에 사용자 정보가 없습니다.")
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
-    return {
+    current_user = {
         "user_id": user.user_id,
         "email": user.email,
         "name": user.name
     }
+    principal_cache.set(token, current_user, payload.get("exp"))
+    return current_user
+
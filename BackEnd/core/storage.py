@@ -0,0 +1,100 @@
+# core/storage.py
+# 사용자 얼굴 이미지 전처리 + S3 업로드
+#
+# - boto3 S3 클라이언트는 프로세스에서 하나만 생성해 재사용 (스레드 안전)
+# - 업로드 전 EXIF 회전 보정 → 긴 변 IMAGE_MAX_EDGE 로 축소 → JPEG 재인코딩
+#   (휴대폰 원본 수 MB 대신 수백 KB를 올려 face_extract / GraphRAG / Stable-Hair의 다운로드·디코딩 시간 단축)
+# - 디코딩/업로드는 블로킹 작업이므로 전용 스레드풀에서 실행 (동시 디코딩 수 = 메모리 상한)
+# - AWS_S3_ENDPOINT_URL 로 로컬 S3 호환 서버(moto, MinIO 등)를 사용할 수 있음
+
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+AWS_S3_BUCKET = os.getenv("AWS_S3_BUCKET", "YOUR_BUCKET_NAME")
+AWS_S3_REGION = os.getenv("AWS_S3_REGION", "YOUR_REGION")
+AWS_S3_ENDPOINT_URL = os.getenv("AWS_S3_ENDPOINT_URL")      # 로컬 S3 대체 서버 주소
+AWS_S3_PUBLIC_URL = os.getenv("AWS_S3_PUBLIC_URL")          # 객체 URL 접두사 (CDN 등)
+
+IMAGE_MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", 1024))
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", 85))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 4))
+
+# 압축 해제 폭탄 방지 (약 50MP 초과 이미지는 거부)
+Image.MAX_IMAGE_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 50_000_000))
+
+_executor = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image")
+_s3 = None
+
+
+class InvalidImageError(ValueError):
+    """이미지로 읽을 수 없는 업로드 파일"""
+
+
+def get_s3_client():
+    global _s3
+    if _s3 is None:
+        access_key = os.getenv("AWS_ACCESS_KEY_ID")
+        secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+        if not access_key or "YOUR_ACCESS_KEY" in access_key:
+            # 키가 없으면 boto3 기본 자격 증명 체인 사용 (EC2 IAM 역할 등)
+            logger.warning("S3 접근 키가 .env에 지정되지 않았습니다.")
+            access_key = secret_key = None
+        _s3 = boto3.client(
+            "s3",
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+            region_name=AWS_S3_REGION,
+            endpoint_url=AWS_S3_ENDPOINT_URL,
+            config=Config(
+                max_pool_connections=IMAGE_WORKERS * 2,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        )
+    return _s3
+
+
+def object_url(key: str, bucket: str = AWS_S3_BUCKET) -> str:
+    if AWS_S3_PUBLIC_URL:
+        return f"{AWS_S3_PUBLIC_URL.rstrip('/')}/{key}"
+    if AWS_S3_ENDPOINT_URL:
+        return f"{AWS_S3_ENDPOINT_URL.rstrip('/')}/{bucket}/{key}"
+    return f"https://{bucket}.s3.{AWS_S3_REGION}.amazonaws.com/{key}"
+
+
+# 업로드 이미지 → 회전 보정/축소된 JPEG 바이트
+def prepare_image(fileobj, max_edge: int = IMAGE_MAX_EDGE, quality: int = IMAGE_JPEG_QUALITY) -> io.BytesIO:
+    try:
+        img = Image.open(fileobj)
+        # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8 축소 (전체 해상도 디코딩 생략)
+        img.draft("RGB", (max_edge, max_edge))
+        img = ImageOps.exif_transpose(img)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError(f"이미지를 읽을 수 없습니다: {e}")
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality, optimize=True)
+    buffer.seek(0)
+    return buffer
+
+
+def upload_bytes(buffer, key: str, content_type: str = "image/jpeg", bucket: str = AWS_S3_BUCKET) -> str:
+    # upload_fileobj: 큰 객체는 멀티파트로 나눠 스트리밍 업로드
+    get_s3_client().upload_fileobj(buffer, bucket, key, ExtraArgs={"ContentType": content_type})
+    return object_url(key, bucket)
+
+
+async def run_in_image_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, func, *args)
@@ -0,0 +1,211 @@
+# core/style_search.py
+# 헤어스타일 카탈로그 검색 인덱스 (/styles)
+#
+# hairstyle_table 전체를 메모리에 올려 다음 검색을 지원합니다.
+# 헤어스타일 카탈로그가 테이블을 다시 읽을 때마다 같은 행으로 함께 다시 만들어집니다.
+#   - 자모 단위 접두/부분 일치: "리프", "맆"(입력 중), "프컷" 모두 리프컷을 찾음
+#   - 초성 검색: "ㄹㅍ" → 리프컷
+#   - 성별/기장/모질/얼굴형 필터와 결과 내 값별 개수(facet)
+#   - 정렬 순서(이름순, 최신순, 등록순)는 생성 시 미리 계산
+#
+# 이름 키마다 모든 접미사를 정렬해 두어(접미사 배열) 부분 문자열 검색도 이진 탐색으로 처리합니다.
+# 검색어가 없거나 결과가 많으면 미리 정렬된 순서를 앞에서부터 훑고, 결과가 적으면 순위 값으로 정렬합니다.
+
+from bisect import bisect_left
+from itertools import chain, islice
+
+from core.hairstyle_catalog import hairstyle_catalog, normalize_style_name
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+              "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+_JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+              "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 검색어에 직접 입력되는 겹모음/겹받침 호환 자모
+_COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+_CHOSEONG_SET = set(_CHOSEONG)
+
+# 필터/facet 필드: 요청 파라미터 이름 -> Hairstyle 컬럼
+FACET_FIELDS = {
+    "sex": "hairstyle_sex",
+    "length": "hairstyle_length",
+    "type": "hairstyle_type",
+    "face": "hairstyle_face",
+}
+SORTS = ("name", "latest", "oldest")
+SHORT_QUERY_LENGTH = 2
+RELEVANCE = "relevance"
+
+
+# 한글 음절을 호환 자모로 분해 (받침/겹모음도 낱자로 풀어 입력 중인 글자와 비교 가능)
+def to_jamo(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            code -= _HANGUL_BASE
+            out.append(_CHOSEONG[code // 588])
+            out.append(_JUNGSEONG[(code % 588) // 28])
+            out.append(_JONGSEONG[code % 28])
+        else:
+            out.append(_COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+
+def to_choseong(text: str) -> str:
+    return "".join(
+        _CHOSEONG[(ord(ch) - _HANGUL_BASE) // 588] if _HANGUL_BASE <= ord(ch) <= _HANGUL_LAST else ch
+        for ch in text
+    )
+
+
+def is_choseong_query(text: str) -> bool:
+    return bool(text) and all(ch in _CHOSEONG_SET for ch in text)
+
+
+class _SuffixArray:
+    def __init__(self, keys):
+        # keys: [(키 문자열, entry 번호)]
+        pairs = sorted(
+            (key[start:], entry, start == 0)
+            for key, entry in keys
+            for start in range(len(key))
+        )
+        self._suffixes = [suffix for suffix, _, _ in pairs]
+        self._entries = [(entry, is_prefix) for _, entry, is_prefix in pairs]
+        # 한두 글자 검색어는 일치 범위가 넓어 결과를 기억해 둠
+        # 일치하는 검색어만 기억하므로 항목 수는 색인에 실제로 있는 한두 글자 부분 문자열 수 이내
+        # (임의의 문자를 보내도 늘어나지 않음. 일치가 없는 검색어는 bisect 1회로 끝나 기억할 필요 없음)
+        self._short = {}
+
+    # 부분 일치 entry 집합과 그중 접두 일치 집합
+    def search(self, query: str):
+        if len(query) <= SHORT_QUERY_LENGTH:
+            cached = self._short.get(query)
+            if cached is None:
+                cached = tuple(map(frozenset, self._scan(query)))
+                if cached[0]:
+                    self._short[query] = cached
+            return cached
+        return self._scan(query)
+
+    def _scan(self, query: str):
+        matches, prefixes = set(), set()
+        i = bisect_left(self._suffixes, query)
+        suffixes, entries = self._suffixes, self._entries
+        while i < len(suffixes) and suffixes[i].startswith(query):
+            entry, is_prefix = entries[i]
+            matches.add(entry)
+            if is_prefix:
+                prefixes.add(entry)
+            i += 1
+        return matches, prefixes
+
+
+class StyleSearchIndex:
+    def __init__(self):
+        self._rows = []
+        self._names = []            # entry -> 정규화 이름
+        self._jamo = _SuffixArray([])
+        self._choseong = _SuffixArray([])
+        self._orders = {sort: [] for sort in SORTS}   # 정렬 -> entry 순서
+        self._ranks = {sort: [] for sort in SORTS}    # 정렬 -> entry별 순위
+        self._facets = {field: {} for field in FACET_FIELDS}  # 필드 -> 값 -> entry 집합
+
+    def __len__(self):
+        return len(self._rows)
+
+    def build(self, hairstyles):
+        rows = sorted(hairstyles, key=lambda h: h.hair_id)
+        names = [normalize_style_name(h.hairstyle_name) for h in rows]
+
+        orders = {
+            "oldest": list(range(len(rows))),
+            "latest": list(range(len(rows)))[::-1],
+            "name": sorted(range(len(rows)), key=lambda i: (rows[i].hairstyle_name, rows[i].hair_id)),
+        }
+        ranks = {}
+        for sort, order in orders.items():
+            rank = [0] * len(rows)
+            for position, entry in enumerate(order):
+                rank[entry] = position
+            ranks[sort] = rank
+
+        facets = {field: {} for field in FACET_FIELDS}
+        for entry, h in enumerate(rows):
+            for field, column in FACET_FIELDS.items():
+                value = getattr(h, column)
+                if value:
+                    facets[field].setdefault(value.strip(), set()).add(entry)
+
+        self._jamo = _SuffixArray((to_jamo(name), entry) for entry, name in enumerate(names))
+        self._choseong = _SuffixArray((to_choseong(name), entry) for entry, name in enumerate(names))
+        self._rows, self._names, self._orders, self._ranks, self._facets = rows, names, orders, ranks, facets
+
+    def _match(self, query: str):
+        key = normalize_style_name(query)
+        if not key:
+            return None, set(), set()
+        if is_choseong_query(key):
+            matches, prefixes = self._choseong.search(key)
+        else:
+            matches, prefixes = self._jamo.search(to_jamo(key))
+        exact = {entry for entry in prefixes if self._names[entry] == key}
+        return matches, prefixes, exact
+
+    # matched를 sort 순서로 나열 (None이면 전체)
+    def _ordered(self, matched, sort: str):
+        if matched is None:
+            return self._orders[sort]
+        # 결과가 전체의 일부면 순위로 정렬, 많으면 미리 정렬된 순서를 훑음 (페이지만큼만 소비)
+        if len(matched) * 8 < len(self._rows):
+            return sorted(matched, key=self._ranks[sort].__getitem__)
+        return (entry for entry in self._orders[sort] if entry in matched)
+
+    # 반환: (전체 개수, 현재 페이지 Hairstyle 목록, facet 개수)
+    # filters: {"sex": "여성", ...}
+    # sort: None이면 검색어가 있을 때 관련도(정확 일치 > 접두 일치 > 부분 일치, 같은 단계는 이름순), 없을 때 등록순
+    def search(self, query=None, filters=None, sort=None, skip: int = 0, limit: int = 20):
+        matched, prefixes, exact = self._match(query) if query else (None, set(), set())
+
+        for field, value in (filters or {}).items():
+            if value is None:
+                continue
+            posting = self._facets[field].get(value.strip(), set())
+            matched = posting if matched is None else matched & posting
+
+        facets = {
+            field: {
+                value: len(posting) if matched is None else len(matched & posting)
+                for value, posting in values.items()
+            }
+            for field, values in self._facets.items()
+        }
+
+        if sort is None:
+            sort = RELEVANCE if query else "oldest"
+        if sort == RELEVANCE and not query:
+            sort = "oldest"
+        if sort == RELEVANCE and matched is not None:
+            exact &= matched
+            prefixes = (prefixes & matched) - exact
+            ordered = chain(
+                self._ordered(exact, "name"),
+                self._ordered(prefixes, "name"),
+                self._ordered(matched - exact - prefixes, "name"),
+            )
+        else:
+            ordered = self._ordered(matched, "oldest" if sort == RELEVANCE else sort)
+
+        total = len(self._rows) if matched is None else len(matched)
+        return total, [self._rows[entry] for entry in islice(ordered, skip, skip + limit)], facets
+
+
+style_search = StyleSearchIndex()
+hairstyle_catalog.on_build(style_search.build)
@@ -0,0 +1,148 @@
+# core/warmup.py
+# 서버 시작 후 백그라운드 준비 작업 + 준비 상태(readiness) 보고
+#
+# 워커가 뜰 때 DB 연결/마이그레이션/카탈로그 로드를 기다리면 RDS가 느리거나 잠시 끊겨 있을 때
+# 시작 자체가 실패하거나 늦어지므로, lifespan 에서는 이 작업들을 백그라운드 태스크로만 띄우고 바로 요청을 받습니다.
+#   - GET /healthz : 프로세스가 살아 있으면 항상 200 (liveness)
+#   - GET /readyz  : 필수 준비 단계가 모두 끝나면 200, 아니면 503 + 단계별 상태 (readiness)
+# 로드밸런서/오케스트레이터는 /readyz 가 200이 된 워커로만 트래픽을 보내면 됩니다.
+#
+# 순서: database(마이그레이션 또는 연결 확인) → 나머지 단계 동시 실행
+# 필수 단계는 성공할 때까지 지수 백오프로 재시도하고, 선택 단계는 한 번만 시도합니다.
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from core.metrics import register_collector, render_family
+
+logger = logging.getLogger(__name__)
+
+WARMUP_RETRY_BASE = float(os.getenv("WARMUP_RETRY_BASE", 0.5))
+WARMUP_RETRY_MAX = float(os.getenv("WARMUP_RETRY_MAX", 30))
+
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[[], Awaitable[None]]
+    required: bool = True
+    status: str = "pending"         # pending / running / ok / failed
+    attempts: int = 0
+    seconds: Optional[float] = None  # 성공까지 걸린 시간
+    error: Optional[str] = None
+
+    def snapshot(self) -> dict:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "attempts": self.attempts,
+            "seconds": None if self.seconds is None else round(self.seconds, 3),
+            "error": self.error,
+        }
+
+
+@dataclass
+class Warmup:
+    first: list = field(default_factory=list)   # 먼저 끝나야 하는 단계 (순서대로)
+    rest: list = field(default_factory=list)    # 그 뒤 동시에 실행하는 단계
+    started_at: float = field(default_factory=time.monotonic)  # main.py import 시작 시각
+    imported_at: Optional[float] = None         # 앱 import 완료 시각
+    ready_at: Optional[float] = None
+    _task: Optional[asyncio.Task] = None
+
+    @property
+    def steps(self) -> list:
+        return self.first + self.rest
+
+    @property
+    def ready(self) -> bool:
+        return all(step.status == "ok" for step in self.steps if step.required)
+
+    def add(self, name: str, run, required: bool = True, first: bool = False):
+        (self.first if first else self.rest).append(Step(name, run, required))
+
+    def mark_imported(self, started_at: float):
+        self.started_at = started_at
+        self.imported_at = time.monotonic()
+
+    async def _run_step(self, step: Step):
+        delay = WARMUP_RETRY_BASE
+        started = time.monotonic()
+        step.status = "running"
+        while True:
+            step.attempts += 1
+            try:
+                await step.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                step.error = str(e) or e.__class__.__name__
+                if not step.required:
+                    step.status = "failed"
+                    logger.warning("준비 단계 실패 (선택)", extra={"step": step.name, "error": step.error})
+                    return
+                logger.warning("준비 단계 실패, 재시도 예약", extra={
+                    "step": step.name, "attempt": step.attempts, "retry_in": delay, "error": step.error,
+                })
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, WARMUP_RETRY_MAX)
+                continue
+            step.status = "ok"
+            step.error = None
+            step.seconds = time.monotonic() - started
+            logger.info("준비 단계 완료", extra={"step": step.name, "seconds": round(step.seconds, 3)})
+            return
+
+    async def _run(self):
+        for step in self.first:
+            await self._run_step(step)
+        await asyncio.gather(*(self._run_step(step) for step in self.rest))
+        self.ready_at = time.monotonic()
+        logger.info("서버 준비 완료", extra=self.timings())
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="warmup")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    # main.py import 시작 기준 경과 시간 (초)
+    def timings(self) -> dict:
+        def since_start(at):
+            return None if at is None else round(at - self.started_at, 3)
+        return {
+            "import_seconds": since_start(self.imported_at),
+            "ready_seconds": since_start(self.ready_at),
+            "uptime_seconds": since_start(time.monotonic()),
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            **self.timings(),
+            "steps": {step.name: step.snapshot() for step in self.steps},
+        }
+
+
+warmup = Warmup()
+
+
+def _collect_metrics() -> list:
+    timings = warmup.timings()
+    return (
+        render_family("app_ready", "gauge", "필수 준비 단계 완료 여부", [({}, int(warmup.ready))])
+        + render_family("app_startup_seconds", "gauge", "main.py import 시작부터 단계별 경과 시간",
+                        [({"phase": phase}, timings[f"{phase}_seconds"])
+                         for phase in ("import", "ready") if timings[f"{phase}_seconds"] is not None])
+    )
+
+
+register_collector(_collect_metrics)
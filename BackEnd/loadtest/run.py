@@ -0,0 +1,435 @@
+# loadtest/run.py
+# Main API 부하 테스트: 로컬 대체 서버(loadtest/stubs.py) + sqlite 로 Main API를 띄우고 사용자 흐름을 동시에 실행
+#
+# 실행 예시 (BackEnd 디렉토리에서):
+#   python -m loadtest.run --users 40 --concurrency 10
+#   PUBSUB_URL=redis://localhost:6379 python -m loadtest.run --users 200 --concurrency 50 --workers 2 --simulate-ms 500 --json loadtest.json
+#   (워커 2개 이상은 공유 브로커 필요, core/pubsub.check_broker_for_workers)
+#   python -m loadtest.run --users 40 --concurrency 10 --baseline loadtest.json   (p95가 기준보다 느려지면 종료 코드 1)
+#
+# 가상 사용자 1명의 흐름 (앱과 같은 순서):
+#   signup → login → analyze-face(이미지 업로드) → /user/result 폴링(분석 완료까지)
+#   → /pipeline/jobs 폴링(추천/합성 완료까지) → result-page → 스타일/미용실 저장 토글 → 저장 목록 조회
+# 하위 서비스는 실제 서비스처럼 DB를 직접 쓰고 Main API를 다시 호출하므로 파이프라인 전체가 동작합니다.
+# analyze-face 가 429 를 돌려주면 앱처럼 Retry-After 만큼 기다렸다가 다시 요청합니다.
+#
+# 결과: 라우트별 요청 수, 오류 수, p50/p95/p99 지연(ms), 처리량(req/s) + 흐름 구간별 소요 시간
+# DATABASE_URL 을 지정하지 않으면 임시 sqlite 파일(WAL)을 사용합니다. Main API 설정은 환경 변수로 그대로 전달됩니다.
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="loadtest_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'loadtest.db')}"
+
+import httpx
+from PIL import Image
+from sqlalchemy import text
+
+from core.database import SessionLocal, engine
+from core.migrations import run_migrations
+from models.hairstyle import Hairstyle
+
+# 추천 카탈로그 (GraphRAG 대체 서버가 성별에 맞는 스타일을 여기서 고름)
+HAIRSTYLES = {
+    "남성": ("리프컷", "댄디컷", "가일컷", "투블럭컷", "쉼표머리", "애즈펌", "포마드", "아이비리그컷"),
+    "여성": ("레이어드컷", "허쉬컷", "단발", "C컬펌", "빌드펌", "히피펌", "태슬컷", "보브컷"),
+}
+SURVEY = {
+    "hair_length": ("숏", "미디움", "롱"),
+    "hair_type": ("직모", "곱슬", "반곱슬"),
+    "location": ("서울", "부산", "대구"),
+    "cheekbone": ("많이 도드라짐", "약간 도드라짐", "눈에띄지 않음"),
+    "mood": ("세련된,깔끔한", "부드러운,귀여운", "단정한,차분한"),
+    "dyed": ("0", "1"),
+    "forehead_shape": ("둥근형", "M자형", "네모형"),
+    "difficulty": ("쉬움", "보통", "어려움"),
+    "has_bangs": ("0", "1"),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(len(values) * q)) - 1))] if values else 0.0
+
+
+# ─────────────────────────────────────────────
+# 환경 준비 (DB, 대체 서버, Main API)
+# ─────────────────────────────────────────────
+
+def prepare_database():
+    run_migrations()
+    if engine.url.get_backend_name() == "sqlite":
+        # Main API 와 대체 서버가 같은 파일에 동시에 쓰므로 WAL 사용 (읽기가 쓰기를 막지 않음)
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA journal_mode=WAL"))
+    db = SessionLocal()
+    try:
+        if db.query(Hairstyle).count() == 0:
+            db.add_all([
+                Hairstyle(
+                    hairstyle_name=name, hairstyle_image_url=f"https://example.com/styles/{name}.jpg",
+                    hairstyle_sex=sex, hairstyle_type=hair_type,
+                )
+                for sex, names in HAIRSTYLES.items()
+                for name in names
+                for hair_type in SURVEY["hair_type"]
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+def start_servers(args):
+    stub_port, main_port = free_port(), free_port()
+    stub_url, main_url = f"http://127.0.0.1:{stub_port}", f"http://127.0.0.1:{main_port}"
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", ""),
+        # 대체 서버
+        "LOADTEST_EXTRACT_MS": str(args.extract_ms),
+        "LOADTEST_RECOMMEND_MS": str(args.recommend_ms),
+        "LOADTEST_SIMULATE_MS": str(args.simulate_ms),
+        "LOADTEST_S3_MS": str(args.s3_ms),
+        "LOADTEST_JITTER": str(args.jitter),
+        "LOADTEST_STUB_URL": stub_url,
+        "MAIN_API_URL": main_url,
+        # Main API → 대체 서버
+        "FACE_EXTRACT_URL": stub_url,
+        "GRAPHRAG_URL": stub_url,
+        "STABLEHAIR_URL": stub_url,
+        "AWS_S3_ENDPOINT_URL": stub_url,
+    })
+    env.setdefault("AWS_S3_BUCKET", "loadtest")
+    env.setdefault("AWS_S3_REGION", "us-east-1")
+    env.setdefault("AWS_ACCESS_KEY_ID", "loadtest")
+    env.setdefault("AWS_SECRET_ACCESS_KEY", "loadtest")
+    env.setdefault("BCRYPT_ROUNDS", "10")
+    env.setdefault("LOG_LEVEL", "WARNING")
+    env["WEB_CONCURRENCY"] = str(args.workers)
+
+    log = open(os.path.join(tempfile.gettempdir(), "loadtest_servers.log"), "w")
+    uvicorn = [sys.executable, "-m", "uvicorn", "--host", "127.0.0.1", "--log-level", "warning"]
+    procs = [
+        subprocess.Popen(uvicorn + ["loadtest.stubs:app", "--port", str(stub_port)],
+                         cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT),
+        subprocess.Popen(uvicorn + ["main:app", "--port", str(main_port), "--workers", str(args.workers)],
+                         cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT),
+    ]
+    return procs, stub_url, main_url, log.name
+
+
+def wait_ready(procs, urls, timeout: float, log_path: str):
+    deadline = time.monotonic() + timeout
+    pending = list(urls)
+    with httpx.Client(timeout=2) as client:
+        while pending:
+            if any(p.poll() is not None for p in procs):
+                raise RuntimeError(f"서버가 종료되었습니다. 로그: {log_path}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{timeout}초 안에 준비되지 않았습니다: {pending} (로그: {log_path})")
+            url, expected = pending[0]
+            try:
+                if client.get(url).status_code == expected:
+                    pending.pop(0)
+                    continue
+            except httpx.TransportError:
+                pass
+            time.sleep(0.2)
+
+
+def stop_servers(procs):
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        try:
+            p.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+# ─────────────────────────────────────────────
+# 측정
+# ─────────────────────────────────────────────
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)  # 라우트 -> 응답 시간(초)
+        self.errors = defaultdict(int)      # 라우트 -> 기대하지 않은 응답/연결 오류 수
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.phases = defaultdict(list)     # 흐름 구간 -> 소요 시간(초)
+        self.flows_ok = 0
+        self.flows_failed = 0
+        self.failures = defaultdict(int)    # 실패 사유 -> 수
+
+    async def call(self, client, method: str, route: str, url: str, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[route].append(time.perf_counter() - started)
+            self.errors[route] += 1
+            self.statuses[route][e.__class__.__name__] += 1
+            raise FlowError(f"{route}: {e.__class__.__name__}")
+        self.latencies[route].append(time.perf_counter() - started)
+        self.statuses[route][response.status_code] += 1
+        if response.status_code not in expected:
+            self.errors[route] += 1
+            raise FlowError(f"{route}: HTTP {response.status_code}")
+        return response
+
+
+class FlowError(Exception):
+    pass
+
+
+def make_image(size=(960, 1280)) -> bytes:
+    # 사용자마다 다른 사진 (중복 분석 복제가 일어나지 않도록)
+    base = Image.new("RGB", (size[0] // 16, size[1] // 16),
+                     tuple(random.randrange(256) for _ in range(3)))
+    noise = Image.effect_noise(base.size, random.uniform(20, 60)).convert("RGB")
+    img = Image.blend(base, noise, 0.5).resize(size, Image.BILINEAR)
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+async def user_flow(client, rec: Recorder, index: int, args, run_id: str):
+    email = f"load{run_id}_{index}@example.com"
+    password = "loadtest-password"
+    sex = random.choice(tuple(HAIRSTYLES))
+
+    await rec.call(client, "POST", "POST /signup", "/signup",
+                   json={"email": email, "password": password, "nickname": f"load{index}"})
+    token = (await rec.call(client, "POST", "POST /login", "/login",
+                            json={"email": email, "password": password})).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    form = {field: random.choice(options) for field, options in SURVEY.items()}
+    form["sex"] = sex
+    image = await asyncio.to_thread(make_image)
+    started = time.perf_counter()
+    for attempt in range(args.max_retries + 1):
+        response = await rec.call(client, "POST", "POST /analyze-face", "/analyze-face", expected=(200, 429),
+                                  headers=headers, data=form, files={"image": ("user.jpg", image, "image/jpeg")})
+        if response.status_code == 200:
+            break
+        if attempt == args.max_retries:
+            raise FlowError("POST /analyze-face: 429 재시도 초과")
+        await asyncio.sleep(min(args.max_retry_wait, float(response.headers.get("Retry-After", 1))))
+    request_id = response.json()["data"]["request_id"]
+    submitted = time.perf_counter()
+    rec.phases["analyze-face (429 대기 포함)"].append(submitted - started)
+
+    # 앱은 분석 결과(result_ready)가 나올 때까지 /user/result 를 조회
+    while True:
+        response = await rec.call(client, "GET", "GET /user/result/{request_id}", f"/user/result/{request_id}",
+                                  expected=(200, 404), headers=headers)
+        if response.status_code == 200:
+            break
+        if time.perf_counter() - submitted > args.flow_timeout:
+            raise FlowError("분석 결과 대기 시간 초과")
+        await asyncio.sleep(args.poll_interval)
+    rec.phases["제출 → 분석 결과"].append(time.perf_counter() - submitted)
+
+    while True:
+        job = (await rec.call(client, "GET", "GET /pipeline/jobs/{request_id}", f"/pipeline/jobs/{request_id}",
+                              headers=headers)).json()
+        if job["stage"] == "done":
+            break
+        if job["status"] == "failed":
+            raise FlowError(f"파이프라인 실패 ({job['stage']}): {job['last_error']}")
+        if time.perf_counter() - submitted > args.flow_timeout:
+            raise FlowError("파이프라인 완료 대기 시간 초과")
+        await asyncio.sleep(args.poll_interval)
+    rec.phases["제출 → 합성 완료"].append(time.perf_counter() - submitted)
+
+    page = (await rec.call(client, "GET", "GET /user/result-page/{request_id}", f"/user/result-page/{request_id}",
+                           headers=headers)).json()
+    styles = page["recommendations"]
+    if not styles:
+        raise FlowError("추천 스타일 없음")
+    style = random.choice(styles)
+    await rec.call(client, "PUT", "PUT /user/hair-recommendations/{hair_rec_id}/toggle-save",
+                   f"/user/hair-recommendations/{style['hair_rec_id']}/toggle-save", headers=headers)
+    if style["hairshops"]:
+        shop = random.choice(style["hairshops"])
+        await rec.call(client, "PUT", "PUT /user/hairshop-recommendations/{hairshop_rec_id}/toggle-save",
+                       f"/user/hairshop-recommendations/{shop['hairshop_rec_id']}/toggle-save", headers=headers)
+    await rec.call(client, "GET", "GET /user/hairshop-recommendations/{hair_rec_id}",
+                   f"/user/hairshop-recommendations/{style['hair_rec_id']}", headers=headers)
+    await rec.call(client, "GET", "GET /user/saved-hairstyles", "/user/saved-hairstyles", headers=headers)
+    await rec.call(client, "GET", "GET /user/saved-hairshops", "/user/saved-hairshops", headers=headers)
+    rec.phases["전체 흐름"].append(time.perf_counter() - started)
+
+
+async def drive(main_url: str, args) -> tuple:
+    rec = Recorder()
+    run_id = f"{int(time.time())}{random.randrange(1000)}"
+    users = asyncio.Queue()
+    for i in range(args.users):
+        users.put_nowait(i)
+
+    async def virtual_user(client):
+        while not users.empty():
+            index = users.get_nowait()
+            try:
+                await user_flow(client, rec, index, args, run_id)
+                rec.flows_ok += 1
+            except FlowError as e:
+                rec.flows_failed += 1
+                rec.failures[str(e)] += 1
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=main_url, timeout=args.request_timeout, limits=limits) as client:
+        started = time.perf_counter()
+        # 동시 사용자들이 한꺼번에 시작하지 않도록 --ramp 초에 걸쳐 시작
+        tasks = []
+        for i in range(args.concurrency):
+            tasks.append(asyncio.create_task(virtual_user(client)))
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.concurrency)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return rec, elapsed
+
+
+# ─────────────────────────────────────────────
+# 결과
+# ─────────────────────────────────────────────
+
+def build_report(rec: Recorder, elapsed: float, args) -> dict:
+    def summary(values):
+        return {
+            "p50_ms": round(percentile(values, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 1),
+        }
+
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("json", "baseline")},
+        "elapsed_seconds": round(elapsed, 2),
+        "flows": {"ok": rec.flows_ok, "failed": rec.flows_failed, "failures": dict(rec.failures)},
+        "routes": {
+            route: {
+                "count": len(values),
+                "errors": rec.errors[route],
+                "rps": round(len(values) / elapsed, 2),
+                **summary(values),
+                "statuses": {str(k): v for k, v in rec.statuses[route].items()},
+            }
+            for route, values in sorted(rec.latencies.items())
+        },
+        "phases": {
+            phase: {"count": len(values), **{k.replace("_ms", "_s"): round(v / 1000, 2) for k, v in summary(values).items()}}
+            for phase, values in rec.phases.items()
+        },
+    }
+
+
+def print_report(report: dict):
+    flows = report["flows"]
+    print(f"\n흐름 {flows['ok'] + flows['failed']}개 (성공 {flows['ok']}, 실패 {flows['failed']}), "
+          f"소요 {report['elapsed_seconds']}초")
+    for reason, count in flows["failures"].items():
+        print(f"  실패 {count:>4}  {reason}")
+
+    width = max(len(route) for route in report["routes"]) if report["routes"] else 10
+    print(f"\n{'route':<{width}}  {'count':>6} {'err':>5} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, r in report["routes"].items():
+        print(f"{route:<{width}}  {r['count']:>6} {r['errors']:>5} {r['rps']:>7.2f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+
+    print(f"\n{'흐름 구간':<24} {'count':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}")
+    for phase, p in report["phases"].items():
+        print(f"{phase:<24} {p['count']:>6} {p['p50_s']:>8.2f} {p['p95_s']:>8.2f} {p['p99_s']:>8.2f}")
+
+
+# 기준 결과 대비 라우트별 p95 가 tolerance 비율 이상 느려졌거나 오류가 생긴 라우트 목록
+def compare(report: dict, baseline: dict, tolerance: float, min_ms: float) -> list:
+    regressions = []
+    for route, r in report["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if base is None:
+            continue
+        if r["p95_ms"] > max(base["p95_ms"] * (1 + tolerance), base["p95_ms"] + min_ms):
+            regressions.append(f"{route}: p95 {base['p95_ms']} → {r['p95_ms']} ms")
+        if r["errors"] > base["errors"]:
+            regressions.append(f"{route}: 오류 {base['errors']} → {r['errors']}")
+    if report["flows"]["failed"] > baseline.get("flows", {}).get("failed", 0):
+        regressions.append(f"실패한 흐름 {baseline['flows']['failed']} → {report['flows']['failed']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=40, help="실행할 가상 사용자 흐름 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 진행하는 사용자 수")
+    parser.add_argument("--ramp", type=float, default=5, help="동시 사용자를 모두 시작하기까지 걸리는 시간 (초)")
+    parser.add_argument("--workers", type=int, default=1, help="Main API uvicorn 워커 수")
+    parser.add_argument("--extract-ms", type=float, default=2000)
+    parser.add_argument("--recommend-ms", type=float, default=5000)
+    parser.add_argument("--simulate-ms", type=float, default=3000, help="합성 스타일 1개당")
+    parser.add_argument("--s3-ms", type=float, default=20)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--poll-interval", type=float, default=5, help="결과/진행 상태 조회 간격 (앱 기본 5초)")
+    parser.add_argument("--flow-timeout", type=float, default=600)
+    parser.add_argument("--request-timeout", type=float, default=60)
+    parser.add_argument("--max-retries", type=int, default=5, help="analyze-face 429 재시도 횟수")
+    parser.add_argument("--max-retry-wait", type=float, default=30)
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="이전 --json 결과와 비교 (느려진 라우트가 있으면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="p95 허용 증가 비율")
+    parser.add_argument("--min-regression-ms", type=float, default=5, help="이보다 작은 p95 증가는 무시")
+    args = parser.parse_args()
+
+    prepare_database()
+    procs, stub_url, main_url, log_path = start_servers(args)
+    try:
+        wait_ready(procs, [(f"{stub_url}/loadtest/ping", 404), (f"{main_url}/readyz", 200)],
+                   args.startup_timeout, log_path)
+        print(f"Main API {main_url} (워커 {args.workers}), 대체 서버 {stub_url}, DB {os.environ['DATABASE_URL']}")
+        print(f"사용자 {args.users}명, 동시 {args.concurrency}명 실행 중...")
+        rec, elapsed = asyncio.run(drive(main_url, args))
+    finally:
+        stop_servers(procs)
+
+    report = build_report(rec, elapsed, args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance, args.min_regression_ms)
+        if regressions:
+            print("\n기준 대비 성능 저하:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n기준 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# loadtest/stubs.py
+# 부하 테스트용 하위 서비스 대체 서버 (face_extract / GraphRAG / Stable-Hair / S3 를 한 프로세스에서 제공)
+#
+#   POST /run-extract/          face_extract: 원본 이미지 다운로드 → result_table 저장 → Main /run-recommendation/ 알림
+#   POST /recommend             GraphRAG: hairstyle_table 에서 성별이 맞는 스타일 선택 → Main /save-recommendation/ 전송
+#   POST /run-stablehair        Stable-Hair: 추천 스타일별 합성 이미지 업로드 → simulation_image_url 갱신 → /notify-simulation/
+#   PUT/GET/HEAD /{bucket}/{key} S3 (경로 방식, 메모리에 저장)
+#
+# 실제 서비스와 같은 순서로 DB를 직접 쓰고 Main API를 다시 호출하므로, Main API 쪽 코드는 운영과 같은 경로를 탑니다.
+# 처리 시간은 모델 추론 대신 asyncio.sleep 으로 흉내 냅니다.
+#   LOADTEST_EXTRACT_MS=2000    얼굴 분석 1건
+#   LOADTEST_RECOMMEND_MS=5000  GraphRAG 추천 1건
+#   LOADTEST_SIMULATE_MS=3000   Stable-Hair 합성 스타일 1개당
+#   LOADTEST_S3_MS=20           S3 요청 1건
+#   LOADTEST_JITTER=0.2         평균 대비 ± 비율 (균등 분포)
+#   LOADTEST_STYLES=4           추천 스타일 수,  LOADTEST_SHOPS=10  스타일당 추천 미용실 수
+#   MAIN_API_URL=http://127.0.0.1:8000
+#
+# loadtest/run.py 가 Main API와 같은 DATABASE_URL 로 띄웁니다. 직접 실행:
+#   DATABASE_URL=sqlite:///./loadtest.db uvicorn loadtest.stubs:app --port 8100
+
+import asyncio
+import hashlib
+import io
+import os
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import httpx
+from fastapi import Body, FastAPI, Request, Response
+from PIL import Image
+from sqlalchemy import select, update
+
+from core.database import AsyncSessionLocal
+from models.hair_recommendation import HairRecommendation
+from models.hairstyle import Hairstyle
+from models.request import Request as AnalysisRequest
+from models.result import Result
+
+LATENCY_MS = {
+    "extract": float(os.getenv("LOADTEST_EXTRACT_MS", 2000)),
+    "recommend": float(os.getenv("LOADTEST_RECOMMEND_MS", 5000)),
+    "simulate": float(os.getenv("LOADTEST_SIMULATE_MS", 3000)),
+    "s3": float(os.getenv("LOADTEST_S3_MS", 20)),
+}
+JITTER = float(os.getenv("LOADTEST_JITTER", 0.2))
+STYLES = int(os.getenv("LOADTEST_STYLES", 4))
+SHOPS = int(os.getenv("LOADTEST_SHOPS", 10))
+MAIN_API_URL = os.getenv("MAIN_API_URL", "http://127.0.0.1:8000").rstrip("/")
+SELF_URL = os.getenv("LOADTEST_STUB_URL", "http://127.0.0.1:8100").rstrip("/")
+BUCKET = os.getenv("AWS_S3_BUCKET", "loadtest")
+
+FACE_TYPES = ("계란형", "둥근형", "긴형", "네모형", "하트형")
+SKIN_TONES = ("봄웜", "여름쿨", "가을웜", "겨울쿨")
+
+_objects = {}        # (bucket, key) -> (bytes, content-type)
+_styles_by_sex = {}  # 성별 -> 스타일명 목록 (hairstyle_table 은 테스트 중 바뀌지 않음)
+_client = None
+
+
+def client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=60, limits=httpx.Limits(max_connections=200))
+    return _client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    if _client is not None:
+        await _client.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+async def work(name: str, count: int = 1):
+    mean = LATENCY_MS[name] * count / 1000
+    await asyncio.sleep(max(0.0, mean * random.uniform(1 - JITTER, 1 + JITTER)))
+
+
+async def notify(path: str, payload: dict):
+    response = await client().post(f"{MAIN_API_URL}{path}", json=payload)
+    response.raise_for_status()
+
+
+# ─────────────────────────────────────────────
+# S3 (경로 방식: /{bucket}/{key})
+# ─────────────────────────────────────────────
+
+# botocore 가 체크섬 trailer 와 함께 보내는 aws-chunked 본문 해제
+def _decode_aws_chunked(body: bytes) -> bytes:
+    data, pos = bytearray(), 0
+    while True:
+        end = body.index(b"\r\n", pos)
+        size = int(body[pos:end].split(b";")[0], 16)
+        if size == 0:
+            return bytes(data)
+        data += body[end + 2:end + 2 + size]
+        pos = end + 2 + size + 2
+
+
+@app.put("/{bucket}/{key:path}")
+async def s3_put(bucket: str, key: str, request: Request):
+    body = await request.body()
+    if "aws-chunked" in request.headers.get("content-encoding", "") or "x-amz-decoded-content-length" in request.headers:
+        body = _decode_aws_chunked(body)
+    await work("s3")
+    _objects[(bucket, key)] = (body, request.headers.get("content-type", "application/octet-stream"))
+    return Response(headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+
+
+@app.api_route("/{bucket}/{key:path}", methods=["GET", "HEAD"])
+async def s3_get(bucket: str, key: str):
+    await work("s3")
+    if (bucket, key) not in _objects:
+        return Response(status_code=404)
+    body, content_type = _objects[(bucket, key)]
+    return Response(body, media_type=content_type, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+
+
+# ─────────────────────────────────────────────
+# face_extract
+# ─────────────────────────────────────────────
+
+@app.post("/run-extract/")
+async def run_extract(data: dict = Body(...)):
+    user_id, request_id = int(data["user_id"]), int(data["request_id"])
+    async with AsyncSessionLocal() as db:
+        req = (await db.execute(
+            select(AnalysisRequest).filter_by(user_id=user_id, request_id=request_id)
+        )).scalars().first()
+        if not req:
+            return {"error": "요청 정보를 찾을 수 없습니다."}
+
+    image = await client().get(req.user_image_url)
+    if image.status_code != 200:
+        return {"error": f"이미지 다운로드 실패: {image.status_code}"}
+    Image.open(io.BytesIO(image.content)).load()
+    await work("extract")
+
+    async with AsyncSessionLocal() as db:
+        db.add(Result(
+            face_type=random.choice(FACE_TYPES), skin_tone=random.choice(SKIN_TONES), forehead=req.forehead_shape,
+            sex=req.sex, top_rate="보통", middle_rate="보통", bottom_rate="보통",
+            rec_color="애쉬브라운, 다크브라운", summary="부하 테스트 분석 결과", request_id=request_id,
+            created_at=datetime.utcnow(),
+        ))
+        await db.commit()
+
+    await notify("/run-recommendation/", {"user_id": user_id, "request_id": request_id})
+    return {"message": "분석 완료 및 Main API에 알림 전송 완료"}
+
+
+# ─────────────────────────────────────────────
+# GraphRAG
+# ─────────────────────────────────────────────
+
+async def styles_for(sex: str) -> list:
+    if sex not in _styles_by_sex:
+        async with AsyncSessionLocal() as db:
+            _styles_by_sex[sex] = list((await db.execute(
+                select(Hairstyle.hairstyle_name).where(Hairstyle.hairstyle_sex == sex).distinct()
+            )).scalars())
+    return _styles_by_sex[sex]
+
+
+@app.post("/recommend")
+async def recommend(payload: dict = Body(...)):
+    await work("recommend")
+    styles = await styles_for(payload["sex"])
+    final_result = {
+        "user_info": {"user_id": int(payload["user_id"]), "request_id": int(payload["request_id"])},
+        "recommendations": [
+            {
+                "style": style,
+                "description": f"{style} 추천 이유 (부하 테스트)",
+                "hair_shops": [
+                    {
+                        "hairshop": f"{style} 미용실 {i}", "latitude": 37.5 + random.uniform(-0.05, 0.05),
+                        "longitude": 127.0 + random.uniform(-0.05, 0.05), "final_menu_price": random.randrange(15000, 80000, 1000),
+                        "review_count": random.randint(0, 3000), "mean_score": round(random.uniform(3.5, 5.0), 1),
+                    }
+                    for i in range(SHOPS)
+                ],
+            }
+            for style in random.sample(styles, min(STYLES, len(styles)))
+        ],
+    }
+    await notify("/save-recommendation/", final_result)
+    return final_result
+
+
+# ─────────────────────────────────────────────
+# Stable-Hair
+# ─────────────────────────────────────────────
+
+@app.post("/run-stablehair")
+async def run_stablehair(data: dict = Body(...)):
+    user_id, request_id = int(data["user_id"]), int(data["request_id"])
+    async with AsyncSessionLocal() as db:
+        hair_rec_ids = list((await db.execute(
+            select(HairRecommendation.hair_rec_id)
+            .where(HairRecommendation.user_id == user_id, HairRecommendation.request_id == request_id)
+        )).scalars())
+
+    for hair_rec_id in hair_rec_ids:
+        await work("simulate")
+        key = f"simulation/{user_id}_{request_id}_{hair_rec_id}.jpg"
+        await client().put(f"{SELF_URL}/{BUCKET}/{key}", content=b"\xff\xd8\xff\xd9", headers={"Content-Type": "image/jpeg"})
+        url = f"{SELF_URL}/{BUCKET}/{key}"
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(HairRecommendation)
+                .where(HairRecommendation.hair_rec_id == hair_rec_id)
+                .values(simulation_image_url=url)
+            )
+            await db.commit()
+        await notify("/notify-simulation/", {
+            "user_id": user_id, "request_id": request_id, "hair_rec_id": hair_rec_id, "simulation_image_url": url,
+        })
+    return {"message": "합성 완료", "count": len(hair_rec_ids)}
@@ -1,13 +1,60 @@
 # Backend/main.py
+import time
+
+# 워커 시작 시간 측정 기준 (/healthz, /readyz 의 import_seconds, ready_seconds)
+IMPORT_STARTED = time.monotonic()
+
+import logging
+from contextlib import asynccontextmanager
+
+from core.logging_config import setup_logging
+
+# 다른 모듈의 import 시점 로그도 큐 핸들러를 거치도록 가장 먼저 설정
+setup_logging()
+
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from routers import auth, user, styles, salons
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from routers import auth, user, styles, salons, events, pipeline, metrics, health
 from routers.analyze import router as analyze_router
-from core.database import engine, Base, get_db
+from core.database import get_db, async_engine, async_replica_engine, warm_pool
+from core.migrations import run_migrations, DB_AUTO_MIGRATE
+from core.orchestrator import orchestrator, PIPELINE_ENABLED
+from core.http_client import close_clients
+from core.hairstyle_catalog import hairstyle_catalog
+from core.salon_index import salon_index
+from core.response_cache import start_invalidation_listener, stop_invalidation_listener
+from core.pubsub import check_broker_for_workers
+from core.password import configure_password_hashing
+from core.metrics import MetricsMiddleware
+from core.db_routing import ReadYourWritesMiddleware
+from core.fast_json import GZIP_MIN_SIZE, GZIP_LEVEL
+from core.warmup import warmup
 from sqlalchemy import text
 import models
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+# 서버 시작 시에는 준비 작업을 백그라운드로 띄우기만 하고 바로 요청을 받음
+# (DB가 느리거나 잠시 끊겨 있어도 워커가 뜨고, 준비 상태는 GET /readyz 로 확인)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_broker_for_workers()
+    # 다른 워커의 응답 캐시 무효화 수신
+    start_invalidation_listener()
+    warmup.start()
+    yield
+    await warmup.stop()
+    await stop_invalidation_listener()
+    await orchestrator.stop()
+    await close_clients()
+    # 풀 커넥션 정리 (aiosqlite는 커넥션마다 스레드를 두므로 닫지 않으면 프로세스가 종료되지 않음)
+    await async_engine.dispose()
+    if async_replica_engine is not async_engine:
+        await async_replica_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 origins = [
@@ -31,8 +78,47 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 큰 목록 응답 gzip 압축 (GZIP_MIN_SIZE 바이트 이상, 클라이언트가 Accept-Encoding: gzip 을 보낸 경우)
+if GZIP_MIN_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
+# 사용자 데이터를 바꾼 응답에 X-Last-Write 헤더 추가 (앱이 다음 조회에 돌려보내 기본 DB에서 읽도록)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# 라우트별 응답 시간 / 처리 중 요청 / 요청별 DB 쿼리 수 (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# ─────────────────────────────────────────────
+# 서버 준비 단계 (core/warmup.py, 필수 단계가 모두 끝나야 /readyz 200)
+# ─────────────────────────────────────────────
+
+# 데이터베이스 스키마 마이그레이션 또는 연결 확인 (다른 단계보다 먼저 실행)
+async def prepare_database():
+    if DB_AUTO_MIGRATE:
+        await run_in_threadpool(run_migrations)
+    else:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+# 분석 파이프라인 워커 시작 (진행 상태는 DB에 있으므로 재시작 후 이어서 처리)
+async def start_pipeline():
+    if PIPELINE_ENABLED:
+        await orchestrator.start()
+
+# 첫 요청들이 연결 수립을 기다리지 않도록 커넥션 풀 미리 채우기
+async def warm_connection_pools():
+    await warm_pool(async_engine)
+    if async_replica_engine is not async_engine:
+        await warm_pool(async_replica_engine)
+
+warmup.add("database", prepare_database, first=True)
+warmup.add("pipeline", start_pipeline)
+# 카탈로그 / 공간 인덱스는 추천 저장, 미용실 검색에 필요하므로 필수 단계
+warmup.add("hairstyle_catalog", hairstyle_catalog.refresh)
+warmup.add("salon_index", salon_index.refresh)
+# 실패해도 요청 처리는 가능한 단계 (풀은 요청 시 채워지고, bcrypt는 기본 비용 사용)
+warmup.add("connection_pool", warm_connection_pools, required=False)
+warmup.add("password_hashing", configure_password_hashing, required=False)
 
 # 루트 경로 추가
 @app.get("/")
@@ -54,6 +140,12 @@ app.include_router(user.router)
 app.include_router(styles.router)
 app.include_router(salons.router)
 app.include_router(analyze_router)
+app.include_router(events.router)
+app.include_router(pipeline.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
+
+warmup.mark_imported(IMPORT_STARTED)
 
 if __name__ == "__main__":
     import uvicorn
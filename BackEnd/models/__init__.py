@@ -4,4 +4,7 @@ from .result import *
 from .hairstyle import *
 from .hair_recommendation import *
 from .hairshop import *
-from .hairshop_recommendation import *
\ No newline at end of file
+from .hairshop_recommendation import *
+from .pipeline_job import *
+from .recommendation_ingest import *
+from .request_fingerprint import *
\ No newline at end of file
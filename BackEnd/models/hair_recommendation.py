@@ -1,14 +1,15 @@
 # models/hair_recommendation.py
 # 어떤 요청에 대해 어떤 스타일을 추천했는지 기록
 
-from sqlalchemy import Column, BigInteger, String, Text, Boolean, DateTime, ForeignKey, Integer, Float, Text
-from core.database import Base
+from sqlalchemy import Column, BigInteger, String, Text, Boolean, DateTime, ForeignKey, Integer, Float, Text, Index
+from sqlalchemy.orm import relationship
+from core.database import Base, BigIntPK
 from datetime import datetime
 
 class HairRecommendation(Base):
     __tablename__ = "hair_recommendation_table"
 
-    hair_rec_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    hair_rec_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
     simulation_image_url = Column(Text, nullable=False)
     hair_name = Column(String(20), nullable=True)
     description = Column(Text, nullable=True)
@@ -17,4 +18,18 @@ class HairRecommendation(Base):
     # 외래키 연결
     request_id = Column(BigInteger, ForeignKey("request_table.request_id"), nullable=False)
     hair_id = Column(BigInteger, ForeignKey("hairstyle_table.hair_id"), nullable=False)
-    user_id = Column(BigInteger, ForeignKey("user_table.user_id"), nullable=False)
\ No newline at end of file
+    user_id = Column(BigInteger, ForeignKey("user_table.user_id"), nullable=False)
+
+    # 추천 미용실 (리뷰수 내림차순, /user/hairshop-recommendations 와 같은 순서)
+    hairshops = relationship(
+        "HairshopRecommendation",
+        viewonly=True,
+        order_by="[HairshopRecommendation.review_count.desc(), HairshopRecommendation.hairshop_rec_id.desc()]"
+    )
+
+    __table_args__ = (
+        # 요청별 추천 스타일 조회: WHERE request_id AND user_id
+        Index("ix_hair_rec_request_user", "request_id", "user_id"),
+        # 저장한 스타일 조회: WHERE user_id AND is_saved
+        Index("ix_hair_rec_user_saved", "user_id", "is_saved"),
+    )
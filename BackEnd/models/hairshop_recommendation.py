@@ -1,21 +1,29 @@
 # models/hairshop_recommendation.py
 # 어떤 추천 결과에 대해 어떤 미용실을 추천했는지 저장
 
-from sqlalchemy import Column, BigInteger, Boolean, DateTime, ForeignKey, Integer, Float, Text
-from core.database import Base
+from sqlalchemy import Column, BigInteger, Boolean, DateTime, ForeignKey, Integer, Float, Text, Index, text
+from core.database import Base, BigIntPK
 from datetime import datetime
 
 class HairshopRecommendation(Base):
     __tablename__ = "hairshop_recommendation_table"
 
-    hairshop_rec_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    hairshop_rec_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
     hairshop = Column(Text, nullable=False)
     is_saved = Column(Integer, default=0)
     latitude = Column(Float)
     longitude = Column(Float)
     final_menu_price = Column(Integer)
-    review_count = Column(Integer)
+    # 키셋 페이지네이션 정렬 키라 NULL 없이 유지 (마이그레이션 5)
+    review_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
     mean_score = Column(Float)
 
     hair_rec_id = Column(BigInteger, ForeignKey("hair_recommendation_table.hair_rec_id"), nullable=False)
     user_id = Column(BigInteger, ForeignKey("user_table.user_id"), nullable=False)
+
+    __table_args__ = (
+        # 스타일별 추천 미용실: WHERE hair_rec_id ORDER BY review_count DESC
+        Index("ix_hairshop_rec_hair_rec_review", "hair_rec_id", "review_count"),
+        # 저장한 미용실 조회: WHERE user_id AND is_saved
+        Index("ix_hairshop_rec_user_saved", "user_id", "is_saved"),
+    )
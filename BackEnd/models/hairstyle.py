@@ -2,12 +2,12 @@
 # 추천할 수 있는 헤어스타일 목록 저장
 
 from sqlalchemy import Column, BigInteger, String, Text
-from core.database import Base
+from core.database import Base, BigIntPK
 
 class Hairstyle(Base):
     __tablename__ = "hairstyle_table"
 
-    hair_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    hair_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
     hairstyle_name = Column(String(20), nullable=False)
     hairstyle_image_url = Column(Text, nullable=False)
     # hairstyle_explanation = Column(Text)
@@ -0,0 +1,29 @@
+# models/pipeline_job.py
+# 분석 요청 1건의 파이프라인 진행 상태 (extract → recommend → simulate → done)
+
+from sqlalchemy import Column, BigInteger, String, Text, DateTime, ForeignKey, Integer, Index
+from core.database import Base, BigIntPK
+from datetime import datetime
+
+class PipelineJob(Base):
+    __tablename__ = "pipeline_job_table"
+
+    job_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
+    stage = Column(String(20), nullable=False)                  # extract / recommend / simulate / done
+    status = Column(String(20), nullable=False, default="queued")  # queued / running / failed / done
+    attempts = Column(Integer, nullable=False, default=0)       # 현재 단계 시도 횟수
+    last_error = Column(Text)
+    next_run_at = Column(DateTime, default=datetime.utcnow)     # 재시도 백오프 이후 실행 가능 시각
+    locked_until = Column(DateTime)                             # 실행 중 임대 만료 시각 (서버 재시작 시 회수)
+    enqueued_at = Column(DateTime, default=datetime.utcnow)     # 현재 단계 대기 시작 시각
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # 외래키: 요청 ID (요청당 작업 1개), 사용자 ID
+    request_id = Column(BigInteger, ForeignKey("request_table.request_id"), nullable=False, unique=True)
+    user_id = Column(BigInteger, ForeignKey("user_table.user_id"), nullable=False)
+
+    __table_args__ = (
+        # 워커의 작업 선점 쿼리: stage + status + next_run_at
+        Index("ix_pipeline_job_stage_status_next_run", "stage", "status", "next_run_at"),
+    )
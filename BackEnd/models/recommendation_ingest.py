@@ -0,0 +1,16 @@
+# models/recommendation_ingest.py
+# GraphRAG 추천 결과 수신 기록 (요청당 1행, 같은 payload 재전송을 무시하기 위한 멱등 키)
+
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Integer
+from core.database import Base
+from datetime import datetime
+
+class RecommendationIngest(Base):
+    __tablename__ = "recommendation_ingest_table"
+
+    # 외래키: 요청 ID (요청당 1행)
+    request_id = Column(BigInteger, ForeignKey("request_table.request_id"), primary_key=True, autoincrement=False)
+    payload_hash = Column(String(64), nullable=False)   # 마지막으로 반영한 payload의 sha256
+    applied_count = Column(Integer, nullable=False, default=1)  # 내용이 달라 실제로 반영한 횟수
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,14 +1,15 @@
 # models/request.py
 # 사용자 설문 + 이미지 분석 요청 저장
 
-from sqlalchemy import Column, BigInteger, String, Text, DateTime, ForeignKey, Integer
-from core.database import Base
+from sqlalchemy import Column, BigInteger, String, Text, DateTime, ForeignKey, Integer, Index
+from sqlalchemy.orm import relationship
+from core.database import Base, BigIntPK
 from datetime import datetime
 
 class Request(Base):
     __tablename__ = "request_table"
 
-    request_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    request_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
     user_image_url = Column(Text, nullable=False)
     hair_length = Column(String(20), nullable=False)
     hair_type = Column(String(20), nullable=False)
@@ -24,3 +25,14 @@ class Request(Base):
 
     # 외래키: 사용자 ID
     user_id = Column(BigInteger, ForeignKey("user_table.user_id"), nullable=False)
+
+    # 결과 화면 일괄 조회용 (쓰기는 각 테이블에서 직접 수행)
+    results = relationship("Result", viewonly=True, order_by="Result.result_id")
+    hair_recommendations = relationship(
+        "HairRecommendation", viewonly=True, order_by="HairRecommendation.hair_rec_id"
+    )
+
+    __table_args__ = (
+        # 사용자별 최근 요청 조회: WHERE user_id ORDER BY created_at DESC
+        Index("ix_request_user_created", "user_id", "created_at"),
+    )
@@ -0,0 +1,23 @@
+# models/request_fingerprint.py
+# 분석 요청의 이미지/설문 해시 (같은 사진 + 같은 설문 재요청 시 이전 결과 복제용, 요청당 1행)
+
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Index
+from core.database import Base
+from datetime import datetime
+
+class RequestFingerprint(Base):
+    __tablename__ = "request_fingerprint_table"
+
+    # 외래키: 요청 ID (요청당 1행), 사용자 ID
+    request_id = Column(BigInteger, ForeignKey("request_table.request_id"), primary_key=True, autoincrement=False)
+    user_id = Column(BigInteger, ForeignKey("user_table.user_id"), nullable=False)
+    image_sha256 = Column(String(64), nullable=False)   # 보정/재인코딩한 JPEG 바이트의 sha256
+    image_phash = Column(String(16), nullable=False)    # 64비트 dHash (16진수), 재압축/크기 변경에도 같은 값
+    survey_hash = Column(String(64), nullable=False)    # 설문 항목의 sha256
+    cloned_from = Column(BigInteger)                    # 이전 요청 결과를 복제한 경우 원본 request_id
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # 중복 요청 조회: WHERE user_id AND survey_hash AND image_phash
+        Index("ix_request_fingerprint_lookup", "user_id", "survey_hash", "image_phash"),
+    )
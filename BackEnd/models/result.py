@@ -1,14 +1,14 @@
 # models/result.py
 # 얼굴형, 피부톤 등 분석 결과 저장
 
-from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey
-from core.database import Base
+from sqlalchemy import Column, BigInteger, String, DateTime, ForeignKey, Index
+from core.database import Base, BigIntPK
 from datetime import datetime
 
 class Result(Base):
     __tablename__ = "result_table"
 
-    result_id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    result_id = Column(BigIntPK, primary_key=True, index=True, autoincrement=True)
     face_type = Column(String(20), nullable=False)
     skin_tone = Column(String(20), nullable=False)
     forehead = Column(String(20), nullable=False)
@@ -22,3 +22,8 @@ class Result(Base):
 
     # 외래키: 요청 ID
     request_id = Column(BigInteger, ForeignKey("request_table.request_id"), nullable=False)
+
+    __table_args__ = (
+        # 요청별 분석 결과 조회
+        Index("ix_result_request", "request_id"),
+    )
@@ -2,11 +2,12 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel, EmailStr
 from jose import jwt
 from datetime import datetime, timedelta
-from passlib.hash import bcrypt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # DB 세션 및 사용자 모델 import
-from core.database import get_db
+from core.database import get_async_db
+from core.password import hash_password, verify_password
 from models.user import User
 
 # JWT 기반 사용자 인증 의존성
@@ -44,17 +45,17 @@ class TokenResponse(BaseModel):
 # 회원가입 API
 # ─────────────────────────────────────────────
 @router.post("/signup")
-def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(request: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     # 이미 등록된 이메일인지 확인
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = (await db.execute(select(User).where(User.email == request.email))).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 가입된 이메일입니다."
         )
 
-    # 비밀번호 해싱
-    hashed_password = bcrypt.hash(request.password)
+    # 비밀번호 해싱 (CPU 작업이므로 전용 해시 풀에서 실행)
+    hashed_password = await hash_password(request.password)
 
     # 새로운 사용자 객체 생성
     new_user = User(
@@ -65,8 +66,8 @@ def signup(request: SignupRequest, db: Session = Depends(get_db)):
 
     # DB에 저장
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return {"success": True, "user_id": new_user.user_id}
 
@@ -74,17 +75,25 @@ def signup(request: SignupRequest, db: Session = Depends(get_db)):
 # 로그인 API
 # ─────────────────────────────────────────────
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     # 사용자를 이메일로 조회
-    user = db.query(User).filter(User.email == request.email).first()
+    user = (await db.execute(select(User).where(User.email == request.email))).scalars().first()
 
     # 사용자 존재 여부 및 비밀번호 확인
-    if not user or not bcrypt.verify(request.password, user.password):
+    verified, new_hash = (False, None)
+    if user:
+        verified, new_hash = await verify_password(request.password, user.password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="잘못된 로그인 정보입니다."
         )
 
+    # 해시 비용(rounds)이 바뀐 경우 로그인 시점에 새 비용으로 다시 저장
+    if new_hash:
+        user.password = new_hash
+        await db.commit()
+
     # JWT 토큰 생성
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     payload = {
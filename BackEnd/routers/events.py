@@ -0,0 +1,84 @@
+# routers/events.py
+# 분석/추천/합성 완료 이벤트를 WebSocket으로 푸시 (클라이언트 5초 폴링 대체)
+
+import asyncio
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Query
+from sqlalchemy import select
+
+from core.database import AsyncSessionLocal
+from core.pubsub import broker, request_channel
+from core.recommendation import DUMMY_SIMULATION_URL
+from core.security import decode_jwt
+from models.request import Request
+from models.result import Result
+from models.hair_recommendation import HairRecommendation
+
+router = APIRouter()
+
+# 구독 시점에 이미 완료된 단계 이벤트 생성 (구독 전에 발행된 이벤트 유실 방지)
+async def current_events(db, user_id: int, request_id: int):
+    events = []
+
+    has_result = (await db.execute(
+        select(Result.result_id).where(Result.request_id == request_id).limit(1)
+    )).first()
+    if has_result:
+        events.append({"event": "result_ready", "request_id": request_id})
+
+    recs = (await db.execute(
+        select(HairRecommendation.hair_rec_id, HairRecommendation.simulation_image_url).where(
+            HairRecommendation.request_id == request_id,
+            HairRecommendation.user_id == user_id
+        )
+    )).all()
+    if recs:
+        events.append({"event": "recommendations_ready", "request_id": request_id, "count": len(recs)})
+    for hair_rec_id, simulation_image_url in recs:
+        if simulation_image_url and simulation_image_url != DUMMY_SIMULATION_URL:
+            events.append({
+                "event": "simulation_ready",
+                "request_id": request_id,
+                "hair_rec_id": hair_rec_id,
+                "simulation_image_url": simulation_image_url
+            })
+    return events
+
+# request_id별 진행 상황 구독
+# React Native WebSocket은 헤더 지정이 번거로워 토큰을 쿼리 파라미터로 받음
+@router.websocket("/ws/requests/{request_id}")
+async def request_events(websocket: WebSocket, request_id: int, token: str = Query(...)):
+    try:
+        payload = decode_jwt(token)
+        user_id = int(payload.get("sub", 0))
+    except (HTTPException, ValueError):
+        await websocket.close(code=1008)
+        return
+
+    async with AsyncSessionLocal() as db:
+        req = (await db.execute(
+            select(Request.request_id).where(Request.request_id == request_id, Request.user_id == user_id)
+        )).first()
+    if not req:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+
+    async with broker.subscribe(request_channel(request_id)) as queue:
+        async with AsyncSessionLocal() as db:
+            for event in await current_events(db, user_id, request_id):
+                await websocket.send_json(event)
+
+        async def forward():
+            while True:
+                await websocket.send_json(await queue.get())
+
+        forward_task = asyncio.create_task(forward())
+        try:
+            # 클라이언트 메시지는 사용하지 않음 (연결 종료 감지용)
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            forward_task.cancel()
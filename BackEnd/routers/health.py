@@ -0,0 +1,19 @@
+# routers/health.py
+# 워커 상태 확인 (로드밸런서 / 컨테이너 헬스체크용)
+#   GET /healthz : 프로세스가 요청을 받을 수 있으면 항상 200 (liveness)
+#   GET /readyz  : 서버 준비 단계(core/warmup.py)가 모두 끝나면 200, 아니면 503 (readiness)
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from core.warmup import warmup
+
+router = APIRouter()
+
+@router.get("/healthz", include_in_schema=False)
+def healthz():
+    return {"status": "ok", **warmup.timings()}
+
+@router.get("/readyz", include_in_schema=False)
+def readyz():
+    return JSONResponse(warmup.snapshot(), status_code=200 if warmup.ready else 503)
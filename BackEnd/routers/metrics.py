@@ -0,0 +1,15 @@
+# routers/metrics.py
+# Prometheus 수집용 지표 (라우트별 응답 시간/처리 중 요청, 요청별 DB 쿼리, 하위 서비스 호출, 분석 요청 수락 제어)
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.metrics import registry
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
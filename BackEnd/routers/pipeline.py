@@ -0,0 +1,42 @@
+# routers/pipeline.py
+# 분석 파이프라인 상태 조회 (단계별 대기열 길이, 지연 시간)
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.admission import admission
+from core.database import get_async_db
+from core.orchestrator import orchestrator, get_job
+from core.http_client import http_stats
+from core.security import get_current_user
+
+router = APIRouter()
+
+# 단계별 대기/실행/실패 건수 + 최근 실행 시간·대기 시간 (p50/p95/max)
+# downstream: 하위 서비스별 서킷 상태, 오류/재시도 수, 응답 시간 히스토그램
+# admission: /analyze-face 수락/거절 수, 사용자 한도, 대기열 위치와 예상 대기 시간
+@router.get("/pipeline/stats")
+async def get_pipeline_stats():
+    stats = await orchestrator.snapshot()
+    stats["downstream"] = http_stats()
+    stats["admission"] = admission.snapshot()
+    return stats
+
+# 내 요청의 현재 진행 단계
+@router.get("/pipeline/jobs/{request_id}")
+async def get_pipeline_job(
+    request_id: int,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await get_job(db, request_id)
+    if not job or job.user_id != current_user["user_id"]:
+        raise HTTPException(status_code=404, detail="해당 요청의 작업을 찾을 수 없습니다.")
+    return {
+        "request_id": job.request_id,
+        "stage": job.stage,
+        "status": job.status,
+        "attempts": job.attempts,
+        "last_error": job.last_error,
+        "updated_at": job.updated_at,
+    }
@@ -1,11 +1,13 @@
 # routers/salons.py
 # 스타일 기반 미용실 추천 조회, 미용실 추천 저장 기록
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 from core.security import get_current_user
+from core.hairstyle_catalog import hairstyle_catalog
+from core.salon_index import salon_index
 
 router = APIRouter()
 
@@ -20,35 +22,47 @@ class Hairshop(BaseModel):
     latitude: Optional[str]
     longitude: Optional[str]
 
+class NearbyHairshop(Hairshop):
+    distance_m: float
+    review_count: int
+    mean_score: float
+
+SALON_SEARCH_MAX_RADIUS_KM = 50
+SALON_SEARCH_MAX_K = 50
+
 # 스타일별 미용실 추천
-@router.get("/styles/{style_id}/salons", response_model=List[Hairshop])
+# 해당 스타일을 하는 미용실 중 (lat, lon) 반경 radius_km 안에서 거리/리뷰 수/평점 점수 상위 k곳 (core/salon_index)
+@router.get("/styles/{style_id}/salons", response_model=List[NearbyHairshop])
 async def get_salons_by_style(
     style_id: int,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(3, gt=0, le=SALON_SEARCH_MAX_RADIUS_KM),
+    k: int = Query(10, ge=1, le=SALON_SEARCH_MAX_K),
     current_user: dict = Depends(get_current_user)
 ):
-    salons = [
-        {
-            "hairshop_id": 1,
-            "hairshop_name": "살롱드파리",
-            "address": "서울시 강남구",
-            "menu": "컷 15000원",
-            "phone": "02-1234-5678",
-            "intro": "고급 헤어살롱",
-            "latitude": "37.4980",
-            "longitude": "127.0276"
-        },
+    await hairstyle_catalog.ensure_fresh()
+    style_name = hairstyle_catalog.name_of(style_id)
+    if style_name is None:
+        raise HTTPException(status_code=404, detail="헤어스타일을 찾을 수 없습니다.")
+
+    await salon_index.ensure_fresh()
+    return [
         {
-            "hairshop_id": 2,
-            "hairshop_name": "이철헤어커커",
-            "address": "서울시 마포구",
-            "menu": "컷 17000원",
-            "phone": "02-9876-5432",
-            "intro": "세련된 디자인 전문",
-            "latitude": "37.5500",
-            "longitude": "126.9100"
+            "hairshop_id": salon.hairshop_id,
+            "hairshop_name": salon.hairshop_name,
+            "address": salon.address,
+            "menu": salon.menu,
+            "phone": salon.phone,
+            "intro": salon.intro,
+            "latitude": salon.latitude,
+            "longitude": salon.longitude,
+            "distance_m": round(distance, 1),
+            "review_count": salon.review_count,
+            "mean_score": salon.mean_score,
         }
+        for salon, distance in salon_index.nearest(style_name, lat, lon, radius_km * 1000, k)
     ]
-    return salons
 
 # 사용자의 추천 미용실 저장 기록 (hairshop_recommendation_table 대응)
 @router.post("/user/salons")
@@ -1,10 +1,12 @@
 # routers/styles.py
 # 사용자의 스타일 조회, 시뮬레이션, 추천 저장
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Query
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional
 from datetime import datetime
 from core.security import get_current_user
+from core.hairstyle_catalog import hairstyle_catalog
+from core.style_search import style_search
 
 router = APIRouter()
 
@@ -14,43 +16,60 @@ class Hairstyle(BaseModel):
     hairstyle_name: str
     hairstyle_image_url: str
     hairstyle_explanation: Optional[str] = None
+    hairstyle_sex: Optional[str] = None
+    hairstyle_length: Optional[str] = None
+    hairstyle_type: Optional[str] = None
+    hairstyle_face: Optional[str] = None
+
+class StyleSearchResponse(BaseModel):
+    total: int
+    items: List[Hairstyle]
+    # 현재 검색 결과 안에서 필터 값별 개수 (예: {"sex": {"남성": 12, "여성": 30}})
+    facets: Dict[str, Dict[str, int]]
 
 class SimulationResponse(BaseModel):
     image_url: str
     success: bool
 
-# 스타일 리스트 조회
-@router.get("/styles", response_model=List[Hairstyle])
+STYLE_PAGE_MAX = 100
+
+# 스타일 리스트 조회 (hairstyle_table 메모리 검색 인덱스, core/style_search)
+# - search: 이름 접두/부분 일치, 입력 중인 글자("맆"), 초성("ㄹㅍ")
+# - sex/length/type/face: 필터
+# - sort: name(이름순) / latest(최신순) / oldest(등록순) / relevance(검색어 일치도, 검색어가 있을 때 기본값)
+@router.get("/styles", response_model=StyleSearchResponse)
 async def get_styles(
     search: Optional[str] = None,
-    sort: Optional[str] = None
+    sort: Optional[Literal["name", "latest", "oldest", "relevance"]] = None,
+    sex: Optional[str] = None,
+    length: Optional[str] = None,
+    type: Optional[str] = None,
+    face: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=STYLE_PAGE_MAX)
 ):
-    styles = [
-        {
-            "hair_id": 1,
-            "hairstyle_name": "댄디컷",
-            "hairstyle_image_url": "https://example.com/styles/dandy.jpg",
-            "hairstyle_explanation": "깔끔하고 단정한 스타일"
-        },
-        {
-            "hair_id": 2,
-            "hairstyle_name": "리프컷",
-            "hairstyle_image_url": "https://example.com/styles/leaf.jpg",
-            "hairstyle_explanation": "자연스러운 층낸 스타일"
-        }
-    ]
-
-    # 검색 필터링
-    if search:
-        styles = [s for s in styles if search.lower() in s["hairstyle_name"].lower()]
-
-    # 정렬 옵션 적용
-    if sort == "latest":
-        styles.reverse()
-    elif sort == "name":
-        styles.sort(key=lambda x: x["hairstyle_name"])
-
-    return styles
+    await hairstyle_catalog.ensure_fresh()
+    total, hairstyles, facets = style_search.search(
+        search,
+        {"sex": sex, "length": length, "type": type, "face": face},
+        sort, skip, limit,
+    )
+    return {
+        "total": total,
+        "items": [
+            {
+                "hair_id": h.hair_id,
+                "hairstyle_name": h.hairstyle_name,
+                "hairstyle_image_url": h.hairstyle_image_url,
+                "hairstyle_sex": h.hairstyle_sex,
+                "hairstyle_length": h.hairstyle_length,
+                "hairstyle_type": h.hairstyle_type,
+                "hairstyle_face": h.hairstyle_face,
+            }
+            for h in hairstyles
+        ],
+        "facets": facets,
+    }
 
 # 스타일 시뮬레이션 (특정 스타일 ID)
 @router.get("/styles/{style_id}/simulate", response_model=SimulationResponse)
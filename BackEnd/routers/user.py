@@ -1,24 +1,35 @@
 # routers/user.py
 # 사용자 관련 API: 스타일 추천, 미용실 추천, 얼굴 분석 요청
 
-from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, BackgroundTasks, Query
-from pydantic import BaseModel
-from typing import List, Optional
+import logging
+
+from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, Query
+from fastapi import Request as HTTPRequest
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from core.security import get_current_user  # 공통 인증 모듈 사용
-import os
-import boto3
-from botocore.exceptions import NoCredentialsError
-import uuid
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.request import Request
-from core.database import get_db
+from models.request_fingerprint import RequestFingerprint
+from core.admission import admission
+from core.database import get_async_db
+from core.db_routing import get_async_read_db
+from core.fast_json import FastJSONResponse, RowSerializer
+from core.orchestrator import enqueue_job
+from core.pagination import encode_cursor, decode_cursor
+from core.request_dedup import ANALYSIS_DEDUP_ENABLED, clone_request, find_duplicate, image_fingerprint, survey_hash
+from core.response_cache import cached_response, invalidate, request_scope, saved_scope
+from core.saved_items import HAIR, HAIRSHOP, apply_saved, toggle_saved
+from core.storage import prepare_image, upload_bytes, run_in_image_pool, InvalidImageError
 from datetime import datetime
-import requests
 from models.result import Result
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select, or_, and_
+from sqlalchemy.orm import joinedload, selectinload
 from models.hair_recommendation import HairRecommendation
 from models.hairshop_recommendation import HairshopRecommendation
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # 응답 모델 정의 (ERD 기준 필드명 반영)
@@ -54,25 +65,6 @@ class UserInfoResponse(BaseModel):
     name: str
     email: str
 
-# face_extract 호출 함수 정의
-def trigger_face_extract(user_id, request_id):
-    try:
-        # [개발용] Docker 내부 통신 주소 사용
-        # res = requests.post(
-        #     "http://extract_face:8001/run-extract/",
-        #     json={"user_id": user_id, "request_id": request_id},
-        #     timeout=5
-        # )
-        # # [운영용] EC2 고정 IP 사용 시 아래로 교체
-        res = requests.post(
-            "http://43.201.129.41:8001/run-extract/",
-            json={"user_id": user_id, "request_id": request_id},
-            timeout=5
-        )
-        print(f"[INFO] face_extract 응답: {res.status_code}, {res.text}")
-    except Exception as e:
-        print(f"[ERROR] face_extract 호출 실패: {e}")
-
 # 사용자별 추천 스타일 조회
 @router.get("/user/hairstyles", response_model=List[Style])
 def get_user_styles(current_user: dict = Depends(get_current_user)):
@@ -107,35 +99,9 @@ def get_user_hairshops(current_user: dict = Depends(get_current_user)):
         }
     ]
 
-# S3 업로드 함수
-def upload_image_to_s3(file, bucket, region, access_key, secret_key, filename=None):
-    s3 = boto3.client(
-        's3',
-        aws_access_key_id=access_key,
-        aws_secret_access_key=secret_key,
-        region_name=region
-    )
-    if filename is None:
-        filename = f"user_images/{uuid.uuid4()}_{file.filename}"
-    if "YOUR_ACCESS_KEY" in access_key:
-        print("[WARN] S3 접근 키가 .env에 지정되지 않았습니다.")    
-
-    try:
-        s3.upload_fileobj(
-            file.file,
-            bucket,
-            filename,
-            ExtraArgs={"ContentType": file.content_type}
-        )
-        url = f"https://{bucket}.s3.{region}.amazonaws.com/{filename}"
-        return url
-    except NoCredentialsError:
-        raise Exception("AWS credentials not available")
-
 # 얼굴 분석 요청 (설문 + 이미지)
 @router.post("/analyze-face")
 async def analyze_face(
-    background_tasks: BackgroundTasks,
     hair_length: str = Form(...),
     hair_type: str = Form(...),
     sex: str = Form(...),
@@ -147,9 +113,55 @@ async def analyze_face(
     difficulty: str = Form(...),
     has_bangs: str = Form(...),
     image: UploadFile = File(...),
+    reanalyze: bool = Form(False),  # true면 같은 사진/설문의 이전 결과가 있어도 새로 분석
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    user_id = current_user["user_id"]
+    survey = dict(
+        hair_length=hair_length, hair_type=hair_type, sex=sex, location=location, cheekbone=cheekbone,
+        mood=mood, dyed=dyed, forehead_shape=forehead_shape, difficulty=difficulty, has_bangs=has_bangs,
+    )
+
+    # 0. EXIF 회전 보정 + 축소 + JPEG 재인코딩 (요청 행 생성 전에 이미지 유효성 확인)
+    try:
+        image_buffer = await run_in_image_pool(prepare_image, image.file)
+    except InvalidImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    image_sha256, image_phash = await run_in_image_pool(image_fingerprint, image_buffer)
+    fingerprint = dict(image_sha256=image_sha256, image_phash=image_phash, survey_hash=survey_hash(survey))
+
+    # 0-1. 같은 사진 + 같은 설문으로 완료된 이전 요청이 있으면 결과를 복제 (파이프라인 실행 없음)
+    if ANALYSIS_DEDUP_ENABLED and not reanalyze:
+        try:
+            source = await find_duplicate(db, user_id, fingerprint)
+            if source is not None:
+                req = await clone_request(db, source, survey, fingerprint)
+                await db.commit()
+                await invalidate(request_scope(user_id, req.request_id))
+                logger.info("중복 분석 요청 결과 복제", extra={"request_id": req.request_id, "cloned_from": source.request_id})
+                return {
+                    "success": True,
+                    "message": "같은 사진과 설문의 이전 분석 결과를 불러왔습니다.",
+                    "data": {
+                        "user_id": user_id,
+                        "request_id": req.request_id,
+                        "image_url": req.user_image_url,
+                        "cloned_from": source.request_id,
+                    }
+                }
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail=f"요청 처리 중 오류가 발생했습니다: {str(e)}"
+            )
+
+    # 0-2. 사용자 한도 / 파이프라인 포화 확인 (초과 시 429)
+    ticket = await admission.admit(user_id)
+
+    # 작업 등록이 커밋되기 전에 끝나면 (예외, 클라이언트 연결 끊김으로 인한 CancelledError 포함) 자리 반환
+    enqueued = False
     try:
         # 1. request_table에 임시 저장 (user_image_url은 빈 값)
         req = Request(
@@ -168,27 +180,22 @@ async def analyze_face(
             has_bangs=has_bangs
         )
         db.add(req)
-        db.commit()
-        db.refresh(req)
-
-        # 2. S3에 업로드 (user_image_dic/{user_id}_{request_id}.png)
-        filename = f"user_image_dic/{current_user['user_id']}_{req.request_id}.png"
-        s3_url = upload_image_to_s3(
-            image,
-            bucket=os.getenv("AWS_S3_BUCKET", "YOUR_BUCKET_NAME"),
-            region=os.getenv("AWS_S3_REGION", "YOUR_REGION"),
-            access_key=os.getenv("AWS_ACCESS_KEY_ID", "YOUR_ACCESS_KEY"),
-            secret_key=os.getenv("AWS_SECRET_ACCESS_KEY", "YOUR_SECRET_KEY"),
-            filename=filename
-        )
+        await db.commit()
+        await db.refresh(req)
 
-        # 3. user_image_url 업데이트
-        req.user_image_url = s3_url
-        db.commit()
-        db.refresh(req)
+        # 2. S3에 업로드 (user_image_dic/{user_id}_{request_id}.jpg)
+        # boto3 업로드는 블로킹 호출이므로 이미지 전용 스레드풀에서 실행
+        filename = f"user_image_dic/{current_user['user_id']}_{req.request_id}.jpg"
+        s3_url = await run_in_image_pool(upload_bytes, image_buffer, filename)
 
-        # 백그라운드 작업 등록
-        background_tasks.add_task(trigger_face_extract, current_user["user_id"], req.request_id)
+        # 3. user_image_url 업데이트 + 파이프라인 작업 등록 (extract → recommend → simulate)
+        req.user_image_url = s3_url
+        db.add(RequestFingerprint(request_id=req.request_id, user_id=user_id, **fingerprint))
+        await enqueue_job(db, current_user["user_id"], req.request_id, stage="extract")
+        await db.commit()
+        enqueued = True
+        # 새 요청이 복제본에 반영되기 전 latest-request-id 조회가 기본 DB를 읽도록 기록
+        await invalidate(request_scope(current_user["user_id"], req.request_id))
         
         return {
             "success": True,
@@ -196,16 +203,21 @@ async def analyze_face(
             "data": {
                 "user_id": current_user["user_id"],
                 "request_id": req.request_id,
-                "image_url": s3_url
+                "image_url": s3_url,
+                "queue_position": ticket["queue_position"],
+                "estimated_wait_seconds": ticket["estimated_wait_seconds"],
             }
         }
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"요청 처리 중 오류가 발생했습니다: {str(e)}"
         )
+    finally:
+        if not enqueued:
+            admission.cancel(user_id)
 
 # 추천 스타일 리스트 조회 (mock)
 @router.get("/recommend/styles", response_model=List[RecommendedStyle])
@@ -231,34 +243,40 @@ def recommend_styles(current_user: dict = Depends(get_current_user)):
         }
     ]
 
+# 조회 응답은 core/response_cache 에 (user_id, request_id) 단위로 캐시되고 ETag/304를 지원합니다.
 @router.get("/user/result/{request_id}", response_model=UserResultResponse)
-def get_user_result(request_id: int, current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    print(f"[DEBUG] 요청 진입 - user_id: {current_user['user_id']}, request_id: {request_id}")
-    # 1. request_table에서 이미지, 성별
-    req = db.query(Request).filter(Request.request_id == request_id, Request.user_id == current_user["user_id"]).first()
-    if not req:
-        print(f"[ERROR] Request 테이블에 해당 user_id + request_id 조합 없음")
-        raise HTTPException(status_code=404, detail="해당 요청을 찾을 수 없습니다.")
-    
-    print(f"[DEBUG] Request OK - user_image_url: {req.user_image_url}")
-    # 2. result_table에서 분석 결과
-    result = db.query(Result).filter(Result.request_id == request_id).first()
-    if not result:
-        raise HTTPException(status_code=404, detail="아직 분석 결과가 저장되지 않았습니다.")
-    return UserResultResponse(
-        user_id=req.user_id,
-        request_id=req.request_id,
-        user_image_url=req.user_image_url,
-        sex=req.sex,
-        face_type=result.face_type,
-        skin_tone=result.skin_tone,
-        rec_color=result.rec_color,
-        summary=result.summary
-    )
+async def get_user_result(request_id: int, http_request: HTTPRequest, current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_async_read_db)):
+    async def build():
+        # 1. request_table에서 이미지, 성별
+        req = (await db.execute(
+            select(Request).where(Request.request_id == request_id, Request.user_id == current_user["user_id"])
+        )).scalars().first()
+        if not req:
+            raise HTTPException(status_code=404, detail="해당 요청을 찾을 수 없습니다.")
+
+        # 2. result_table에서 분석 결과
+        result = (await db.execute(select(Result).where(Result.request_id == request_id))).scalars().first()
+        if not result:
+            raise HTTPException(status_code=404, detail="아직 분석 결과가 저장되지 않았습니다.")
+        return UserResultResponse(
+            user_id=req.user_id,
+            request_id=req.request_id,
+            user_image_url=req.user_image_url,
+            sex=req.sex,
+            face_type=result.face_type,
+            skin_tone=result.skin_tone,
+            rec_color=result.rec_color,
+            summary=result.summary
+        )
+
+    scope = request_scope(current_user["user_id"], request_id)
+    return await cached_response(http_request, "result", scope, UserResultResponse, build)
 
 @router.get("/user/latest-request-id")
-def get_latest_request_id(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
-    req = db.query(Request).filter(Request.user_id == current_user["user_id"]).order_by(desc(Request.created_at)).first()
+async def get_latest_request_id(current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_async_read_db)):
+    req = (await db.execute(
+        select(Request).where(Request.user_id == current_user["user_id"]).order_by(desc(Request.created_at)).limit(1)
+    )).scalars().first()
     if not req:
         return {"request_id": None}
     return {"request_id": req.request_id}
@@ -271,40 +289,48 @@ class HairRecommendationResponse(BaseModel):
     description: str
     is_saved: bool
 
+# 목록 응답은 필요한 컬럼만 조회해 바로 JSON 바이트로 직렬화 (core/fast_json.py, 필드는 응답 모델과 같은 순서)
+# 응답 모델에서 필수(str/int/float)인 필드 중 DB에서 NULL일 수 있는 컬럼은 조회 시 coalesce
+HAIR_REC_ROW = RowSerializer(
+    ("hair_rec_id", HairRecommendation.hair_rec_id),
+    ("hair_name", func.coalesce(HairRecommendation.hair_name, "")),
+    ("simulation_image_url", HairRecommendation.simulation_image_url),
+    ("description", func.coalesce(HairRecommendation.description, "")),
+    ("is_saved", HairRecommendation.is_saved, bool),
+)
+
 @router.get("/user/hair-recommendations/{request_id}", response_model=List[HairRecommendationResponse])
-def get_hair_recommendations(
+async def get_hair_recommendations(
     request_id: int,
+    http_request: HTTPRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     user_id = int(current_user["user_id"])
-    # 디버깅 로그: 현재 사용자 ID와 요청 ID 확인
-    print(f"[DEBUG] 요청 받은 request_id: {request_id}, current_user_id: {current_user['user_id']}")
 
-    # 추천 결과 DB 조회 (사용자 ID와 요청 ID로 필터링)
-    hairs = db.query(HairRecommendation).filter(
-        HairRecommendation.request_id == request_id,
-        HairRecommendation.user_id == user_id
-    ).all()
+    async def build():
+        # 추천 결과 DB 조회 (사용자 ID와 요청 ID로 필터링)
+        hairs = (await db.execute(
+            select(*HAIR_REC_ROW.columns).where(
+                HairRecommendation.request_id == request_id,
+                HairRecommendation.user_id == user_id
+            )
+        )).all()
 
-    # 디버깅 로그: 조회된 추천 결과 수 확인
-    print(f"[DEBUG] 조회된 추천 개수: {len(hairs)}")
-    for h in hairs:
-        print(f"[DEBUG] 추천: hair_name={h.hair_name}, hair_rec_id={h.hair_rec_id}, is_saved={h.is_saved}")
+        logger.debug("추천 스타일 조회", extra={"request_id": request_id, "count": len(hairs)})
 
-    # 추천 결과 응답
-    return [
-        {
-            "hair_rec_id": h.hair_rec_id,
-            "hair_name": h.hair_name,
-            "simulation_image_url": h.simulation_image_url,
-            "description": h.description,
-            "is_saved": bool(h.is_saved)
-        }
-        for h in hairs
-    ]
+        # 추천 결과 응답
+        return HAIR_REC_ROW.dumps(hairs)
+
+    scope = request_scope(user_id, request_id)
+    return await cached_response(http_request, "hair_recommendations", scope, List[HairRecommendationResponse], build)
 
 # (2) hair_rec_id로 추천 미용실 리스트 반환 (리뷰수 내림차순 정렬, 스크롤/페이지네이션 지원)
+# - cursor: 이전 응답의 X-Next-Cursor 헤더 값. (review_count, hairshop_rec_id) 키셋으로 다음 페이지를 조회하므로
+#   스크롤 깊이와 관계없이 페이지당 비용이 같고, 리뷰수가 같은 행이 페이지 사이에서 중복/누락되지 않음
+# - skip/limit: 기존 클라이언트 호환용 OFFSET 방식 (cursor가 있으면 skip은 무시)
+# 인덱스 ix_hairshop_rec_hair_rec_review(hair_rec_id, review_count)는 InnoDB/SQLite 모두 끝에 PK가 붙어
+# (hair_rec_id, review_count, hairshop_rec_id) 순서로 정렬되어 있으므로 정렬 없이 범위 스캔으로 처리됨
 class HairshopRecommendationResponse(BaseModel):
     hairshop_rec_id: int
     hairshop: str
@@ -313,132 +339,293 @@ class HairshopRecommendationResponse(BaseModel):
     is_saved: bool
     associated_hair_name: Optional[str] = None
 
+HAIRSHOP_REC_ROW = RowSerializer(
+    ("hairshop_rec_id", HairshopRecommendation.hairshop_rec_id),
+    ("hairshop", HairshopRecommendation.hairshop),
+    ("review_count", HairshopRecommendation.review_count),   # NOT NULL (커서 정렬 키와 같은 값)
+    ("mean_score", func.coalesce(HairshopRecommendation.mean_score, 0.0)),
+    ("is_saved", HairshopRecommendation.is_saved, bool),
+    ("associated_hair_name", HairRecommendation.hair_name),
+)
+
 @router.get("/user/hairshop-recommendations/{hair_rec_id}", response_model=List[HairshopRecommendationResponse])
-def get_hairshop_recommendations(
+async def get_hairshop_recommendations(
     hair_rec_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    shops = db.query(HairshopRecommendation, HairRecommendation.hair_name) \
-        .join(HairRecommendation, HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id) \
-        .filter(HairshopRecommendation.hair_rec_id == hair_rec_id) \
-        .order_by(HairshopRecommendation.review_count.desc()) \
-        .offset(skip).limit(limit).all()
+    query = (
+        select(*HAIRSHOP_REC_ROW.columns)
+        .join(HairRecommendation, HairRecommendation.hair_rec_id == HairshopRecommendation.hair_rec_id)
+        .where(HairshopRecommendation.hair_rec_id == hair_rec_id)
+        .order_by(HairshopRecommendation.review_count.desc(), HairshopRecommendation.hairshop_rec_id.desc())
+    )
+    if cursor:
+        last_review_count, last_id = decode_cursor(cursor, 2)
+        query = query.where(or_(
+            HairshopRecommendation.review_count < last_review_count,
+            and_(
+                HairshopRecommendation.review_count == last_review_count,
+                HairshopRecommendation.hairshop_rec_id < last_id
+            )
+        ))
+    else:
+        query = query.offset(skip)
+
+    shops = (await db.execute(query.limit(limit))).all()
     
-    print(f"[DEBUG] hair_rec_id {hair_rec_id}에 대한 미용실 추천 조회. 개수: {len(shops)}")
+    logger.debug("추천 미용실 조회", extra={"hair_rec_id": hair_rec_id, "count": len(shops)})
+
+    response = FastJSONResponse(HAIRSHOP_REC_ROW.dumps(shops))
+    # 페이지가 가득 찼으면 다음 페이지 커서 전달 (본문 형식은 기존과 동일하게 유지)
+    if len(shops) == limit:
+        last = shops[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.review_count, last.hairshop_rec_id)
+    return response
+
+# (3) 결과 화면 일괄 조회: 분석 결과 + 추천 스타일 + 스타일별 상위 미용실
+# 기존에는 result → hair-recommendations → 스타일별 hairshop-recommendations 로 N+2번 호출해야 했음.
+# 스타일 수와 관계없이 쿼리 3번(요청+결과 JOIN, 추천 스타일 IN, 스타일별 상위 미용실)으로 조회
+# 미용실은 스타일마다 수십 개라 전부 읽지 않고 ROW_NUMBER() 윈도 함수로 스타일별 상위 shops+1개만 조회
+# (+1개는 다음 페이지 유무 확인용, 정렬은 /user/hairshop-recommendations 커서와 같은 (review_count, id) 역순)
+RESULT_PAGE_MAX_SHOPS = 50
+
+class ResultPageRecommendation(HairRecommendationResponse):
+    hairshops: List[HairshopRecommendationResponse]
+    # 미용실이 더 있으면 /user/hairshop-recommendations/{hair_rec_id}?cursor= 로 이어서 조회
+    next_cursor: Optional[str] = None
+
+class ResultPageResponse(BaseModel):
+    result: UserResultResponse
+    recommendations: List[ResultPageRecommendation]
+
+# 스타일별 상위 limit개 미용실 행 (hair_rec_id, 순위 순서)
+async def _top_hairshops(db: AsyncSession, hair_rec_ids: list, limit: int) -> list:
+    rank = func.row_number().over(
+        partition_by=HairshopRecommendation.hair_rec_id,
+        order_by=(HairshopRecommendation.review_count.desc(), HairshopRecommendation.hairshop_rec_id.desc())
+    ).label("rank")
+    ranked = (
+        select(
+            HairshopRecommendation.hair_rec_id,
+            HairshopRecommendation.hairshop_rec_id,
+            HairshopRecommendation.hairshop,
+            HairshopRecommendation.review_count,
+            HairshopRecommendation.mean_score,
+            HairshopRecommendation.is_saved,
+            rank,
+        )
+        .where(HairshopRecommendation.hair_rec_id.in_(hair_rec_ids))
+        .subquery()
+    )
+    return (await db.execute(
+        select(ranked).where(ranked.c.rank <= limit).order_by(ranked.c.hair_rec_id, ranked.c.rank)
+    )).all()
 
-    return [
-        {
-            "hairshop_rec_id": shop.hairshop_rec_id,
-            "hairshop": shop.hairshop,
-            "review_count": shop.review_count,
-            "mean_score": shop.mean_score,
-            "is_saved": bool(shop.is_saved),
-            "associated_hair_name": hair_name
+@router.get("/user/result-page/{request_id}", response_model=ResultPageResponse)
+async def get_result_page(
+    request_id: int,
+    http_request: HTTPRequest,
+    shops: int = Query(10, ge=0, le=RESULT_PAGE_MAX_SHOPS),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    user_id = int(current_user["user_id"])
+
+    async def build():
+        req = (await db.execute(
+            select(Request)
+            .where(Request.request_id == request_id, Request.user_id == user_id)
+            .options(joinedload(Request.results), selectinload(Request.hair_recommendations))
+        )).unique().scalars().first()
+        if not req:
+            raise HTTPException(status_code=404, detail="해당 요청을 찾을 수 없습니다.")
+        if not req.results:
+            raise HTTPException(status_code=404, detail="아직 분석 결과가 저장되지 않았습니다.")
+        result = req.results[0]
+
+        shops_by_rec = {}
+        if shops and req.hair_recommendations:
+            for row in await _top_hairshops(db, [h.hair_rec_id for h in req.hair_recommendations], shops + 1):
+                shops_by_rec.setdefault(row.hair_rec_id, []).append(row)
+
+        recommendations = []
+        for h in req.hair_recommendations:
+            ranked = shops_by_rec.get(h.hair_rec_id, [])
+            top = ranked[:shops]
+            next_cursor = None
+            if len(ranked) > shops and top:
+                next_cursor = encode_cursor(top[-1].review_count or 0, top[-1].hairshop_rec_id)
+            # NULL 허용 컬럼은 목록 API(HAIR_REC_ROW/HAIRSHOP_REC_ROW)와 같은 기본값으로 응답
+            recommendations.append({
+                "hair_rec_id": h.hair_rec_id,
+                "hair_name": h.hair_name or "",
+                "simulation_image_url": h.simulation_image_url,
+                "description": h.description or "",
+                "is_saved": bool(h.is_saved),
+                "hairshops": [
+                    {
+                        "hairshop_rec_id": shop.hairshop_rec_id,
+                        "hairshop": shop.hairshop,
+                        "review_count": shop.review_count or 0,
+                        "mean_score": shop.mean_score or 0.0,
+                        "is_saved": bool(shop.is_saved),
+                        "associated_hair_name": h.hair_name
+                    }
+                    for shop in top
+                ],
+                "next_cursor": next_cursor
+            })
+
+        return {
+            "result": {
+                "user_id": req.user_id,
+                "request_id": req.request_id,
+                "user_image_url": req.user_image_url,
+                "sex": req.sex,
+                "face_type": result.face_type,
+                "skin_tone": result.skin_tone,
+                "rec_color": result.rec_color,
+                "summary": result.summary
+            },
+            "recommendations": recommendations
         }
-        for shop, hair_name in shops
-    ]
 
+    scope = request_scope(user_id, request_id)
+    return await cached_response(http_request, f"result_page:{shops}", scope, ResultPageResponse, build)
+
+# 저장 토글: UPDATE ... SET is_saved = 1 - is_saved 한 문장으로 처리 (core/saved_items)
 @router.put("/user/hair-recommendations/{hair_rec_id}/toggle-save")
-def toggle_save_hair_recommendation(
+async def toggle_save_hair_recommendation(
     hair_rec_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     user_id = int(current_user["user_id"])
-    hair_rec = db.query(HairRecommendation).filter(
-        HairRecommendation.hair_rec_id == hair_rec_id,
-        HairRecommendation.user_id == user_id
-    ).first()
-    
-    if not hair_rec:
+    row = await toggle_saved(db, HAIR, hair_rec_id, user_id)
+    if not row:
         raise HTTPException(status_code=404, detail="Hair recommendation not found")
-        
-    hair_rec.is_saved = 1 if hair_rec.is_saved == 0 else 0
-    db.commit()
-    db.refresh(hair_rec)
-    
-    return {"hair_rec_id": hair_rec.hair_rec_id, "is_saved": bool(hair_rec.is_saved)}
+
+    _, is_saved, request_id = row
+    await db.commit()
+    await invalidate(request_scope(user_id, request_id), saved_scope(user_id))
+
+    return {"hair_rec_id": hair_rec_id, "is_saved": bool(is_saved)}
 
 @router.put("/user/hairshop-recommendations/{hairshop_rec_id}/toggle-save")
-def toggle_save_hairshop_recommendation(
+async def toggle_save_hairshop_recommendation(
     hairshop_rec_id: int,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     user_id = int(current_user["user_id"])
-    hairshop_rec = db.query(HairshopRecommendation).filter(
-        HairshopRecommendation.hairshop_rec_id == hairshop_rec_id,
-        HairshopRecommendation.user_id == user_id
-    ).first()
-    
-    if not hairshop_rec:
+    # 결과 화면 캐시 무효화를 위해 소속 요청 ID도 함께 반환받음
+    row = await toggle_saved(db, HAIRSHOP, hairshop_rec_id, user_id)
+    if not row:
         raise HTTPException(status_code=404, detail="Hairshop recommendation not found")
-        
-    hairshop_rec.is_saved = 1 if hairshop_rec.is_saved == 0 else 0
-    db.commit()
-    db.refresh(hairshop_rec)
-    
-    return {"hairshop_rec_id": hairshop_rec.hairshop_rec_id, "is_saved": bool(hairshop_rec.is_saved)}
+
+    _, is_saved, request_id = row
+    await db.commit()
+    await invalidate(request_scope(user_id, request_id), saved_scope(user_id))
+
+    return {"hairshop_rec_id": hairshop_rec_id, "is_saved": bool(is_saved)}
+
+# 여러 저장/해제를 한 트랜잭션으로 반영 (앱에서 연속 탭을 모아 한 번에 전송)
+# 토글이 아닌 목표 상태(is_saved)를 보내므로 재전송해도 결과가 같고, 같은 항목은 마지막 요청 기준
+SAVE_BATCH_MAX_OPERATIONS = 100
+
+class SaveOperation(BaseModel):
+    type: Literal["hair", "hairshop"]
+    id: int
+    is_saved: bool
+
+class SaveBatchRequest(BaseModel):
+    operations: List[SaveOperation] = Field(..., max_length=SAVE_BATCH_MAX_OPERATIONS)
+
+class SavedHairState(BaseModel):
+    hair_rec_id: int
+    is_saved: bool
+
+class SavedHairshopState(BaseModel):
+    hairshop_rec_id: int
+    is_saved: bool
+
+class SaveBatchResponse(BaseModel):
+    hair_recommendations: List[SavedHairState]
+    hairshop_recommendations: List[SavedHairshopState]
+    not_found: List[SaveOperation]  # 없거나 본인 추천이 아니어서 반영하지 않은 요청
+
+@router.post("/user/saved-items/batch", response_model=SaveBatchResponse)
+async def apply_saved_batch(
+    batch: SaveBatchRequest,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    user_id = int(current_user["user_id"])
+    results = await apply_saved(db, [(op.type, op.id, op.is_saved) for op in batch.operations], user_id)
+    await db.commit()
+
+    found = {(kind, item_id) for kind, rows in results.items() for item_id, _, _ in rows}
+    request_ids = {request_id for rows in results.values() for _, _, request_id in rows}
+    if found:
+        await invalidate(*(request_scope(user_id, request_id) for request_id in request_ids), saved_scope(user_id))
+
+    return {
+        "hair_recommendations": [{"hair_rec_id": i, "is_saved": bool(v)} for i, v, _ in results[HAIR]],
+        "hairshop_recommendations": [{"hairshop_rec_id": i, "is_saved": bool(v)} for i, v, _ in results[HAIRSHOP]],
+        "not_found": list({(op.type, op.id): op for op in batch.operations if (op.type, op.id) not in found}.values()),
+    }
 
 @router.get("/user/saved-hairstyles", response_model=List[HairRecommendationResponse])
-def get_saved_hairstyles(
+async def get_saved_hairstyles(
+    http_request: HTTPRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     user_id = int(current_user["user_id"])
-    saved_hairs = db.query(HairRecommendation).filter(
-        HairRecommendation.user_id == user_id,
-        HairRecommendation.is_saved == 1
-    ).all()
-    
-    return [
-        {
-            "hair_rec_id": h.hair_rec_id,
-            "hair_name": h.hair_name,
-            "simulation_image_url": h.simulation_image_url,
-            "description": h.description,
-            "is_saved": bool(h.is_saved)
-        }
-        for h in saved_hairs
-    ]
+
+    async def build():
+        saved_hairs = (await db.execute(
+            select(*HAIR_REC_ROW.columns).where(
+                HairRecommendation.user_id == user_id,
+                HairRecommendation.is_saved == 1
+            )
+        )).all()
+
+        return HAIR_REC_ROW.dumps(saved_hairs)
+
+    return await cached_response(http_request, "saved_hairstyles", saved_scope(user_id), List[HairRecommendationResponse], build)
 
 @router.get("/user/saved-hairshops", response_model=List[HairshopRecommendationResponse])
-def get_saved_hairshops(
+async def get_saved_hairshops(
+    http_request: HTTPRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     user_id = int(current_user["user_id"])
-    
-    # HairshopRecommendation과 HairRecommendation을 조인하여 헤어스타일 이름을 가져옵니다.
-    saved_shops = db.query(
-        HairshopRecommendation,
-        HairRecommendation.hair_name
-    ).join(
-        HairRecommendation,
-        HairshopRecommendation.hair_rec_id == HairRecommendation.hair_rec_id
-    ).filter(
-        HairshopRecommendation.user_id == user_id,
-        HairshopRecommendation.is_saved == 1
-    ).all()
-    
-    print(f"[DEBUG] 조회된 저장된 미용실 개수: {len(saved_shops)}")
-    
-    return [
-        {
-            "hairshop_rec_id": shop.HairshopRecommendation.hairshop_rec_id,
-            "hairshop": shop.HairshopRecommendation.hairshop,
-            "review_count": shop.HairshopRecommendation.review_count,
-            "mean_score": shop.HairshopRecommendation.mean_score,
-            "is_saved": bool(shop.HairshopRecommendation.is_saved),
-            "associated_hair_name": shop.hair_name
-        }
-        for shop in saved_shops
-    ]
+
+    async def build():
+        # HairshopRecommendation과 HairRecommendation을 조인하여 헤어스타일 이름을 가져옵니다.
+        saved_shops = (await db.execute(
+            select(*HAIRSHOP_REC_ROW.columns).join(
+                HairRecommendation,
+                HairshopRecommendation.hair_rec_id == HairRecommendation.hair_rec_id
+            ).where(
+                HairshopRecommendation.user_id == user_id,
+                HairshopRecommendation.is_saved == 1
+            )
+        )).all()
+
+        logger.debug("저장한 미용실 조회", extra={"user_id": user_id, "count": len(saved_shops)})
+
+        return HAIRSHOP_REC_ROW.dumps(saved_shops)
+
+    return await cached_response(http_request, "saved_hairshops", saved_scope(user_id), List[HairshopRecommendationResponse], build)
 
 @router.get("/user/info", response_model=UserInfoResponse)
-def get_user_info(current_user: dict = Depends(get_current_user), db: Session = Depends(get_db)):
+async def get_user_info(current_user: dict = Depends(get_current_user)):
     return {
         "user_id": current_user["user_id"],
         "name": current_user["name"],
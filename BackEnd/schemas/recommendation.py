@@ -25,6 +25,13 @@ class RecommendationPayload(BaseModel):
     user_info: UserInfo
     recommendations: List[RecommendationItem]
 
+class SimulationNotice(BaseModel):
+    user_id: int
+    request_id: int
+    hair_rec_id: int
+    # 기존 Stable-Hair 호환용. 앱에 전달하는 URL은 DB에 저장된 값을 사용
+    simulation_image_url: Optional[str] = None
+
 # class RecommendationPayload(BaseModel):
 #     user_info: dict  # {"user_id": ..., "request_id": ...}
 #     recommendations: List[RecommendationItem]
\ No newline at end of file
@@ -2,8 +2,10 @@
 # recommend_hair_from_image.py
 
 import argparse
+import cv2
+import numpy as np
 import pandas as pd
-import stone
+from stone.image import DEFAULT_TONE_LABELS, DEFAULT_TONE_PALETTE, process_image
 from colormath.color_objects import sRGBColor, LabColor
 from colormath.color_conversions import convert_color
 import sys
@@ -68,10 +70,25 @@ def hex_to_lab(hex_color: str):
     lab: LabColor = convert_color(rgb, LabColor)
     return lab.lab_l, lab.lab_a, lab.lab_b
 
-def extract_face_colors(image_path: str) -> pd.DataFrame:
-    result = stone.process(image_path, image_type="color", return_report_image=True)
+# stone.process(URL)는 이미지를 다시 다운로드/디코딩하므로, 이미 디코딩된 배열로 같은 처리(컬러 이미지 기준)를 직접 호출
+# (보고서 이미지는 사용하지 않으므로 생성하지 않음)
+def extract_face_colors(image: np.ndarray) -> pd.DataFrame:
+    records, _ = process_image(
+        image,
+        is_bw=False,
+        to_bw=False,
+        skin_tone_palette=DEFAULT_TONE_PALETTE["color"],
+        tone_labels=DEFAULT_TONE_LABELS["color"],
+        new_width=250,
+        n_dominant_colors=2,
+        scaleFactor=1.1,
+        minNeighbors=5,
+        minSize=(90, 90),
+        threshold=0.15,
+        verbose=False,
+    )
     face_data = []
-    for face in result.get('faces', []):
+    for face in records:
         face_id = face.get('face_id')
         for ci in face.get('dominant_colors', []):
             face_data.append({
@@ -105,8 +122,8 @@ def recommend_hair_colors(
     scores.sort(key=lambda x: x[0])
     return [name for _, name in scores[:top_n]]
 
-def get_recommendation(image_path: str, vibes: list[str], top_n: int = 3):
-    df = extract_face_colors(image_path)
+def get_recommendation(image: np.ndarray, vibes: list[str], top_n: int = 3):
+    df = extract_face_colors(image)
     if df.empty:
         raise ValueError("얼굴을 인식할 수 없습니다.")
     skin_hex = df.sort_values('percent', ascending=False)['color'].iloc[0]
@@ -131,7 +148,10 @@ if __name__ == '__main__':
             sys.exit(1)
 
     try:
-        skin_hex, recs = get_recommendation(args.image, args.vibes, args.top_n)
+        image = cv2.imread(args.image, cv2.IMREAD_COLOR)
+        if image is None:
+            raise FileNotFoundError(f"이미지를 읽을 수 없습니다: {args.image}")
+        skin_hex, recs = get_recommendation(image, args.vibes, args.top_n)
         print(f"Detected skin color: {skin_hex}")
         print(f"Recommended hair colors: {', '.join(recs)}")
     except Exception as e:
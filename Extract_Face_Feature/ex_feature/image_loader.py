@@ -0,0 +1,96 @@
+# image_loader.py
+# 이미지 URL → 디코딩된 BGR ndarray (요청당 다운로드 1회, 디코딩 1회)
+#
+# 분석 단계(얼굴형/비율/피부색)는 모두 여기서 읽은 같은 배열을 받아 사용합니다.
+# 디코딩 결과는 URL 기준 LRU 캐시에 ETag와 함께 보관하고, 같은 URL을 다시 분석하면(파이프라인 재시도 등)
+# If-None-Match 조건부 요청으로 확인해 304면 다운로드/디코딩 없이 캐시된 배열을 그대로 사용합니다.
+# 캐시된 배열은 여러 요청이 공유하므로 읽기 전용으로 설정 (수정이 필요한 단계는 복사본 사용)
+#
+#   IMAGE_CACHE_SIZE=32       최대 보관 이미지 수
+#   IMAGE_CACHE_MAX_MB=256    디코딩된 배열 합계 상한 (MB)
+#   IMAGE_FETCH_TIMEOUT=30    다운로드 타임아웃 (초)
+
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+import requests
+
+IMAGE_CACHE_SIZE = int(os.getenv("IMAGE_CACHE_SIZE", 32))
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", 256))
+IMAGE_FETCH_TIMEOUT = float(os.getenv("IMAGE_FETCH_TIMEOUT", 30))
+
+
+class DecodedImageCache:
+    def __init__(self, maxsize=IMAGE_CACHE_SIZE, max_bytes=int(IMAGE_CACHE_MAX_MB * 1024 * 1024)):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # url -> (etag, image)
+        self._bytes = 0
+        # 동기 라우트는 스레드풀에서 동시에 실행되므로 잠금 사용
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url, etag, image):
+        if self.maxsize <= 0 or image.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= old[1].nbytes
+            self._entries[url] = (etag, image)
+            self._bytes += image.nbytes
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+image_cache = DecodedImageCache()
+
+# 같은 호스트(S3)로의 연결 재사용
+_session = requests.Session()
+_session.headers["User-Agent"] = "Mozilla/5.0"
+
+
+def decode_image(data):
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is not None:
+        image.setflags(write=False)
+    return image
+
+
+def load_image(url):
+    cached = image_cache.get(url)
+    headers = {"If-None-Match": cached[0]} if cached and cached[0] else {}
+    response = _session.get(url, headers=headers, timeout=IMAGE_FETCH_TIMEOUT)
+
+    if response.status_code == 304 and cached:
+        image_cache.hits += 1
+        return cached[1]
+    if response.status_code != 200:
+        raise FileNotFoundError(f"[다운로드 실패] 이미지를 불러올 수 없습니다: {url}")
+
+    image_cache.misses += 1
+    image = decode_image(response.content)
+    if image is None:
+        raise ValueError(f"[디코딩 실패] OpenCV가 이미지를 디코딩하지 못했습니다: {url}")
+    image_cache.put(url, response.headers.get("ETag"), image)
+    return image
@@ -3,12 +3,13 @@
 from .evaluate import evaluate_feature
 from .color_recommend import get_recommendation
 
-def generate_summary(image_path, id, curl, length, dyeing, forehead, clown, mood, care_level):
+# image: 디코딩된 BGR 배열 (얼굴형/비율/피부색 분석이 같은 배열을 공유)
+def generate_summary(image, id, curl, length, dyeing, forehead, clown, mood, care_level):
 
     # 컴퓨터 추출 정보 불러오기
-    faceshape_eval, forehead_eval, central_eval, low_eval, final_evaluation = evaluate_feature(image_path)
+    faceshape_eval, forehead_eval, central_eval, low_eval, final_evaluation = evaluate_feature(image)
     if dyeing == "O":   
-       skin_hex, recs = get_recommendation(image_path, mood)
+       skin_hex, recs = get_recommendation(image, mood)
     else:
        skin_hex = "염색 정보 없음"
        recs = []
@@ -9,21 +9,12 @@ import uuid
 from datetime import datetime
 from db_utils import get_latest_request, save_result_to_db
 from ex_feature.result import generate_summary
+from ex_feature.image_loader import load_image
 from api_notifier import notify_main_api
 from fastapi import FastAPI, Body
 
 app = FastAPI()
 
-def read_image_from_url(url):
-    response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-    if response.status_code != 200:
-        raise FileNotFoundError(f"[다운로드 실패] 이미지를 불러올 수 없습니다: {url}")
-    img_array = np.asarray(bytearray(response.content), dtype=np.uint8)
-    image = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-    if image is None:
-        raise ValueError(f"[디코딩 실패] OpenCV가 이미지를 디코딩하지 못했습니다: {url}")
-    return image
-
 @app.post("/run-extract/")
 def run_extract(data: dict = Body(...)):
     user_id = data["user_id"]
@@ -37,10 +28,11 @@ def run_extract(data: dict = Body(...)):
 
     print(f"[DEBUG] DB에서 가져온 요청 정보: {info}")
     
-    image = read_image_from_url(info["user_image_url"])
+    # 다운로드/디코딩은 여기서 한 번만 하고 모든 분석 단계가 같은 배열을 사용
+    image = load_image(info["user_image_url"])
 
     result_dict = generate_summary(
-        info["user_image_url"],
+        image,
         str(request_id),
         info["hair_type"],
         info["hair_length"],
@@ -4,6 +4,7 @@ import { useRouter, usePathname } from 'expo-router';
 import { CameraView, useCameraPermissions } from 'expo-camera';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import api from '../config/api';
+import { subscribeRequestEvents } from '../services/requestEvents';
 
 export default function DiscoverCamera({ route }) {
   const router = useRouter();
@@ -72,36 +73,58 @@ export default function DiscoverCamera({ route }) {
   }, []);
 
   useEffect(() => {
-    let checkInterval;
+    let unsubscribe;
+    let cancelled = false;
+    let done = false;
+
+    const checkResult = async () => {
+      if (cancelled || done) {
+        return;
+      }
+      try {
+        const response = await api.get(`/user/result/${analysisRequestId}`);
+        console.log('[DEBUG] 분석 결과 확인 응답:', response.data);
+        if (response.data && response.data.face_type) {
+          console.log('[INFO] 분석 결과 준비 완료.');
+          done = true;
+          setIsAnalyzing(false);
+          router.replace({
+            pathname: '/discover-result',
+            params: { resultData: JSON.stringify(response.data) }
+          });
+        }
+      } catch (err) {
+        if (err.response?.status === 404) {
+          console.log('[INFO] 아직 분석 결과 없음 (404). 계속 확인.');
+        } else {
+          console.warn('[WARN] 분석 결과 확인 중 예상치 못한 오류 발생:', err);
+        }
+      }
+    };
 
     if (isAnalyzing && analysisRequestId && !isLoading) {
       console.log('[INFO] 분석 결과 준비 확인 시작', analysisRequestId);
-      checkInterval = setInterval(async () => {
-        try {
-          const response = await api.get(`/user/result/${analysisRequestId}`);
-          console.log('[DEBUG] 분석 결과 확인 응답:', response.data);
-          if (response.data && response.data.face_type) {
-            console.log('[INFO] 분석 결과 준비 완료.');
-            setIsAnalyzing(false);
-            clearInterval(checkInterval);
-            router.replace({
-              pathname: '/discover-result',
-              params: { resultData: JSON.stringify(response.data) }
-            });
-          }
-        } catch (err) {
-          if (err.response?.status === 404) {
-            console.log('[INFO] 아직 분석 결과 없음 (404). 계속 확인.');
-          } else {
-            console.warn('[WARN] 분석 결과 확인 중 예상치 못한 오류 발생:', err);
+      // 서버 푸시(result_ready)를 받으면 바로 조회하고, 푸시를 놓쳐도 느린 주기 확인으로 이어감 (연결 실패 시 5초 폴링)
+      subscribeRequestEvents(analysisRequestId, {
+        onEvent: (event) => {
+          if (event.event === 'result_ready') {
+            checkResult();
           }
+        },
+        onPoll: checkResult,
+      }).then((unsub) => {
+        if (cancelled) {
+          unsub();
+        } else {
+          unsubscribe = unsub;
         }
-      }, 5000);
+      });
     }
 
     return () => {
-      if (checkInterval) {
-        clearInterval(checkInterval);
+      cancelled = true;
+      if (unsubscribe) {
+        unsubscribe();
       }
     };
   }, [isAnalyzing, analysisRequestId, isLoading]);
@@ -2,6 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { View, Text, TouchableOpacity, Image, StyleSheet, ScrollView, ActivityIndicator, Alert } from 'react-native';
 import { useRouter, useLocalSearchParams } from 'expo-router';
 import api from '../config/api';
+import { subscribeRequestEvents } from '../services/requestEvents';
 
 export default function DiscoverResult() {
   const router = useRouter();
@@ -27,33 +28,54 @@ export default function DiscoverResult() {
   const [checkingRecommendations, setCheckingRecommendations] = useState(false);
 
   useEffect(() => {
-    let checkInterval;
+    let unsubscribe;
+    let cancelled = false;
+
+    const checkRecommendations = async () => {
+      if (cancelled) {
+        return;
+      }
+      try {
+        const response = await api.get(`/user/hair-recommendations/${result.request_id}`);
+        console.log('[DEBUG] 추천 확인 응답:', response.data);
+        if (response.data && response.data.length > 0) {
+          console.log('[INFO] 추천 결과 준비 완료.');
+          setIsRecommendationReady(true);
+          setCheckingRecommendations(false);
+        }
+      } catch (err) {
+        console.error('[ERROR] 추천 확인 중 오류:', err);
+        if (err.response?.status === 404) {
+          console.log('[INFO] 아직 추천 결과 없음 (404). 계속 확인.');
+        } else {
+        }
+      }
+    };
 
     if (checkingRecommendations && result?.request_id && !isRecommendationReady) {
       console.log('[INFO] 추천 결과 준비 확인 시작');
-      checkInterval = setInterval(async () => {
-        try {
-          const response = await api.get(`/user/hair-recommendations/${result.request_id}`);
-          console.log('[DEBUG] 추천 확인 응답:', response.data);
-          if (response.data && response.data.length > 0) {
-            console.log('[INFO] 추천 결과 준비 완료.');
+      // 서버 푸시(recommendations_ready)를 기다리고, 푸시를 놓쳐도 느린 주기 확인으로 이어감 (연결 실패 시 5초 폴링)
+      subscribeRequestEvents(result.request_id, {
+        onEvent: (event) => {
+          if (event.event === 'recommendations_ready') {
             setIsRecommendationReady(true);
             setCheckingRecommendations(false);
-            clearInterval(checkInterval);
-          }
-        } catch (err) {
-          console.error('[ERROR] 추천 확인 중 오류:', err);
-          if (err.response?.status === 404) {
-            console.log('[INFO] 아직 추천 결과 없음 (404). 계속 확인.');
-          } else {
           }
+        },
+        onPoll: checkRecommendations,
+      }).then((unsub) => {
+        if (cancelled) {
+          unsub();
+        } else {
+          unsubscribe = unsub;
         }
-      }, 5000);
+      });
     }
 
     return () => {
-      if (checkInterval) {
-        clearInterval(checkInterval);
+      cancelled = true;
+      if (unsubscribe) {
+        unsubscribe();
       }
     };
   }, [checkingRecommendations, result?.request_id, isRecommendationReady]);
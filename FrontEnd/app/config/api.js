@@ -21,6 +21,10 @@ const api = axios.create({
   withCredentials: true, // CORS 요청에 credentials 포함
 });
 
+// 서버가 준 마지막 쓰기 시각 (X-Last-Write). 다음 요청에 돌려보내면 어느 서버 워커가 받아도
+// 쓰기 직후 조회를 복제본이 아닌 기본 DB에서 읽습니다.
+let lastWrite = null;
+
 // 요청 인터셉터 - 토큰 추가
 api.interceptors.request.use(
   async (config) => {
@@ -35,6 +39,9 @@ api.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    if (lastWrite) {
+      config.headers['X-Last-Write'] = lastWrite;
+    }
     return config;
   },
   (error) => {
@@ -50,6 +57,9 @@ api.interceptors.response.use(
       status: response.status,
       data: response.data,
     });
+    if (response.headers?.['x-last-write']) {
+      lastWrite = response.headers['x-last-write'];
+    }
     return response;
   },
   async (error) => {
@@ -80,4 +90,5 @@ api.interceptors.response.use(
   }
 );
 
+export { API_BASE_URL };
 export default api; 
\ No newline at end of file
@@ -0,0 +1,52 @@
+import AsyncStorage from '@react-native-async-storage/async-storage';
+import { API_BASE_URL } from '../config/api';
+
+// 푸시 연결 중에도 놓친 이벤트를 잡기 위한 느린 확인 주기 / 연결 실패 후 폴링 주기
+const SAFETY_POLL_MS = 20000;
+const FALLBACK_POLL_MS = 5000;
+
+// request_id 단위 서버 푸시 구독 (WebSocket)
+// 이벤트: result_ready, recommendations_ready, simulation_ready
+// onPoll 은 서버 상태를 직접 조회하는 함수로, 푸시가 연결된 동안에도 SAFETY_POLL_MS 마다 호출합니다.
+// (다른 워커에서 발행되어 이 연결로 오지 않은 이벤트, 이벤트 직후 조회가 복제 지연으로 404인 경우 대비)
+// 연결이 실패하거나 끊기면 FALLBACK_POLL_MS 폴링으로 전환합니다.
+export async function subscribeRequestEvents(requestId, { onEvent, onPoll }) {
+  const token = await AsyncStorage.getItem('access_token');
+  const wsBaseUrl = API_BASE_URL.replace(/^http/, 'ws');
+  const socket = new WebSocket(
+    `${wsBaseUrl}/ws/requests/${requestId}?token=${encodeURIComponent(token || '')}`
+  );
+
+  let closedByClient = false;
+  let fellBack = false;
+  let pollInterval = onPoll ? setInterval(onPoll, SAFETY_POLL_MS) : null;
+
+  const fallback = () => {
+    if (closedByClient || fellBack) {
+      return;
+    }
+    fellBack = true;
+    console.warn('[WARN] 푸시 연결 실패. 폴링으로 전환합니다.', requestId);
+    if (onPoll) {
+      clearInterval(pollInterval);
+      pollInterval = setInterval(onPoll, FALLBACK_POLL_MS);
+      onPoll();
+    }
+  };
+
+  socket.onmessage = (message) => {
+    try {
+      onEvent?.(JSON.parse(message.data));
+    } catch (e) {
+      console.error('[ERROR] 푸시 이벤트 파싱 오류:', e);
+    }
+  };
+  socket.onerror = fallback;
+  socket.onclose = fallback;
+
+  return () => {
+    closedByClient = true;
+    clearInterval(pollInterval);
+    socket.close();
+  };
+}
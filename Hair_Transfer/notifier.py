@@ -16,3 +16,20 @@ def notify_main_api(user_id: int, request_id: int, result: dict):
         print("[INFO] 메인 API 알림 전송 성공:", response.status_code)
     except Exception as e:
         print("[ERROR] 메인 API 알림 실패:", e)
+
+def notify_simulation_updated(user_id: int, request_id: int, hair_rec_id: int, image_url: str):
+    # simulation_image_url 갱신 직후 Main API에 알려 클라이언트로 푸시
+    try:
+        response = requests.post(
+            f"{MAIN_API_URL}/notify-simulation/",
+            json={
+                "user_id": user_id,
+                "request_id": request_id,
+                "hair_rec_id": hair_rec_id,
+                "simulation_image_url": image_url
+            },
+            timeout=5
+        )
+        print("[INFO] 합성 완료 알림 전송:", response.status_code)
+    except Exception as e:
+        print("[ERROR] 합성 완료 알림 실패:", e)
@@ -2,7 +2,7 @@
 import os
 from db_utils import get_request_and_styles, update_simulation_url
 from image_utils import load_image, simulate_hair, upload_to_s3
-from notifier import notify_main_api
+from notifier import notify_main_api, notify_simulation_updated
 
 
 def run_stablehair_logic(user_id: int, request_id: int):
@@ -10,7 +10,7 @@ def run_stablehair_logic(user_id: int, request_id: int):
     1) DB에서 user_image_url과 추천된 스타일 리스트 조회
     2) 각 스타일별로 이미지 로드 및 합성 실행
     3) 합성 결과(bald, result) S3에 업로드
-    4) hair_recommendation_table에 simulation_image_url 갱신
+    4) hair_recommendation_table에 simulation_image_url 갱신 후 Main API에 알림 (앱 푸시)
     5) Main API에 전체 결과 알림
     """
 
@@ -51,6 +51,7 @@ def run_stablehair_logic(user_id: int, request_id: int):
             hair_rec_id=hair_rec_id,
             image_url=result_url
         )
+        notify_simulation_updated(user_id, request_id, hair_rec_id, result_url)
 
         results.append({
             "hair_rec_id": hair_rec_id,